@@ -0,0 +1,188 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from database import POOL_MAX_SIZE, get_pool
+
+# Cada cuántos ms el hilo de Tk revisa si hay resultados listos
+POLL_MS = 50
+
+_thread_models = threading.local()
+
+
+def thread_model(model_class):
+    """Instancia de model_class propia del hilo actual.
+
+    Los modelos guardan su conexión y su cursor, así que no se comparten
+    entre hilos: cada hilo trabajador (y el hilo de Tk) usa la suya.
+    """
+    models = getattr(_thread_models, "models", None)
+    if models is None:
+        models = _thread_models.models = {}
+    if model_class not in models:
+        models[model_class] = model_class()
+    return models[model_class]
+
+
+class BackgroundExecutor:
+    """Ejecuta trabajo de base de datos en hilos y entrega el resultado en Tk.
+
+    submit() corre work() en un hilo trabajador y llama a on_done(resultado)
+    desde el hilo de Tk mediante app.after(). Un nuevo submit con la misma
+    clave reemplaza al anterior: si aún no empezó se cancela, si está
+    consultando se interrumpe la consulta, y su resultado se descarta.
+    """
+
+    def __init__(self, app, max_workers=POOL_MAX_SIZE - 1):
+        self.app = app
+        # Un hilo de Tk más max_workers trabajadores caben en el pool
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="db")
+        self._results = queue.Queue()
+        self._generations = {}    # clave -> número del último pedido
+        self._futures = {}        # clave -> Future del último pedido
+        self._running = {}        # clave -> (número, conexión) en ejecución
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._polling = False
+
+    def submit(self, key, work, on_done, on_error=None):
+        """Programa work() en segundo plano; reemplaza el pedido previo de key"""
+        self.cancel(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._futures[key] = self._executor.submit(
+            self._run, key, generation, work, on_done, on_error)
+        self._pending += 1
+        self._set_busy(True)
+        if not self._polling:
+            self._polling = True
+            self.app.after(POLL_MS, self._poll)
+        return generation
+
+    def cancel(self, key):
+        """Cancela o interrumpe el pedido en curso de key, si lo hay"""
+        future = self._futures.pop(key, None)
+        if future is not None and future.cancel():
+            self._pending -= 1
+        with self._lock:
+            running = self._running.get(key)
+            if running and running[0] == self._generations.get(key):
+                running[1].interrupt()
+        # El resultado de cualquier pedido anterior queda obsoleto
+        self._generations[key] = self._generations.get(key, 0) + 1
+        if not self._pending:
+            self._set_busy(False)
+
+    def call_soon(self, callback):
+        """Ejecuta callback() en el hilo de Tk; se puede llamar desde un trabajador.
+
+        Va por la misma cola que los resultados, así que se ejecuta antes
+        que el resultado de la tarea en curso, mientras el sondeo sigue activo.
+        """
+        self._results.put((None, None, callback, None, None))
+
+    def shutdown(self):
+        """Detiene los trabajadores sin esperar consultas largas"""
+        for key in list(self._futures):
+            self.cancel(key)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, key, generation, work, on_done, on_error):
+        """Cuerpo del hilo trabajador"""
+        if self._generations.get(key) != generation:
+            self._results.put((key, generation, None, None, None))
+            return
+
+        conn = get_pool().acquire()
+        with self._lock:
+            self._running[key] = (generation, conn)
+        try:
+            result, error = work(), None
+        except Exception as e:
+            result, error = None, e
+        finally:
+            with self._lock:
+                if self._running.get(key, (None,))[0] == generation:
+                    del self._running[key]
+            conn.close()
+
+        callback = on_done if error is None else on_error
+        self._results.put((key, generation, callback, result, error))
+
+    def _poll(self):
+        """Entrega en el hilo de Tk los resultados listos"""
+        while True:
+            try:
+                key, generation, callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if key is None:
+                self._run_call(callback)    # Pedido de call_soon()
+                continue
+            self._pending -= 1
+            if self._generations.get(key) != generation:
+                continue    # Reemplazado por un pedido más nuevo
+            self._futures.pop(key, None)
+            self._deliver(callback, result, error)
+
+        if self._pending > 0:
+            self.app.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+            self._set_busy(False)
+
+    def _deliver(self, callback, result, error):
+        try:
+            if error is None:
+                callback(result)
+            elif callback is not None:
+                callback(error)
+            else:
+                print(f"Error en tarea de fondo: {error}")
+        except Exception as e:
+            # La pantalla pudo cerrarse mientras se consultaba
+            print(f"No se pudo entregar el resultado de una tarea de fondo: {e}")
+
+    def _run_call(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error en una llamada diferida al hilo de Tk: {e}")
+
+    def _set_busy(self, busy):
+        """Indicador de carga: cursor de espera mientras haya pedidos"""
+        try:
+            self.app.config(cursor="watch" if busy else "")
+        except Exception:
+            pass
+
+
+def call_in_tk(app, callback):
+    """Programa callback() en el hilo de Tk sin tocar Tk desde otro hilo.
+
+    En el hilo de Tk usa app.after(); en un trabajador lo encola en el
+    executor de la app. Retorna False si no hay forma de entregarlo.
+    """
+    if threading.current_thread() is threading.main_thread():
+        app.after(0, callback)
+        return True
+    executor = getattr(app, "executor", None)
+    if executor is None:
+        return False
+    executor.call_soon(callback)
+    return True
+
+
+def run_in_background(app, key, work, on_done, on_error=None):
+    """Usa el executor de la app si existe; si no, ejecuta de forma síncrona"""
+    executor = getattr(app, "executor", None)
+    if executor is not None:
+        return executor.submit(key, work, on_done, on_error)
+    try:
+        result = work()
+    except Exception as e:
+        if on_error is None:
+            raise
+        on_error(e)
+    else:
+        on_done(result)
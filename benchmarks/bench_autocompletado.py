@@ -0,0 +1,70 @@
+"""Benchmark: filtrado lineal vs. CompletionIndex en los combobox.
+
+Compara el recorrido de toda la lista por tecla (lo que hacían los
+combobox con autocompletado) con la búsqueda binaria del índice, para
+una lista de solicitantes "Nombre Apellido - cédula".
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_autocompletado [entradas]
+"""
+import random
+import sys
+import time
+
+from helpers import normalizar_texto
+from views.base_view import MAX_COMPLETIONS, CompletionIndex
+
+NOMBRES = ["José", "María", "Ángel", "Lucía", "Andrés", "Sofía", "Martín",
+           "Valentina", "Tomás", "Camila", "Joaquín", "Inés"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Núñez", "Gómez", "Fernández",
+             "López", "Díaz", "Martínez", "Sánchez", "Ramírez", "Chávez"]
+
+TERMINOS = ["j", "jose", "perez", "gonz", "nunez", "12", "12345", "inexistente"]
+
+
+def generar(total):
+    random.seed(1)
+    return [f"{random.choice(NOMBRES)} {random.choice(APELLIDOS)} - {random.randint(1000000, 30000000)}"
+            for _ in range(total)]
+
+
+def lineal(normalizados, termino):
+    """Filtrado anterior: recorre toda la lista buscando el texto"""
+    valor = normalizar_texto(termino)
+    return [item for texto, item in normalizados if valor in texto][:MAX_COMPLETIONS]
+
+
+def medir(funcion, repeticiones=5):
+    """Retorna (mejor tiempo en ms, resultado)"""
+    mejor, resultado = None, None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        total = (time.perf_counter() - inicio) * 1000
+        mejor = total if mejor is None else min(mejor, total)
+    return mejor, resultado
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    valores = sorted(generar(total), key=str.lower)
+
+    construir_lineal, normalizados = medir(
+        lambda: [(normalizar_texto(item), item) for item in valores], 1)
+    construir_indice, indice = medir(lambda: CompletionIndex(valores), 1)
+    print(f"Entradas: {total}")
+    print(f"Preparación: lista normalizada {construir_lineal:.0f} ms, "
+          f"índice {construir_indice:.0f} ms\n")
+    print(f"{'Término':<14}{'Lineal':>12}{'Índice':>12}{'Mostradas':>11}")
+
+    for termino in TERMINOS:
+        t_lineal, _ = medir(lambda: lineal(normalizados, termino))
+        t_indice, encontrados = medir(lambda: indice.search(termino))
+        print(f"{termino:<14}{t_lineal:>9.2f} ms{t_indice:>9.2f} ms{len(encontrados):>11}")
+
+    print("\nEl índice busca desde el inicio de cada palabra; el recorrido lineal,"
+          " en cualquier posición del texto.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: búsqueda de productos con LIKE '%texto%' vs. índice FTS5.
+
+Mide la primera página (lo que ve el usuario al buscar) y el listado
+completo de coincidencias para varios términos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_busqueda [productos]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import database
+
+NOMBRES = ["Tóner", "Papel", "Carpeta", "Bolígrafo", "Cartucho", "Grapadora",
+           "Cuaderno", "Marcador", "Archivador", "Sobre", "Cinta", "Lápiz"]
+ADJETIVOS = ["negro", "azul", "carta", "oficio", "grande", "pequeño",
+             "reciclado", "térmico", "adhesivo", "tamaño A4"]
+MARCAS = ["HP", "Epson", "Canon", "Bic", "Faber-Castell", "Pilot", "3M", "Xerox"]
+CATEGORIAS = ["Oficina", "Impresión", "Archivo", "Escritura", "Embalaje"]
+
+TERMINOS = ["toner", "tón", "papel carta", "hp negro", "faber", "inexistente"]
+
+
+def poblar(conn, total):
+    """Crea productos con nombres, marcas y categorías variados"""
+    random.seed(1)
+    conn.executemany("INSERT INTO marcas (nombre) VALUES (?)", [(m,) for m in MARCAS])
+    conn.executemany("INSERT INTO categorias (nombre) VALUES (?)", [(c,) for c in CATEGORIAS])
+    conn.executemany(
+        "INSERT INTO productos (codigo, nombre, id_marca, id_categoria) VALUES (?, ?, ?, ?)",
+        [(f"P-{n}",
+          f"{random.choice(NOMBRES)} {random.choice(ADJETIVOS)} {n}",
+          random.randint(1, len(MARCAS)),
+          random.randint(1, len(CATEGORIAS))) for n in range(total)])
+    conn.executemany(
+        "INSERT INTO inventario (id_producto, stock, estado_stock) VALUES (?, ?, 'disponible')",
+        [(n + 1, random.randint(0, 30)) for n in range(total)])
+    conn.commit()
+
+
+def medir(funcion, repeticiones=5):
+    """Retorna (mejor tiempo en ms, filas)"""
+    mejor, filas = None, 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = funcion()
+        total = (time.perf_counter() - inicio) * 1000
+        mejor = total if mejor is None else min(mejor, total)
+    return mejor, filas
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        database.DB_PATH = os.path.join(carpeta, "bench.db")
+        from models.product_model import LIKE_SEARCH_SQL, ProductModel
+
+        model = ProductModel()
+        if not model.fts_enabled:
+            print("Este SQLite no incluye FTS5; no hay nada que comparar")
+            return
+        poblar(model.conn, total)
+        print(f"Productos: {total}\n")
+        print(f"{'Término':<14}{'LIKE 1ª pág':>14}{'FTS 1ª pág':>14}"
+              f"{'LIKE todo':>14}{'FTS todo':>14}{'LIKE filas':>12}{'FTS filas':>12}")
+
+        for termino in TERMINOS:
+            like_params = (f"%{termino}%", f"%{termino}%")
+            like_pagina, _ = medir(lambda: len(model.get_products_page(
+                LIKE_SEARCH_SQL, like_params)[0]))
+            fts_pagina, _ = medir(lambda: len(model.search_products_page(termino)[0]))
+            like_todo, like_filas = medir(lambda: len(model.get_products_page(
+                LIKE_SEARCH_SQL, like_params, page_size=None)[0]))
+            fts_todo, fts_filas = medir(lambda: len(model.search_products_page(
+                termino, page_size=None)[0]))
+            print(f"{termino:<14}{like_pagina:>11.1f} ms{fts_pagina:>11.1f} ms"
+                  f"{like_todo:>11.1f} ms{fts_todo:>11.1f} ms{like_filas:>12}{fts_filas:>12}")
+
+        print("\nLIKE no ignora acentos ni busca en marca/categoría, por eso las filas difieren.")
+        database.get_pool().close_all()
+
+
+if __name__ == "__main__":
+    main()
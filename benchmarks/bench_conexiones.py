@@ -0,0 +1,64 @@
+"""Benchmark: costo de obtener una conexión antes y después del pool con migraciones.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_conexiones [repeticiones]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import database
+
+
+def conexion_anterior(db_path):
+    """Reproduce el create_connection() original: conectar + DDL completo"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    database._migration_initial_schema(cursor)
+    conn.commit()
+    return conn
+
+
+def medir(nombre, funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<45} {total * 1000 / repeticiones:10.4f} ms/conexión")
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        db_path = os.path.join(carpeta, "bench.db")
+        pool = database.ConnectionPool(db_path)
+        pool.release(pool.acquire())  # Aplica las migraciones una vez
+
+        def antes():
+            conexion_anterior(db_path).close()
+
+        def conexion_nueva():
+            # Conexión física nueva con el esquema ya migrado (p. ej. otro hilo)
+            conn = pool._connect()
+            sqlite3.Connection.close(conn)
+
+        retenida = pool.acquire()  # Conexión del hilo de la interfaz
+
+        def despues():
+            pool.release(pool.acquire())
+
+        print(f"Repeticiones: {repeticiones}")
+        medir("Antes: connect + CREATE TABLE x16", antes, repeticiones)
+        medir("Después: conexión física nueva", conexion_nueva, repeticiones)
+        medir("Después: conexión reutilizada del pool", despues, repeticiones)
+
+        pool.release(retenida)
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: registro de una entrega línea por línea (anterior) vs. en bloque.
+
+Mide el guardado de una solicitud con 1, 50 y 500 líneas: detalle,
+descuento de stock y movimiento de salida por cada producto.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_entregas [repeticiones]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import database
+from stock_events import get_stock_events
+
+LINEAS = [1, 50, 500]
+STOCK_INICIAL = 1000000
+
+
+def poblar(conn, total):
+    """Crea un departamento, un solicitante y total productos con stock"""
+    conn.execute("INSERT INTO departamentos (nombre) VALUES ('Bodega')")
+    conn.execute(
+        "INSERT INTO solicitantes (cedula, nombre, id_departamento) VALUES ('1', 'Solicitante', 1)")
+    conn.executemany(
+        "INSERT INTO productos (codigo, nombre) VALUES (?, ?)",
+        [(f"P-{n}", f"Producto {n}") for n in range(total)])
+    conn.executemany(
+        "INSERT INTO inventario (id_producto, stock, estado_stock) VALUES (?, ?, 'disponible')",
+        [(n + 1, STOCK_INICIAL) for n in range(total)])
+    conn.commit()
+
+
+def entrega_anterior(model, datos, lineas, memo):
+    """Reproduce el _registrar_productos_entrega original (3 sentencias por línea)"""
+    solicitud_id = model.registrar_solicitud(datos)
+    for producto_id, cantidad in lineas:
+        model.registrar_detalle_solicitud((solicitud_id, producto_id, cantidad))
+        model.reservar_stock([(producto_id, cantidad)])
+        model.registrar_movimiento(
+            id_producto=producto_id, tipo="Salida", cantidad=cantidad,
+            id_responsable=datos[2], referencia=f"Solicitud #{solicitud_id} - {memo}")
+    model.commit()
+    get_stock_events().publish([producto_id for producto_id, _ in lineas])
+
+
+def medir(funcion, repeticiones):
+    """Retorna el mejor tiempo en ms"""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        total = (time.perf_counter() - inicio) * 1000
+        mejor = total if mejor is None else min(mejor, total)
+    return mejor
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        database.DB_PATH = os.path.join(carpeta, "bench.db")
+        from models.solicitudes_model import SolicitudesModel
+
+        model = SolicitudesModel()
+        poblar(model.conn, max(LINEAS))
+        datos = (1, 1, 1, "Memo 1")
+
+        print(f"{'Líneas':>8}{'Anterior':>14}{'En bloque':>14}")
+        for total in LINEAS:
+            lineas = [(n + 1, 1) for n in range(total)]
+            anterior = medir(lambda: entrega_anterior(model, datos, lineas, "Memo 1"), repeticiones)
+            bloque = medir(lambda: model.registrar_entrega(datos, lineas, "Memo 1"), repeticiones)
+            print(f"{total:>8}{anterior:>11.1f} ms{bloque:>11.1f} ms")
+
+        # Ambos caminos descuentan lo mismo: 2 * repeticiones por cada producto usado
+        model.cursor.execute("SELECT MIN(stock) FROM inventario")
+        print(f"\nStock mínimo tras las entregas: {model.cursor.fetchone()[0]}"
+              f" (esperado {STOCK_INICIAL - 2 * repeticiones * len(LINEAS)})")
+        model.close()
+        database.get_pool().close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: recálculo de estado_stock por fila (anterior) vs. sentencia en bloque.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_estado_stock [productos]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import database
+
+
+def poblar(conn, total):
+    """Crea productos con stock aleatorio y estados desactualizados"""
+    random.seed(1)
+    conn.executemany(
+        "INSERT INTO productos (codigo, nombre, stock_minimo) VALUES (?, ?, ?)",
+        [(f"P-{n}", f"Producto {n}", random.randint(0, 10)) for n in range(total)])
+    conn.executemany(
+        "INSERT INTO inventario (id_producto, stock, estado_stock) VALUES (?, ?, 'disponible')",
+        [(n + 1, random.randint(0, 30)) for n in range(total)])
+    conn.commit()
+
+
+def desactualizar(conn):
+    conn.execute("UPDATE inventario SET estado_stock = 'disponible'")
+    conn.commit()
+
+
+def recalculo_anterior(model):
+    """Reproduce el update_product_stock_status() original (N+1 consultas)"""
+    stock_updates = []
+    for item in model.get_products():
+        stock = item[5] if item[5] else 0
+        estado = item[7] if item[7] else "disponible"
+        model.cursor.execute(
+            "SELECT stock_minimo FROM productos WHERE id_producto = ?", (item[0],))
+        resultado = model.cursor.fetchone()
+        stock_minimo = resultado[0] if resultado else 0
+        if stock == 0:
+            nuevo_estado = "agotado"
+        elif stock <= stock_minimo:
+            nuevo_estado = "stock bajo"
+        else:
+            nuevo_estado = "disponible"
+        if estado != nuevo_estado:
+            stock_updates.append((nuevo_estado, item[0]))
+    for estado, id_producto in stock_updates:
+        model.cursor.execute(
+            "UPDATE inventario SET estado_stock = ? WHERE id_producto = ?",
+            (estado, id_producto))
+    model.conn.commit()
+    return len(stock_updates)
+
+
+def medir(nombre, funcion):
+    inicio = time.perf_counter()
+    cambios = funcion()
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<40} {total * 1000:10.1f} ms  ({cambios} cambios)")
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        database.DB_PATH = os.path.join(carpeta, "bench.db")
+        from models.product_model import ProductModel
+
+        model = ProductModel()
+        poblar(model.conn, total)
+        print(f"Productos: {total}")
+
+        desactualizar(model.conn)
+        medir("Anterior: SELECT + UPDATE por fila", lambda: recalculo_anterior(model))
+
+        desactualizar(model.conn)
+        medir("Nuevo: UPDATE en bloque", lambda: len(model.recompute_stock_status()))
+
+        medir("Nuevo: sin cambios pendientes", lambda: len(model.recompute_stock_status()))
+
+        database.get_pool().close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark: exportación con DataFrame + formato (anterior) vs. streaming.
+
+Compara el Excel anterior con los escritores actuales de ExportManager:
+Excel de solo escritura, CSV y Parquet. Cada variante corre en un proceso
+aparte para medir su memoria máxima. El camino anterior arma un DataFrame,
+lo escribe con openpyxl y recorre todas las celdas dos veces más (formato
+y ancho de columnas).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_exportacion [filas] [--solo-streaming]
+"""
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import tempfile
+import time
+
+HEADERS = ["Nro", "Fecha", "Tipo", "Producto",
+           "Cantidad", "Responsable", "Referencia"]
+
+
+def filas(total):
+    """Genera filas con la forma del historial de movimientos"""
+    for n in range(total):
+        yield (n + 1, f"2024-{n % 12 + 1:02d}-{n % 28 + 1:02d} 10:{n % 60:02d}:00",
+               "Entrada" if n % 3 else "Salida", f"Producto {n % 5000}", n % 40 + 1,
+               "Administrador", f"Solicitud #{n} - Memo {n % 900}")
+
+
+def exportacion_anterior(filename, total):
+    """Reproduce export_to_excel + _apply_excel_formatting originales"""
+    import pandas as pd
+    from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+    from openpyxl.utils import get_column_letter
+
+    df = pd.DataFrame(list(filas(total)), columns=HEADERS)
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name="Movimientos", index=False)
+        worksheet = writer.sheets["Movimientos"]
+
+        side = Side(border_style="thin", color="000000")
+        border = Border(left=side, right=side, top=side, bottom=side)
+        for col_num in range(1, len(df.columns) + 1):
+            cell = worksheet.cell(row=1, column=col_num)
+            cell.font = Font(bold=True, color="FFFFFF", size=12)
+            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            cell.border = border
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+        for row_num in range(2, len(df) + 2):
+            for col_num in range(1, len(df.columns) + 1):
+                cell = worksheet.cell(row=row_num, column=col_num)
+                cell.border = border
+                cell.alignment = Alignment(horizontal="left", vertical="center")
+        for col_num, column_title in enumerate(df.columns, 1):
+            max_length = len(str(column_title))
+            for row_num in range(2, len(df) + 2):
+                value = worksheet.cell(row=row_num, column=col_num).value
+                if value:
+                    max_length = max(max_length, len(str(value)))
+            worksheet.column_dimensions[get_column_letter(col_num)].width = max_length + 4
+        worksheet.freeze_panes = "A2"
+        worksheet.auto_filter.ref = worksheet.dimensions
+
+
+def exportacion_streaming(filename, total):
+    from models.export_manager import ExportManager
+    ExportManager._write_excel(filename, filas(total), HEADERS, "Movimientos")
+
+
+def exportacion_csv(filename, total):
+    from models.export_manager import ExportManager
+    ExportManager._write_csv(filename, filas(total), HEADERS)
+
+
+def exportacion_parquet(filename, total):
+    from models.export_manager import ExportManager
+    ExportManager._write_parquet(filename, filas(total), HEADERS)
+
+
+def _medir(variante, filename, total, resultado):
+    try:
+        inicio = time.perf_counter()
+        variante(filename, total)
+        segundos = time.perf_counter() - inicio
+    except Exception as e:
+        # La excepción puede no ser serializable: se envía su texto
+        resultado.put((None, f"{type(e).__name__}: {e}"))
+        return
+    # ru_maxrss está en KB en Linux
+    resultado.put((segundos, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def medir(variante, filename, total):
+    """Retorna (segundos, memoria máxima en MB) de la variante en un proceso nuevo.
+
+    Lanza RuntimeError si la variante falla (p. ej. falta openpyxl o
+    pyarrow) o si el proceso termina sin informar una medición.
+    """
+    resultado = multiprocessing.Queue()
+    proceso = multiprocessing.Process(target=_medir, args=(variante, filename, total, resultado))
+    proceso.start()
+    while True:
+        try:
+            segundos, medicion = resultado.get(timeout=1)
+            break
+        except queue.Empty:
+            if not proceso.is_alive():
+                proceso.join()
+                raise RuntimeError(f"el proceso terminó con código {proceso.exitcode}")
+    proceso.join()
+    if segundos is None:
+        raise RuntimeError(medicion)
+    return segundos, medicion
+
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    total = int(argumentos[0]) if argumentos else 500000
+    variantes = [("Streaming", exportacion_streaming, ".xlsx"),
+                 ("CSV", exportacion_csv, ".csv"),
+                 ("Parquet", exportacion_parquet, ".parquet")]
+    if "--solo-streaming" not in sys.argv:
+        variantes.insert(0, ("Anterior", exportacion_anterior, ".xlsx"))
+
+    print(f"Filas: {total}\n")
+    print(f"{'Variante':<12}{'Tiempo':>12}{'Memoria máx.':>15}{'Archivo':>12}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for nombre, variante, extension in variantes:
+            filename = os.path.join(carpeta, f"{nombre}{extension}")
+            try:
+                segundos, memoria = medir(variante, filename, total)
+            except RuntimeError as e:
+                print(f"{nombre:<12}falló: {e}")
+                continue
+            tamano = os.path.getsize(filename) / 1024 / 1024
+            print(f"{nombre:<12}{segundos:>10.1f} s{memoria:>12.0f} MB{tamano:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
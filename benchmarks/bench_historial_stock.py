@@ -0,0 +1,103 @@
+"""Benchmark: stock en una fecha recorriendo movimientos vs. instantáneas + resumen diario.
+
+El cálculo anterior suma todos los movimientos del producto hasta la
+fecha; el nuevo parte de la instantánea semanal más cercana y suma solo
+los días del resumen desde entonces. Mide el stock en una fecha para
+varios productos y una serie diaria de 90 días.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_historial_stock [movimientos] [productos]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import database
+from benchmarks.bench_movimientos_diarios import DIAS, INICIO, insertar, movimientos
+
+CONSULTAS = 20
+SERIE_DIAS = 90
+
+
+def poblar(conn, total, productos):
+    """Productos con movimientos y el stock actual que resulta de ellos"""
+    conn.executemany(
+        "INSERT INTO productos (codigo, nombre) VALUES (?, ?)",
+        [(f"P-{n}", f"Producto {n}") for n in range(productos)])
+    for lote in movimientos(total, productos):
+        insertar(conn, lote)
+    conn.execute("""
+        INSERT INTO inventario (id_producto, stock, estado_stock)
+        SELECT p.id_producto, COALESCE(SUM(
+            CASE WHEN m.tipo = 'Entrada' THEN m.cantidad ELSE -m.cantidad END), 0), 'disponible'
+        FROM productos p
+        LEFT JOIN movimientos m ON m.id_producto = p.id_producto
+        GROUP BY p.id_producto
+    """)
+    conn.commit()
+
+
+def stock_anterior(cursor, id_producto, dia):
+    """Recorre los movimientos del producto hasta el cierre de dia"""
+    cursor.execute("""
+        SELECT COALESCE(SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE -cantidad END), 0)
+        FROM movimientos WHERE id_producto = ? AND fecha < date(?, '+1 day')
+    """, (id_producto, str(dia)))
+    return cursor.fetchone()[0]
+
+
+def medir(funcion):
+    """Retorna (tiempo en ms, resultado)"""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return (time.perf_counter() - inicio) * 1000, resultado
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    productos = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        database.DB_PATH = os.path.join(carpeta, "bench.db")
+        from models.stock_history_model import SNAPSHOT_INTERVAL_DAYS, StockHistoryModel
+
+        model = StockHistoryModel()
+        poblar(model.conn, total, productos)
+
+        # Instantáneas semanales durante todo el período
+        inicio = time.perf_counter()
+        fin = INICIO.date() + timedelta(days=DIAS - 1)
+        dia = INICIO.date()
+        while dia <= fin:
+            model.take_snapshot(dia)
+            dia += timedelta(days=SNAPSHOT_INTERVAL_DAYS)
+        print(f"Movimientos: {total} de {productos} productos; instantáneas cada "
+              f"{SNAPSHOT_INTERVAL_DAYS} días en {time.perf_counter() - inicio:.1f} s\n")
+
+        ids = [1 + n * productos // CONSULTAS for n in range(CONSULTAS)]
+        fecha = fin - timedelta(days=DIAS // 2)
+        desde = fin - timedelta(days=SERIE_DIAS - 1)
+
+        anterior, esperado = medir(lambda: [stock_anterior(model.cursor, i, fecha) for i in ids])
+        nuevo, obtenido = medir(lambda: [model.stock_at(i, fecha) for i in ids])
+        print(f"Stock en una fecha ({CONSULTAS} productos): {anterior:.1f} ms anterior, "
+              f"{nuevo:.1f} ms con instantáneas{'' if esperado == obtenido else '  (¡difiere!)'}")
+
+        def serie_anterior(id_producto):
+            return [(str(desde + timedelta(days=n)),
+                     stock_anterior(model.cursor, id_producto, desde + timedelta(days=n)))
+                    for n in range(SERIE_DIAS)]
+
+        anterior, esperado = medir(lambda: [serie_anterior(i) for i in ids[:1]])
+        nuevo, obtenido = medir(lambda: [model.daily_series(i, desde, fin) for i in ids[:1]])
+        print(f"Serie de {SERIE_DIAS} días (un producto): {anterior:.1f} ms anterior, "
+              f"{nuevo:.1f} ms con instantáneas{'' if esperado == obtenido else '  (¡difiere!)'}")
+
+        model.close()
+        database.get_pool().close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark: estadísticas de movimientos sobre la tabla completa vs. resumen diario.
+
+Compara, para distintos rangos de fechas, el cálculo anterior (traer
+todos los movimientos a Python y sumarlos), un SUM directo sobre
+movimientos y la consulta sobre movimientos_diarios. También mide lo que
+el trigger del resumen agrega a cada inserción.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_movimientos_diarios [movimientos] [productos]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import database
+
+LOTE = 100000
+DIAS = 3 * 365
+INICIO = datetime(2023, 1, 1)
+INSERCIONES = 100000
+
+# Por encima de estas filas el cálculo anterior no cabe en memoria: se omite
+ANTERIOR_MAX = 1000000
+
+# (nombre, días desde el final del período); None = todo el período
+RANGOS = [("Último día", 1), ("Último mes", 30), ("Último año", 365), ("Todo", None)]
+
+
+def movimientos(total, productos, semilla=1):
+    """Genera lotes de movimientos repartidos en DIAS días"""
+    random.seed(semilla)
+    segundos = DIAS * 86400
+    lote = []
+    for _ in range(total):
+        fecha = INICIO + timedelta(seconds=random.randrange(segundos))
+        lote.append((random.randint(1, productos),
+                     random.choice(("Entrada", "Salida")),
+                     random.randint(1, 20),
+                     fecha.strftime('%Y-%m-%d %H:%M:%S')))
+        if len(lote) == LOTE:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def insertar(conn, lote):
+    conn.executemany(
+        "INSERT INTO movimientos (id_producto, tipo, cantidad, fecha) VALUES (?, ?, ?, ?)",
+        lote)
+    conn.commit()
+
+
+def poblar(conn, total, productos):
+    conn.executemany(
+        "INSERT INTO productos (codigo, nombre) VALUES (?, ?)",
+        [(f"P-{n}", f"Producto {n}") for n in range(productos)])
+    conn.commit()
+    for lote in movimientos(total, productos):
+        insertar(conn, lote)
+
+
+def estadisticas_anterior(model, date_from, date_to):
+    """Reproduce el get_movement_statistics original (todas las filas a Python)"""
+    data = model.get_all_movements("Todos", date_from, date_to)
+    total_entradas = sum(row[4] for row in data if row[2] == "Entrada")
+    total_salidas = sum(row[4] for row in data if row[2] == "Salida")
+    return total_entradas - total_salidas
+
+
+def estadisticas_sum(model, date_from, date_to):
+    """SUM directo sobre movimientos (recorre el rango en el índice por fecha)"""
+    model.cursor.execute("""
+        SELECT COALESCE(SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE -cantidad END), 0)
+        FROM movimientos WHERE fecha >= ? AND fecha < date(?, '+1 day')
+    """, (date_from, date_to))
+    return model.cursor.fetchone()[0]
+
+
+def estadisticas_resumen(model, date_from, date_to):
+    return model.get_movement_statistics("Todos", date_from, date_to)['balance']
+
+
+def medir(funcion, repeticiones):
+    """Retorna (mejor tiempo en ms, resultado)"""
+    mejor, resultado = None, None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        total = (time.perf_counter() - inicio) * 1000
+        mejor = total if mejor is None else min(mejor, total)
+    return mejor, resultado
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+    productos = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        database.DB_PATH = os.path.join(carpeta, "bench.db")
+        from models.movimientos_models import MovementModel
+
+        model = MovementModel()
+        inicio = time.perf_counter()
+        poblar(model.conn, total, productos)
+        model.cursor.execute("SELECT COUNT(*) FROM movimientos_diarios")
+        print(f"Movimientos: {total} de {productos} productos en {DIAS} días "
+              f"({time.perf_counter() - inicio:.0f} s), filas del resumen: "
+              f"{model.cursor.fetchone()[0]}\n")
+
+        fin = INICIO + timedelta(days=DIAS - 1)
+        print(f"{'Rango':<12}{'Anterior':>14}{'SUM':>14}{'Resumen':>14}  Balance")
+        for nombre, dias in RANGOS:
+            desde = (fin - timedelta(days=dias - 1) if dias else INICIO).strftime('%Y-%m-%d')
+            hasta = fin.strftime('%Y-%m-%d')
+            directo, balance_sum = medir(lambda: estadisticas_sum(model, desde, hasta), 3)
+            resumen, balance = medir(lambda: estadisticas_resumen(model, desde, hasta), 5)
+            filas = model.get_movement_statistics("Todos", desde, hasta)['total_movimientos']
+            if filas <= ANTERIOR_MAX:
+                # El filtro anterior compara el texto de la fecha: hasta el final del día
+                tiempo, balance_anterior = medir(
+                    lambda: estadisticas_anterior(model, desde, f"{hasta} 23:59:59"), 1)
+                anterior = f"{tiempo:>11.1f} ms"
+            else:
+                anterior, balance_anterior = f"{'omitido':>14}", balance
+            coincide = "" if balance == balance_sum == balance_anterior else "  (¡difiere!)"
+            print(f"{nombre:<12}{anterior}{directo:>11.1f} ms{resumen:>11.1f} ms"
+                  f"  {balance}{coincide}")
+
+        # Costo del trigger: mismos movimientos con y sin el resumen
+        lote = next(movimientos(INSERCIONES, productos, semilla=2))
+        con_trigger, _ = medir(lambda: insertar(model.conn, lote), 1)
+        for trigger in ("insert", "update", "delete"):
+            model.cursor.execute(f"DROP TRIGGER trg_movimientos_diarios_{trigger}")
+        sin_trigger, _ = medir(lambda: insertar(model.conn, lote), 1)
+        print(f"\nInsertar {INSERCIONES} movimientos: {sin_trigger:.0f} ms sin resumen, "
+              f"{con_trigger:.0f} ms con resumen")
+        database.get_pool().close_all()
+
+
+if __name__ == "__main__":
+    main()
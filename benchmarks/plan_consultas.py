@@ -0,0 +1,151 @@
+"""Verifica con EXPLAIN QUERY PLAN que las consultas de listados no recorren tablas completas.
+
+Ejecuta los métodos reales de los modelos sobre una base temporal, captura el
+SQL que emiten y falla (código de salida 1) si algún plan contiene un
+``SCAN <tabla>`` sin índice o si algún modelo capturó un error de consulta.
+Los conteos acotados de la paginación (``SELECT COUNT(*) FROM (... LIMIT ?)``)
+leen como máximo COUNT_LIMIT filas y no se consideran recorridos completos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.plan_consultas
+
+tests/test_plan_consultas.py ejecuta la misma verificación con pytest.
+"""
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+
+import database
+
+# "SCAN tabla" o "SCAN tabla AS alias" sin "USING ... INDEX". Una tabla FTS5
+# consultada con MATCH aparece como "SCAN t VIRTUAL TABLE INDEX n:M..." y usa
+# su propio índice.
+FULL_SCAN = re.compile(r"^SCAN (?!\()(\S+)(?!.*(USING|VIRTUAL TABLE INDEX \d+:M))")
+
+# Conteo de la primera página de keyset_page
+BOUNDED_COUNT = re.compile(r"^SELECT COUNT\(\*\) FROM \(.* LIMIT \d+\)$", re.S)
+
+
+def capturar_consultas(conn, llamadas):
+    """Ejecuta las llamadas y retorna los SELECT emitidos en la conexión"""
+    consultas = []
+
+    def registrar(sql):
+        if sql.lstrip().upper().startswith("SELECT"):
+            consultas.append(sql)
+
+    conn.set_trace_callback(registrar)
+    try:
+        for llamada in llamadas:
+            llamada()
+    finally:
+        conn.set_trace_callback(None)
+    return consultas
+
+
+def recorridos_completos(conn, consulta):
+    """Retorna las líneas del plan que recorren una tabla completa"""
+    plan = conn.execute("EXPLAIN QUERY PLAN " + consulta).fetchall()
+    return [fila[3] for fila in plan if FULL_SCAN.match(fila[3])]
+
+
+def llamadas_de_listados():
+    """Llamadas a los modelos cuyas consultas se verifican"""
+    from models.product_model import ProductModel
+    from models.movimientos_models import MovementModel
+    from models.solicitudes_model import SolicitudesModel
+    from models.compras_models import PurchaseModel
+
+    productos = ProductModel()
+    movimientos = MovementModel()
+    solicitudes = SolicitudesModel()
+    compras = PurchaseModel()
+
+    llamadas = [
+        lambda: productos.get_products(),
+        lambda: productos.get_products(" AND c.nombre = ?", ("Tóner",)),
+        lambda: productos.get_products(" AND i.estado_stock = ?", ("agotado",)),
+        lambda: movimientos.get_all_movements(),
+        lambda: movimientos.get_all_movements("Entrada"),
+        lambda: movimientos.get_all_movements("Todos", "2025-01-01", "2025-12-31"),
+        lambda: solicitudes.obtener_solicitudes(),
+        lambda: solicitudes.obtener_solicitudes({"dept_filter": "Compras"}),
+        lambda: solicitudes.obtener_productos_solicitud(1),
+        lambda: compras.get_all_requests(),
+        lambda: compras.get_all_requests("Pendiente"),
+        lambda: compras.get_all_requests("Todos", "Alta"),
+        lambda: compras.get_all_requests("Pendiente", "Alta"),
+    ]
+
+    # Páginas siguientes: cursores sintéticos (una clave por columna de orden)
+    # porque la base está vacía
+    llamadas += [
+        lambda: productos.get_products_page(),
+        lambda: productos.get_products_page(after=(("M", 0, 0), 200)),
+        lambda: movimientos.get_movements_page(),
+        lambda: movimientos.get_movements_page(
+            "Entrada", after=(("2025-06-01", 10 ** 9), 200)),
+        lambda: solicitudes.obtener_pagina_solicitudes(
+            after=(("2025-06-01", 10 ** 9), 200)),
+        lambda: compras.get_requests_page(after=((2, "2025-06-01", 10 ** 9), 200)),
+        lambda: productos.search_products_page("tóner hp"),
+        lambda: productos.search_products_page("tóner", after=((-1.5, 10, 0), 200)),
+    ]
+    return productos.conn, llamadas
+
+
+def revisar_planes():
+    """Ejecuta los listados sobre la base de database.DB_PATH y revisa sus planes.
+
+    Retorna (resultados, errores): resultados es una lista de
+    (consulta, recorridos) con recorridos=None para los conteos acotados, y
+    errores son las líneas "Error ..." que los modelos imprimieron al
+    capturar una excepción (una consulta que falló no tiene plan que revisar).
+    """
+    conn, llamadas = llamadas_de_listados()
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        consultas = capturar_consultas(conn, llamadas)
+    errores = [linea for linea in salida.getvalue().splitlines()
+               if linea.startswith("Error")]
+
+    resultados = []
+    for consulta in consultas:
+        if BOUNDED_COUNT.match(consulta.strip()):
+            resultados.append((consulta, None))
+        else:
+            resultados.append((consulta, recorridos_completos(conn, consulta)))
+    return resultados, errores
+
+
+def main():
+    with tempfile.TemporaryDirectory() as carpeta:
+        database.DB_PATH = os.path.join(carpeta, "planes.db")
+        resultados, errores = revisar_planes()
+        database.get_pool().close_all()
+
+    fallas = 0
+    for consulta, recorridos in resultados:
+        resumen = " ".join(consulta.split())[:90]
+        if recorridos is None:
+            print(f"ACOTADA {resumen}")
+        elif recorridos:
+            fallas += 1
+            print(f"FALLA  {resumen}")
+            for linea in recorridos:
+                print(f"       -> {linea}")
+        else:
+            print(f"OK     {resumen}")
+    for error in errores:
+        print(f"ERROR  {error}")
+
+    print(f"\n{len(resultados)} consultas verificadas, {fallas} con recorrido completo, "
+          f"{len(errores)} con error")
+    return 1 if fallas or errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
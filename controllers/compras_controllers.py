@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from background import run_in_background, thread_model
+from database import PagedRows
 from models.compras_models import PurchaseModel
 from views.compras_views import PurchaseView
 from models.export_manager import ExportManager
@@ -21,11 +23,14 @@ class PurchaseController:
 
     def refresh_requests_table(self, status_filter="Todos", priority_filter="Todos"):
         """Actualiza la tabla de solicitudes"""
-        try:
-            data = self.model.get_all_requests(status_filter, priority_filter)
-            self.view.refresh_table(data)
-        except Exception as e:
-            self.view.show_message("Error", f"Error al cargar solicitudes: {e}", "error")
+        run_in_background(
+            self.app, "compras",
+            lambda: PagedRows(
+                lambda after, size: thread_model(PurchaseModel).get_requests_page(
+                    status_filter, priority_filter, after, size)),
+            self.view.refresh_table,
+            lambda e: self.view.show_message(
+                "Error", f"Error al cargar solicitudes: {e}", "error"))
 
     def apply_requests_filters(self, status, priority):
         """Aplica los filtros seleccionados"""
@@ -147,10 +152,7 @@ class PurchaseController:
         """Exportar solicitudes de compra a CSV"""
         try:
             # Obtener datos actuales de la tabla
-            filtered_data = []
-            for item in self.view.tree.get_children():
-                row_data = self.view.tree.item(item)['values']
-                filtered_data.append(row_data)
+            filtered_data = self.view.get_table_data()
 
             # Usar ExportManager para exportar
             filename, error = ExportManager.export_purchases(filtered_data)
@@ -1,3 +1,5 @@
+from background import run_in_background, thread_model
+from database import PagedRows
 from models.movimientos_models import MovementModel
 from models.export_manager import ExportManager
 
@@ -28,20 +30,16 @@ class MovementController:
 
     def refresh_movements_table(self, movement_type="Todos", date_from=None, date_to=None):
         """Actualiza la tabla de movimientos con los filtros aplicados"""
-        try:
-            data = self.model.get_all_movements(
-                movement_type, date_from, date_to)
-            # Adaptar los datos para eliminar la columna de ubicación si está presente
-            # (por si hay datos antiguos con más columnas)
-            data = [row[:7] if len(row) > 7 else row for row in data]  # CORREGIDO: índice más seguro
-            if self.view:
-                self.view.refresh_table(data)
-            return data
-        except Exception as e:
-            if self.view:
-                self.view.show_error(
-                    f"No se pudieron cargar los movimientos: {e}")
-            raise e
+        if not self.view:
+            return
+        run_in_background(
+            self.app, "movimientos",
+            lambda: PagedRows(
+                lambda after, size: thread_model(MovementModel).get_movements_page(
+                    movement_type, date_from, date_to, after, size)),
+            self.view.refresh_table,
+            lambda e: self.view.show_error(
+                f"No se pudieron cargar los movimientos: {e}"))
 
     def register_movement(self, id_producto, tipo, cantidad, id_responsable=None, referencia=None):
         """Registra un movimiento en la base de datos (sin ubicación)"""
@@ -89,20 +87,10 @@ class MovementController:
             return None, error_msg
 
     def get_movement_statistics(self, movement_type="Todos", date_from=None, date_to=None):
-        """Obtiene estadísticas de movimientos (ejemplo de lógica de negocio pura)"""
+        """Obtiene estadísticas de movimientos a partir del resumen diario"""
         try:
-            data = self.model.get_all_movements(
+            return self.model.get_movement_statistics(
                 movement_type, date_from, date_to)
-            # Calcular estadísticas
-            total_entradas = sum(row[4] for row in data if row[2] == "Entrada")
-            total_salidas = sum(row[4] for row in data if row[2] == "Salida")
-
-            return {
-                'total_movimientos': len(data),
-                'total_entradas': total_entradas,
-                'total_salidas': total_salidas,
-                'balance': total_entradas - total_salidas
-            }
         except Exception as e:
             if self.view:
                 self.view.show_error(f"Error al calcular estadísticas: {e}")
@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import messagebox
-from models.product_model import ProductModel
+from background import run_in_background, thread_model
+from database import PagedRows
+from helpers import normalizar_texto
+from models.product_model import ProductModel, matches_search, product_data_error
 from views.product_view import ProductView
 from controllers.movimientos_controllers import MovementController
 from models.export_manager import ExportManager
+from models.import_manager import ImportManager
+
+# Errores de importación que se listan en el mensaje (el resto va al reporte)
+IMPORT_ERRORS_SHOWN = 10
 
 
 class ProductController:
@@ -17,6 +24,9 @@ class ProductController:
         self.model = ProductModel()
         self.view = ProductView(frame=None, app=app)
         self.view.set_controller(self)  # Conectar vista con controlador
+        self._pending_selection = None  # producto a seleccionar al cargar
+        self._last_search = None        # última búsqueda completa, para refinar en memoria
+        self._importing = False         # hay una importación en curso
 
     def show_inventory(self):
         """Mostrar gestión de inventario"""
@@ -59,16 +69,50 @@ class ProductController:
     def refresh_table(self):
         """Refrescar tabla de productos"""
         try:
-            inventario_data = self.model.update_product_stock_status()
-            formatted_data = self._format_table_data(inventario_data)
-            self.view.refresh_table(formatted_data)
-
-            if hasattr(self.app, 'notification_manager'):
-                self.app.notification_manager.check_low_stock()
-
+            # estado_stock lo mantienen los triggers de la base de datos
+            self._load_products(error_message="Error al cargar datos")
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar datos: {e}")
 
+    def _load_products(self, extra_where="", params=(), error_message="Error al cargar datos",
+                       search_term=""):
+        """Consultar productos en segundo plano y mostrarlos al terminar"""
+        run_in_background(
+            self.app, "inventario",
+            lambda: self._paged_products(extra_where, params, search_term),
+            lambda rows: self._show_products(rows, (search_term, extra_where, params)),
+            lambda e: messagebox.showerror("Error", f"{error_message}: {e}"))
+
+    def _show_products(self, rows, search=None):
+        """Mostrar el listado cargado (se llama en el hilo de Tk)"""
+        self.view.refresh_table(rows)
+
+        # Guardar el resultado de una búsqueda si está completo en memoria
+        self._last_search = None
+        if search and search[0] and self.model.fts_enabled and rows.complete:
+            term, extra_where, params = search
+            self._last_search = (normalizar_texto(term).strip(), extra_where, params, list(rows))
+
+        if self._pending_selection is not None:
+            self.view.tree.select_key(self._pending_selection)
+            self._pending_selection = None
+
+    def select_product(self, product_id):
+        """Seleccionar un producto en la tabla, esperando la carga si hace falta"""
+        if not self.view.tree.select_key(str(product_id)):
+            self._pending_selection = str(product_id)
+
+    def _paged_products(self, extra_where="", params=(), search_term=""):
+        """Listado de productos paginado y formateado a medida que se recorre"""
+        # Cada hilo pide sus páginas con su propio modelo (y su conexión)
+        if search_term:
+            fetch_page = lambda after, size: thread_model(ProductModel).search_products_page(
+                search_term, extra_where, params, after, size)
+        else:
+            fetch_page = lambda after, size: thread_model(ProductModel).get_products_page(
+                extra_where, params, after, size)
+        return PagedRows(fetch_page, transform=self._format_table_data)
+
     def _format_table_data(self, inventario_data):
         """Formatear datos para la tabla"""
         formatted_data = []
@@ -92,9 +136,9 @@ class ProductController:
             search_term = self.view.get_search_term()
             filters = self.view.get_filters()
 
-            # CAMBIO: Reemplazar ILIKE por LIKE para SQLite (case-insensitive)
-            extra = " AND (LOWER(p.nombre) LIKE LOWER(?) OR LOWER(p.codigo) LIKE LOWER(?))"
-            params = [f"%{search_term}%", f"%{search_term}%"]
+            # El texto se busca en el índice FTS5 (ver ProductModel.search_products_page)
+            extra = ""
+            params = []
 
             if filters['categoria'] != "Todas":
                 extra += " AND c.nombre = ?"
@@ -104,13 +148,41 @@ class ProductController:
                 extra += " AND i.estado_stock = ?"
                 params.append(filters['estado'].lower() if filters['estado'] != "Stock bajo" else "stock bajo")
 
-            inventario_data = self.model.get_products(extra, tuple(params))
-            formatted_data = self._format_table_data(inventario_data)
-            self.view.refresh_table(formatted_data)
+            if not self._narrow_search(search_term, extra, tuple(params)):
+                self._load_products(extra, tuple(params), "Error al buscar productos",
+                                    search_term)
 
         except Exception as e:
             messagebox.showerror("Error", f"Error al buscar productos: {e}")
 
+    def _narrow_search(self, search_term, extra_where, params):
+        """Refinar en memoria la búsqueda anterior si el término la extiende.
+
+        Si se escribió más texto sobre el término anterior (mismos filtros),
+        las coincidencias nuevas son un subconjunto de las anteriores y no
+        hace falta consultar SQLite. Retorna False si no se pudo refinar.
+        """
+        if not self._last_search:
+            return False
+        last_term, last_extra, last_params, last_rows = self._last_search
+        term = normalizar_texto(search_term).strip()
+        if not term or not term.startswith(last_term) or (extra_where, params) != (last_extra, last_params):
+            return False
+
+        # Filas formateadas: (id, producto, marca, categoría, código, ...)
+        rows = [row for row in last_rows
+                if matches_search(term, (row[1], row[4],
+                                         row[2] if row[2] != "N/A" else "",
+                                         row[3] if row[3] != "N/A" else ""))]
+
+        # Una consulta anterior aún en curso quedaría obsoleta
+        executor = getattr(self.app, "executor", None)
+        if executor is not None:
+            executor.cancel("inventario")
+        self.view.refresh_table(rows)
+        self._last_search = (term, extra_where, params, rows)
+        return True
+
     def apply_filters(self):
         """Aplicar filtros a la tabla"""
         try:
@@ -128,9 +200,7 @@ class ProductController:
                 params.append(filters['estado'].lower(
                 ) if filters['estado'] != "Stock bajo" else "stock bajo")
 
-            inventario_data = self.model.get_products(extra, tuple(params))
-            formatted_data = self._format_table_data(inventario_data)
-            self.view.refresh_table(formatted_data)
+            self._load_products(extra, tuple(params), "Error al aplicar filtros")
 
         except Exception as e:
             messagebox.showerror("Error", f"Error al aplicar filtros: {e}")
@@ -335,29 +405,17 @@ class ProductController:
 
     def _validate_product_data(self, codigo, producto, stock_txt):
         """Validar datos del producto - Modificado para edición"""
-        if not codigo or not producto:
-            messagebox.showwarning(
-                "Campos requeridos", "Código y Producto son campos obligatorios.")
-            return False
-
-        # 🔒 Solo validar stock para nuevos productos
-        if stock_txt != "0":  # En edición pasamos "0" para evitar validación
-            if not stock_txt.isdigit() or int(stock_txt) < 0:
-                messagebox.showerror(
-                    "Stock inválido", "El stock debe ser un número entero positivo.")
-                return False
-
-        if not codigo.replace("-", "").isalnum():
-            messagebox.showerror(
-                "Código inválido", "El código solo debe contener letras, números y guiones.")
-            return False
-
-        if not all(c.isalnum() or c.isspace() for c in producto):
-            messagebox.showerror(
-                "Nombre inválido", "El nombre del producto solo debe contener letras, números y espacios.")
-            return False
-
-        return True
+        # 🔒 Solo se valida stock para nuevos productos: en edición llega "0"
+        error = product_data_error(codigo, producto, stock_txt)
+        if error is None:
+            return True
+
+        title, message = error
+        if title == "Campos requeridos":
+            messagebox.showwarning(title, message)
+        else:
+            messagebox.showerror(title, message)
+        return False
 
     def _register_product_movement(self, product_id, saved_id, stock, ubicacion_id):
         """Registrar movimiento de producto"""
@@ -558,10 +616,7 @@ class ProductController:
         """Exportar inventario a CSV"""
         try:
             # Obtener datos actuales de la tabla
-            filtered_data = []
-            for item in self.view.tree.get_children():
-                row_data = self.view.tree.item(item)['values']
-                filtered_data.append(row_data)
+            filtered_data = self.view.get_table_data()
 
             filename, error = ExportManager.export_inventory(filtered_data)
 
@@ -575,6 +630,67 @@ class ProductController:
             messagebox.showerror(
                 "Error", f"Error al exportar inventario: {str(e)}")
 
+    def import_products(self):
+        """Importar productos nuevos desde un archivo CSV o Excel"""
+        # Un segundo pedido con la misma clave interrumpiría la importación
+        # en curso y descartaría su resultado
+        if self._importing:
+            messagebox.showinfo(
+                "Importación en curso", "Espere a que termine la importación actual.")
+            return
+        filename = ImportManager.ask_open_filename()
+        if not filename:
+            return
+
+        current_user = getattr(self.app, 'current_user', None)
+        current_user_id = getattr(current_user, 'id', None)
+        self._set_importing(True)
+        run_in_background(
+            self.app, "importar_productos",
+            lambda: ImportManager.import_products(
+                filename, thread_model(ProductModel), current_user_id),
+            lambda result: self._finish_import(
+                lambda: self._show_import_result(filename, *result)),
+            lambda e: self._finish_import(lambda: messagebox.showerror(
+                "Error", f"No se pudo importar el archivo: {e}")))
+
+    def _set_importing(self, importing):
+        """Marca la importación en curso y (des)habilita el botón Importar"""
+        self._importing = importing
+        button = getattr(self.view, 'import_button', None)
+        try:
+            if button is not None:
+                button.config(state="disabled" if importing else "normal")
+        except tk.TclError:
+            pass    # La pantalla de inventario ya se cerró
+
+    def _finish_import(self, show_result):
+        self._set_importing(False)
+        show_result()
+
+    def _show_import_result(self, filename, importados, errores):
+        """Resumen de la importación con las primeras filas rechazadas"""
+        self.refresh_table()
+        if not errores:
+            messagebox.showinfo(
+                "Éxito", f"Se importaron {importados} productos correctamente")
+            return
+
+        detalle = "\n".join(f"Fila {fila}: {mensaje}"
+                            for fila, mensaje in errores[:IMPORT_ERRORS_SHOWN])
+        if len(errores) > IMPORT_ERRORS_SHOWN:
+            detalle += f"\n... y {len(errores) - IMPORT_ERRORS_SHOWN} más"
+        try:
+            report = ImportManager.write_error_report(filename, errores)
+            detalle += f"\n\nDetalle completo en {report}"
+        except OSError as e:
+            print(f"No se pudo guardar el reporte de errores: {e}")
+
+        messagebox.showwarning(
+            "Importación con errores",
+            f"Se importaron {importados} productos; {len(errores)} filas "
+            f"con errores:\n\n{detalle}")
+
     def refresh_comboboxes(self):
         """Refrescar todos los combobox con datos actualizados"""
         try:
@@ -1,5 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from background import run_in_background, thread_model
+from database import PagedRows
 from models.proveedores_models import SupplierModel
 from views.proveedores_views import SupplierView
 from models.export_manager import ExportManager
@@ -20,12 +22,14 @@ class SupplierController:
 
     def refresh_suppliers_table(self, category_filter="Todas", rating_filter="Todas", price_filter="Todos"):
         """Actualiza la tabla de proveedores"""
-        try:
-            data = self.model.get_all_suppliers(
-                category_filter, rating_filter, price_filter)
-            self.view.refresh_table(data)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar proveedores: {e}")
+        run_in_background(
+            self.app, "proveedores",
+            lambda: PagedRows(
+                lambda after, size: thread_model(SupplierModel).get_suppliers_page(
+                    category_filter, rating_filter, price_filter, after, size)),
+            self.view.refresh_table,
+            lambda e: messagebox.showerror(
+                "Error", f"Error al cargar proveedores: {e}"))
 
     def apply_suppliers_filters(self, category, rating, price):
         """Aplica los filtros seleccionados"""
@@ -396,10 +400,7 @@ class SupplierController:
         """Exportar proveedores a CSV"""
         try:
             # Obtener datos actuales de la tabla
-            filtered_data = []
-            for item in self.view.tree.get_children():
-                row_data = self.view.tree.item(item)['values']
-                filtered_data.append(row_data)
+            filtered_data = self.view.get_table_data()
 
             # Usar ExportManager para exportar
             filename, error = ExportManager.export_suppliers(filtered_data)
@@ -114,6 +114,17 @@ class SettingsController:
                 "display_columns": ["Nro", "Código", "Nombre", "Marca", "Categoría", "Stock (m)", "Activo"],
                 "column_widths": [50, 80, 150, 100, 100, 80, 60],
                 "id_column": "id_producto"
+            },
+            "configuracion": {
+                "tab_name": "🛠️ Sistema",
+                "table_name": "configuracion",
+                "fields_config": [
+                    ("clave", "entry", None),
+                    ("valor", "entry", None)
+                ],
+                "display_columns": ["Nro", "Clave", "Valor"],
+                "column_widths": [50, 200, 150],
+                "id_column": "id_configuracion"
             }
         }
     # controllers/settings_controller.py - MODIFICAR SOLO ESTE MÉTODO
@@ -127,8 +138,8 @@ class SettingsController:
 
         # Crear pestañas según permisos
         for tab_key, config in self.tabs_config.items():
-            # Si no es admin, omitir la pestaña de usuarios
-            if tab_key == "usuarios" and not is_admin:
+            # Si no es admin, omitir las pestañas de usuarios y sistema
+            if tab_key in ("usuarios", "configuracion") and not is_admin:
                 continue
                 
             self._create_tab(notebook, tab_key, config)
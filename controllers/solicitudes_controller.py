@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox
-from models.solicitudes_model import SolicitudesModel
+from background import run_in_background, thread_model
+from database import PagedRows
+from master_data import get_master_data
+from models.solicitudes_model import SolicitudesModel, StockInsuficienteError
 from views.solicitudes_view import SolicitudesView
 from controllers.movimientos_controllers import MovementController
 from models.export_manager import ExportManager
@@ -42,8 +45,15 @@ class SolicitudesController:
     def cargar_solicitudes(self):
         """Cargar solicitudes en la tabla"""
         filtros = self.view.obtener_filtros()
-        solicitudes = self.model.obtener_solicitudes(filtros)
-        self.view.actualizar_tabla_solicitudes(solicitudes)
+        run_in_background(
+            self.app, "solicitudes",
+            lambda: PagedRows(
+                lambda after, size: thread_model(SolicitudesModel).obtener_pagina_solicitudes(
+                    filtros, after, size),
+                transform=self.view.formatear_solicitudes),
+            self.view.actualizar_tabla_solicitudes,
+            lambda e: messagebox.showerror(
+                "Error", f"No se pudieron cargar las solicitudes: {e}"))
 
     def buscar_solicitudes(self):
         """Buscar solicitudes según los filtros"""
@@ -88,9 +98,7 @@ class SolicitudesController:
         if not categoria_nombre:
             return
 
-        categorias = self.model.obtener_categorias_en_inventario()
-        categoria_id = next(
-            (c[0] for c in categorias if c[1] == categoria_nombre), None)
+        categoria_id = get_master_data().id_by_name("categorias", categoria_nombre)
 
         if categoria_id:
             # ✅ Usar solo productos de inventario
@@ -214,27 +222,23 @@ class SolicitudesController:
             if not id_responsable_entrega:
                 return
 
-            # Registrar la solicitud
+            # Registrar la solicitud, sus productos y movimientos en bloque
             datos_solicitud = (
                 departamentos[dept_combo.current()][0],
                 solicitantes[sol_combo.current()][0],
                 id_responsable_entrega,
                 memo_entry.get().strip()
             )
+            self.model.registrar_entrega(
+                datos_solicitud, self._lineas_entrega(output_tree),
+                memo_entry.get().strip())
 
-            solicitud_id = self.model.registrar_solicitud(datos_solicitud)
-            if not solicitud_id:
-                raise Exception("No se pudo registrar la solicitud")
-
-            # Registrar productos y movimientos
-            self._registrar_productos_entrega(
-                solicitud_id, output_tree, id_responsable_entrega, memo_entry.get().strip())
-
-            self.model.commit()
             messagebox.showinfo("Éxito", "Entrega registrada correctamente")
             window.destroy()
             self.cargar_solicitudes()
 
+        except StockInsuficienteError as e:
+            self._mostrar_faltantes(e.faltantes)
         except Exception as e:
             messagebox.showerror(
                 "Error", f"No se pudo registrar la entrega: {e}")
@@ -267,28 +271,27 @@ class SolicitudesController:
             return None
         return self.app.current_user.id
 
-    def _registrar_productos_entrega(self, solicitud_id, output_tree, id_responsable_entrega, memo_text):
-        """Registrar productos de la entrega"""
+    def _mostrar_faltantes(self, faltantes):
+        """Informar los productos sin stock suficiente y corregir el stock mostrado"""
+        nombres = {info['id']: nombre for nombre, info in self.producto_info.items()}
+        detalle = []
+        for producto_id, solicitado, disponible in faltantes:
+            nombre = nombres.get(producto_id, f"Producto #{producto_id}")
+            detalle.append(f"- {nombre}: solicitado {solicitado}, disponible {disponible}")
+            # Otra entrega descontó stock desde que se abrió el formulario
+            if nombre in self.stock_actual:
+                self.stock_actual[nombre] = disponible - solicitado
+        messagebox.showwarning(
+            "Stock insuficiente",
+            "No se registró la entrega. Ajuste las cantidades de:\n" + "\n".join(detalle))
+
+    def _lineas_entrega(self, output_tree):
+        """Líneas (id_producto, cantidad) de la lista de entrega"""
+        lineas = []
         for item in output_tree.get_children():
             producto_nombre, cantidad, _ = output_tree.item(item)["values"]
-            cantidad = int(cantidad)
-            producto_id = self.producto_info[producto_nombre]['id']
-
-            # Registrar detalle
-            detalle_data = (solicitud_id, producto_id, cantidad)
-            self.model.registrar_detalle_solicitud(detalle_data)
-
-            # Actualizar inventario
-            self.model.actualizar_inventario(producto_id, cantidad)
-
-            # Registrar movimiento usando el mismo modelo
-            self.model.registrar_movimiento(
-                id_producto=producto_id,
-                tipo="Salida",
-                cantidad=cantidad,
-                id_responsable=id_responsable_entrega,
-                referencia=f"Solicitud #{solicitud_id} - {memo_text}"
-            )
+            lineas.append((self.producto_info[producto_nombre]['id'], int(cantidad)))
+        return lineas
 
     def mostrar_detalles_solicitud(self):
         """Mostrar detalles de la solicitud seleccionada"""
@@ -432,31 +435,12 @@ class SolicitudesController:
         """Exportar solicitudes a Excel, una fila por producto solicitado"""
         try:
             filtros = self.view.obtener_filtros()
-            solicitudes = self.model.obtener_solicitudes(filtros)
-            # solicitudes: [nro, fecha, departamento, solicitante, referencia, responsable_entrega, id_solicitud]
-            export_rows = []
-            for row in solicitudes:
-                nro, fecha, departamento, solicitante, referencia, responsable_entrega, id_solicitud = row
-                productos = self.model.obtener_productos_solicitud(
-                    id_solicitud)
-                # productos: [(nombre, cantidad, codigo)]
-                if productos:
-                    for prod in productos:
-                        nombre_producto, cantidad, _ = prod
-                        export_rows.append([
-                            nro, fecha, departamento, solicitante, referencia, nombre_producto, cantidad, responsable_entrega
-                        ])
-                else:
-                    # Si no hay productos, dejar vacío
-                    export_rows.append([
-                        nro, fecha, departamento, solicitante, referencia, '', '', responsable_entrega
-                    ])
-
             headers = [
                 "Nro", "Fecha", "Departamento", "Solicitante", "Referencia", "Producto", "Cantidad", "Responsable Entrega"
             ]
+            # Una sola consulta; las filas van del cursor al archivo por bloques
             filename, error = ExportManager.export_with_custom_format(
-                export_rows, headers, "solicitudes", "Solicitudes")
+                self.model.cursor_exportacion(filtros), headers, "solicitudes", "Solicitudes")
 
             if error:
                 messagebox.showerror("Error", f"Error al exportar: {error}")
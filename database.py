@@ -1,29 +1,457 @@
 import sqlite3
 import os
+import threading
 from tkinter import messagebox
 
-def create_connection():
-    """Crea y retorna una conexión a SQLite"""
-    try:
-        # La base de datos se creará en el mismo directorio que la aplicación
-        db_path = "inventario_usm.db"
-        
-        conn = sqlite3.connect(db_path)
+# La base de datos se creará en el mismo directorio que la aplicación
+DB_PATH = "inventario_usm.db"
+
+# Máximo de conexiones físicas abiertas a la vez (hilo principal + trabajadores)
+POOL_MAX_SIZE = 4
+
+# Perfil de PRAGMA aplicado a cada conexión nueva. Cada valor puede
+# sobrescribirse desde Ajustes > Sistema con la clave "pragma.<nombre>".
+# WAL permite que el dashboard, las notificaciones y los listados lean
+# mientras otra pantalla escribe.
+PRAGMA_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": "-20000",      # Negativo = KiB (~20 MB por conexión)
+    "mmap_size": "268435456",    # 256 MB
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",      # ms de espera ante un bloqueo de escritura
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """Conexión SQLite que vuelve al pool en lugar de cerrarse"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.pragma_version = None    # Versión del perfil aplicada
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+
+class ConnectionPool:
+    """Pool de conexiones SQLite compartidas por hilo.
+
+    Todos los modelos que viven en un mismo hilo (por ejemplo, la interfaz Tk)
+    reutilizan la misma conexión física; cada hilo adicional recibe la suya,
+    hasta un máximo de ``max_size`` conexiones abiertas.
+    """
+
+    def __init__(self, db_path=DB_PATH, max_size=POOL_MAX_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self._idle = []
+        self._size = 0
+        self._refs = {}
+        self._local = threading.local()
+        self._available = threading.Condition(threading.Lock())
+        self._schema_ready = False
+        self.pragmas = dict(PRAGMA_PROFILE)
+        self.pragma_version = 0
+        self.schema = {}
+
+    def _connect(self):
+        """Abre una conexión física ya configurada"""
+        conn = sqlite3.connect(self.db_path, factory=PooledConnection,
+                               check_same_thread=False)
         conn.row_factory = sqlite3.Row  # Para acceder a las columnas por nombre
-        
-        # Crear las tablas si no existen
-        create_tables(conn)
-        
+        conn.pool = self
+
+        # Las migraciones solo se verifican con la primera conexión del proceso
+        if not self._schema_ready:
+            run_migrations(conn)
+            self.pragmas = load_pragma_profile(conn)
+            self.schema = load_schema(conn)
+            self._schema_ready = True
+
+        self._apply_pragmas(conn)
+        return conn
+
+    def _apply_pragmas(self, conn):
+        """Aplica el perfil vigente a conn si tiene una versión anterior"""
+        version = self.pragma_version
+        if conn.pragma_version == version:
+            return
+        # Dentro de una transacción algunos PRAGMA fallan: se reintenta al
+        # volver a tomar la conexión
+        if conn.in_transaction:
+            return
+        apply_pragmas(conn, self.pragmas)
+        conn.pragma_version = version
+
+    def reload_pragmas(self):
+        """Relee el perfil de PRAGMA y lo aplica a todas las conexiones del pool.
+
+        La del hilo actual lo recibe enseguida; las demás, la próxima vez
+        que se tomen con acquire().
+        """
+        conn = self.acquire()
+        try:
+            self.pragmas = load_pragma_profile(conn)
+            self.pragma_version += 1
+            self._apply_pragmas(conn)
+        finally:
+            self.release(conn)
+
+    def reload_schema(self):
+        """Relee los metadatos del esquema (tras migrar o alterar tablas)"""
+        conn = self.acquire()
+        try:
+            self.schema = load_schema(conn)
+        finally:
+            self.release(conn)
+
+    def table_columns(self, table):
+        """Columnas de una tabla según los metadatos cargados (minúsculas)"""
+        if not self._schema_ready:
+            self.release(self.acquire())
+        return self.schema.get(table.lower(), ())
+
+    def has_column(self, table, column):
+        """Indica si la tabla tiene la columna, sin consultar PRAGMA table_info"""
+        return column.lower() in self.table_columns(table)
+
+    def acquire(self):
+        """Obtiene la conexión del hilo actual, creándola si es necesario"""
+        conn = getattr(self._local, "conn", None)
+        with self._available:
+            if conn is None:
+                while not self._idle and self._size >= self.max_size:
+                    self._available.wait()
+
+                if self._idle:
+                    conn = self._idle.pop()
+                else:
+                    self._size += 1
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        self._size -= 1
+                        raise
+
+                self._local.conn = conn
+
+            self._refs[id(conn)] = self._refs.get(id(conn), 0) + 1
+
+        # La conexión ya es de este hilo: ponerla al día fuera del bloqueo
+        self._apply_pragmas(conn)
         return conn
+
+    def release(self, conn):
+        """Devuelve una referencia; la conexión queda libre al soltar la última"""
+        with self._available:
+            refs = self._refs.get(id(conn), 0) - 1
+            if refs > 0:
+                self._refs[id(conn)] = refs
+                return
+
+            self._refs.pop(id(conn), None)
+            if getattr(self._local, "conn", None) is conn:
+                self._local.conn = None
+
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.append(conn)
+            self._available.notify()
+
+    def close_all(self):
+        """Cierra físicamente las conexiones libres del pool"""
+        with self._available:
+            for conn in self._idle:
+                sqlite3.Connection.close(conn)
+                self._size -= 1
+            self._idle = []
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Retorna el pool de conexiones del proceso"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+def load_pragma_profile(conn):
+    """Combina PRAGMA_PROFILE con los valores guardados en la tabla configuracion"""
+    profile = dict(PRAGMA_PROFILE)
+    try:
+        rows = conn.execute(
+            "SELECT clave, valor FROM configuracion WHERE clave LIKE 'pragma.%'"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return profile
+
+    for clave, valor in rows:
+        nombre = clave[len("pragma."):]
+        valor = str(valor).strip() if valor is not None else ""
+        if nombre in PRAGMA_PROFILE and valor.lstrip("-").isalnum():
+            profile[nombre] = valor
+        else:
+            print(f"Configuración de PRAGMA ignorada: {clave}={valor}")
+    return profile
+
+
+def load_schema(conn):
+    """Lee las columnas de todas las tablas: {tabla: (columna, ...)} en minúsculas"""
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")]
+    return {
+        table.lower(): tuple(col[1].lower() for col in conn.execute(
+            f'PRAGMA table_info("{table}")'))
+        for table in tables
+    }
+
+
+def apply_pragmas(conn, profile):
+    """Aplica un perfil de PRAGMA a una conexión"""
+    for nombre, valor in profile.items():
+        # PRAGMA no admite parámetros; los valores ya fueron validados
+        try:
+            conn.execute(f"PRAGMA {nombre} = {valor}")
+        except sqlite3.Error as e:
+            print(f"No se pudo aplicar PRAGMA {nombre}: {e}")
+
+
+def create_connection():
+    """Retorna una conexión a SQLite tomada del pool compartido"""
+    try:
+        return get_pool().acquire()
     except sqlite3.Error as e:
         messagebox.showerror("Error de conexión",
                            f"No se pudo conectar a SQLite: {e}")
         return None
 
-def create_tables(conn):
-    """Crea todas las tablas necesarias en SQLite"""
-    cursor = conn.cursor()
-    
+
+# ===== PAGINACIÓN POR KEYSET =====
+
+# Filas por página de los listados
+PAGE_SIZE = 200
+
+# Tope del conteo de la primera página. Por encima de este valor el total es
+# una estimación (cota inferior) que crece a medida que se cargan páginas.
+COUNT_LIMIT = 10000
+
+
+def _keyset_condition(order_by, keys):
+    """Condición WHERE que deja solo las filas posteriores a keys según order_by"""
+    exprs = [expr for expr, _ in order_by]
+    directions = {direction for _, direction in order_by}
+    if len(directions) == 1:
+        # Misma dirección en todas las columnas: comparación de row values,
+        # que SQLite resuelve con un rango sobre el índice
+        op = ">" if directions == {"ASC"} else "<"
+        placeholders = ", ".join("?" * len(exprs))
+        return f"({', '.join(exprs)}) {op} ({placeholders})", list(keys)
+
+    # Direcciones mixtas: (a > ?) OR (a = ? AND b < ?) OR ...
+    terms, params = [], []
+    for i, (expr, direction) in enumerate(order_by):
+        parts = [f"{prev} = ?" for prev in exprs[:i]]
+        parts.append(f"{expr} {'>' if direction == 'ASC' else '<'} ?")
+        terms.append("(" + " AND ".join(parts) + ")")
+        params.extend(keys[:i + 1])
+    return "(" + " OR ".join(terms) + ")", params
+
+
+def keyset_page(cursor, query, params, order_by, after=None,
+                page_size=PAGE_SIZE, numbered=False):
+    """Ejecuta una página de un listado paginado por keyset.
+
+    query es un SELECT con cláusula WHERE cuyas últimas columnas son las
+    expresiones de order_by (la última debe ser única, p. ej. el id).
+    after es el cursor retornado por la página anterior (None para la
+    primera) y page_size=None trae todas las filas restantes. Con
+    numbered=True se antepone el número de fila correlativo.
+
+    Retorna (filas, siguiente_cursor, total). El total solo se calcula en la
+    primera página, exacto hasta COUNT_LIMIT, y siguiente_cursor es None
+    cuando no quedan filas.
+    """
+    params = list(params)
+    key_count = len(order_by)
+
+    total = None
+    if after is None:
+        if page_size is not None:
+            cursor.execute(f"SELECT COUNT(*) FROM ({query} LIMIT ?)",
+                           params + [COUNT_LIMIT])
+            total = cursor.fetchone()[0]
+        position = 0
+    else:
+        keys, position = after
+        condition, key_params = _keyset_condition(order_by, keys)
+        query += " AND " + condition
+        params += key_params
+
+    query += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr, direction in order_by)
+    if page_size is not None:
+        query += " LIMIT ?"
+        params.append(page_size)
+
+    cursor.execute(query, params)
+    fetched = cursor.fetchall()
+
+    rows = []
+    for i, row in enumerate(fetched, start=position + 1):
+        values = tuple(row)[:-key_count]
+        rows.append((i,) + values if numbered else values)
+
+    next_cursor = None
+    if fetched and page_size is not None and len(fetched) == page_size:
+        next_cursor = (tuple(fetched[-1])[-key_count:], position + len(fetched))
+    if total is None and after is None:
+        total = len(rows)
+    return rows, next_cursor, total
+
+
+class PagedRows:
+    """Secuencia perezosa sobre un listado paginado por keyset.
+
+    fetch_page(after, page_size) debe retornar lo mismo que keyset_page.
+    Las páginas se piden a medida que se accede a filas aún no cargadas, así
+    que la tabla virtual muestra la primera página de inmediato. Con
+    load_with() esas páginas se consultan en otro hilo en lugar de bloquear
+    al que accede.
+    """
+
+    def __init__(self, fetch_page, transform=None, page_size=PAGE_SIZE):
+        self._fetch_page = fetch_page
+        self._transform = transform
+        self._page_size = page_size
+        self._rows = []
+        self._submit = None
+        self._loading = False
+        rows, self._next, self._total = fetch_page(None, page_size)
+        self._append(rows)
+
+    def _append(self, rows):
+        self._rows.extend(self._format(rows))
+
+    def _format(self, rows):
+        return self._transform(rows) if self._transform else rows
+
+    def load_with(self, submit, on_loaded, on_error=None):
+        """Consulta las páginas pendientes con submit() en vez de en el hilo que accede.
+
+        submit(work, on_done, on_error) debe ejecutar work() en otro hilo y
+        llamar a on_done(resultado) u on_error(excepción) en el hilo que lee
+        las filas (p. ej. BackgroundExecutor.submit). Desde entonces el
+        acceso por índice o slicing entrega solo las filas ya cargadas y
+        pide las que faltan; on_loaded() avisa cuando llegan y on_error(e)
+        cuando la consulta falla. __iter__ y stream() siguen consultando en
+        el hilo que recorre.
+        """
+        self._submit = submit
+        self._on_loaded = on_loaded
+        self._on_error = on_error
+        self._loading = False
+
+    def _request(self, stop):
+        """Asegura las filas hasta stop (None = todas) o las pide en segundo plano"""
+        if self._submit is None:
+            self._load_until(stop)
+            return
+        if self._loading or self._next is None or (stop is not None and stop <= len(self._rows)):
+            return
+
+        after = self._next
+        size = self._page_size if stop is None else max(self._page_size, stop - len(self._rows))
+
+        def work():
+            rows, next_cursor, _ = self._fetch_page(after, size)
+            return self._format(rows), next_cursor
+
+        def done(result):
+            self._loading = False
+            if self._next is not after:
+                return    # __iter__ ya cargó estas filas en el hilo que recorre
+            rows, self._next = result
+            self._rows.extend(rows)
+            self._on_loaded()
+
+        def failed(error):
+            self._loading = False
+            if self._on_error is not None:
+                self._on_error(error)
+            else:
+                print(f"Error al cargar filas: {error}")
+
+        self._loading = True
+        self._submit(work, done, failed)
+
+    def _load_until(self, stop):
+        while self._next is not None and (stop is None or len(self._rows) < stop):
+            # Un salto largo (p. ej. arrastrar el scrollbar) se trae en una sola consulta
+            size = self._page_size if stop is None else max(self._page_size, stop - len(self._rows))
+            rows, self._next, _ = self._fetch_page(self._next, size)
+            self._append(rows)
+
+    @property
+    def complete(self):
+        """True cuando ya se cargaron todas las filas"""
+        return self._next is None
+
+    @property
+    def loaded(self):
+        """Filas ya cargadas, sin pedir las que faltan"""
+        return self._rows
+
+    def __len__(self):
+        if self._next is None:
+            return len(self._rows)
+        # El total se cuenta solo hasta COUNT_LIMIT: mientras queden páginas
+        # se anuncia al menos una fila más, así la ventana que llega al final
+        # de lo cargado pide la página siguiente
+        return max(self._total or 0, len(self._rows) + 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            stop = index.stop if index.stop is not None and index.stop >= 0 else None
+            self._request(stop)
+            return self._rows[index]
+        self._request(None if index < 0 else index + 1)
+        return self._rows[index]
+
+    def __iter__(self):
+        index = 0
+        while True:
+            self._load_until(index + 1)
+            if index >= len(self._rows):
+                return
+            yield self._rows[index]
+            index += 1
+
+    def stream(self, chunk_size=PAGE_SIZE):
+        """Recorre todas las filas sin guardar en memoria las que faltan cargar.
+
+        Las filas ya cargadas se entregan tal cual; el resto se consulta en
+        páginas de chunk_size que se descartan después de entregarlas (útil
+        para exportar listados completos).
+        """
+        loaded, after = len(self._rows), self._next
+        yield from self._rows[:loaded]
+        while after is not None:
+            rows, after, _ = self._fetch_page(after, chunk_size)
+            yield from self._format(rows)
+
+
+def _migration_initial_schema(cursor):
+    """Migración 1: crea todas las tablas necesarias en SQLite"""
     # CATEGORIAS
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS categorias (
@@ -195,8 +623,6 @@ def create_tables(conn):
         )
     ''')
     
-    conn.commit()
-    
     # Crear usuario admin por defecto si no existe
     cursor.execute("SELECT COUNT(*) FROM usuarios WHERE usuario = 'admin'")
     if cursor.fetchone()[0] == 0:
@@ -205,4 +631,359 @@ def create_tables(conn):
             VALUES ('Administrador', 'admin@usm.edu', 'admin', 
                    '8c6976e5b5410415bde908bd4dee15dfb167a9c873fc4bb8a81f6f2ab448a918', 'admin')
         ''')  # password: admin (SHA-256)
-        conn.commit()
\ No newline at end of file
+
+
+def _migration_secondary_indexes(cursor):
+    """Migración 2: índices secundarios para las consultas de listados"""
+    # ProductModel.get_products: filtra activo y ordena por nombre;
+    # el JOIN con inventario queda cubierto sin tocar la tabla
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_productos_activo_nombre
+        ON productos (activo, nombre)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_inventario_producto
+        ON inventario (id_producto, stock, estado_stock, id_ubicacion)
+    ''')
+
+    # MovementModel.get_all_movements: orden por fecha y filtro por tipo
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_movimientos_fecha
+        ON movimientos (fecha)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_movimientos_tipo_fecha
+        ON movimientos (tipo, fecha)
+    ''')
+
+    # SolicitudesModel.obtener_solicitudes y obtener_productos_solicitud
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_solicitudes_activo_fecha
+        ON solicitudes (activo, fecha_solicitud)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_detalle_solicitud_solicitud
+        ON detalle_solicitud (id_solicitud, id_producto, cantidad)
+    ''')
+
+    # PurchaseModel.get_all_requests: filtros por estado/prioridad y orden por fecha
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_solicitudes_compra_estado
+        ON solicitudes_compra (estado, prioridad, fecha)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_solicitudes_compra_prioridad
+        ON solicitudes_compra (prioridad, fecha)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_solicitudes_compra_fecha
+        ON solicitudes_compra (fecha)
+    ''')
+
+
+def _migration_settings_table(cursor):
+    """Migración 3: tabla de configuración del sistema con el perfil de PRAGMA"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS configuracion (
+            id_configuracion INTEGER PRIMARY KEY AUTOINCREMENT,
+            clave VARCHAR(100) NOT NULL UNIQUE,
+            valor VARCHAR(100) NOT NULL
+        )
+    ''')
+
+    cursor.executemany(
+        "INSERT OR IGNORE INTO configuracion (clave, valor) VALUES (?, ?)",
+        [(f"pragma.{nombre}", valor) for nombre, valor in PRAGMA_PROFILE.items()])
+
+
+def stock_status_sql(stock, id_producto):
+    """Expresión SQL que calcula estado_stock a partir del stock y el stock mínimo"""
+    return f"""
+        CASE
+            WHEN COALESCE({stock}, 0) = 0 THEN 'agotado'
+            WHEN COALESCE({stock}, 0) <= COALESCE(
+                (SELECT p.stock_minimo FROM productos p
+                 WHERE p.id_producto = {id_producto}), 0)
+                THEN 'stock bajo'
+            ELSE 'disponible'
+        END
+    """
+
+
+def _migration_stock_status_triggers(cursor):
+    """Migración 4: triggers que mantienen estado_stock siempre actualizado"""
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_inventario_estado_insert
+        AFTER INSERT ON inventario
+        BEGIN
+            UPDATE inventario
+            SET estado_stock = {stock_status_sql("NEW.stock", "NEW.id_producto")}
+            WHERE id_inventario = NEW.id_inventario;
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_inventario_estado_update
+        AFTER UPDATE OF stock ON inventario
+        BEGIN
+            UPDATE inventario
+            SET estado_stock = {stock_status_sql("NEW.stock", "NEW.id_producto")}
+            WHERE id_inventario = NEW.id_inventario;
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_productos_stock_minimo
+        AFTER UPDATE OF stock_minimo ON productos
+        BEGIN
+            UPDATE inventario
+            SET estado_stock = {stock_status_sql("inventario.stock", "inventario.id_producto")}
+            WHERE id_producto = NEW.id_producto;
+        END
+    ''')
+
+    # Corregir los estados que hayan quedado desactualizados antes de los triggers
+    cursor.execute(f'''
+        UPDATE inventario
+        SET estado_stock = {stock_status_sql("inventario.stock", "inventario.id_producto")}
+    ''')
+
+
+# Rango de prioridad de solicitudes_compra (Alta primero). El listado ordena y
+# pagina por esta expresión, y el índice de la migración 5 la indexa tal cual.
+PRIORITY_RANK_SQL = """CASE prioridad
+            WHEN 'Alta' THEN 1
+            WHEN 'Media' THEN 2
+            WHEN 'Baja' THEN 3
+            ELSE 4
+        END"""
+
+
+def _migration_pagination_indexes(cursor):
+    """Migración 5: índice para paginar solicitudes de compra por prioridad"""
+    cursor.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_solicitudes_compra_rango
+        ON solicitudes_compra ({PRIORITY_RANK_SQL}, fecha)
+    ''')
+
+
+# Índice de texto completo de productos. remove_diacritics hace que "toner"
+# encuentre "Tóner" y prefix acelera las búsquedas por prefijo de 2 y 3 letras.
+PRODUCTS_FTS_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+        nombre, codigo, marca, categoria,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+
+
+def products_fts_row_sql(where):
+    """SELECT que arma las filas de productos_fts (rowid = id_producto)"""
+    return f"""
+        SELECT p.id_producto, p.nombre, p.codigo,
+               COALESCE(m.nombre, ''), COALESCE(c.nombre, '')
+        FROM productos p
+        LEFT JOIN marcas m ON p.id_marca = m.id_marca
+        LEFT JOIN categorias c ON p.id_categoria = c.id_categoria
+        WHERE {where}
+    """
+
+
+def _migration_products_fts(cursor):
+    """Migración 6: índice FTS5 de productos sincronizado con triggers"""
+    try:
+        cursor.execute(PRODUCTS_FTS_SQL)
+    except sqlite3.OperationalError as e:
+        # SQLite compilado sin FTS5: la búsqueda sigue usando LIKE
+        print(f"FTS5 no disponible, se omite el índice de búsqueda: {e}")
+        return
+
+    insert = "INSERT INTO productos_fts (rowid, nombre, codigo, marca, categoria)"
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_productos_fts_insert
+        AFTER INSERT ON productos
+        BEGIN
+            {insert} {products_fts_row_sql("p.id_producto = NEW.id_producto")};
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_productos_fts_update
+        AFTER UPDATE OF nombre, codigo, id_marca, id_categoria ON productos
+        BEGIN
+            DELETE FROM productos_fts WHERE rowid = OLD.id_producto;
+            {insert} {products_fts_row_sql("p.id_producto = NEW.id_producto")};
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_productos_fts_delete
+        AFTER DELETE ON productos
+        BEGIN
+            DELETE FROM productos_fts WHERE rowid = OLD.id_producto;
+        END
+    ''')
+
+    # Renombrar una marca o categoría cambia el texto indexado de sus productos
+    for table, id_column in (("marcas", "id_marca"), ("categorias", "id_categoria")):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update
+            AFTER UPDATE OF nombre ON {table}
+            BEGIN
+                DELETE FROM productos_fts WHERE rowid IN (
+                    SELECT id_producto FROM productos WHERE {id_column} = NEW.{id_column});
+                {insert} {products_fts_row_sql(f"p.{id_column} = NEW.{id_column}")};
+            END
+        ''')
+
+    cursor.execute("DELETE FROM productos_fts")
+    cursor.execute(f"{insert} {products_fts_row_sql('1 = 1')}")
+
+
+def daily_movements_upsert_sql(sign, row):
+    """Suma (sign = '+') o resta (sign = '-') el movimiento row (NEW u OLD) a su día"""
+    sql = f"""
+        INSERT INTO movimientos_diarios (dia, id_producto, tipo, movimientos, cantidad)
+        VALUES (date({row}.fecha), {row}.id_producto, {row}.tipo, {sign}1, {sign}{row}.cantidad)
+        ON CONFLICT (dia, id_producto, tipo) DO UPDATE SET
+            movimientos = movimientos + excluded.movimientos,
+            cantidad = cantidad + excluded.cantidad;
+    """
+    if sign == "-":
+        # El día queda sin movimientos de ese producto y tipo
+        sql += f"""
+        DELETE FROM movimientos_diarios
+        WHERE dia = date({row}.fecha) AND id_producto = {row}.id_producto
+          AND tipo = {row}.tipo AND movimientos = 0;
+        """
+    return sql
+
+
+def _migration_daily_movements(cursor):
+    """Migración 7: resumen diario de movimientos mantenido por triggers"""
+    # Una fila por día, producto y tipo; las estadísticas por rango leen
+    # esta tabla en lugar de recorrer movimientos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS movimientos_diarios (
+            dia DATE NOT NULL,
+            id_producto INTEGER NOT NULL,
+            tipo VARCHAR(10) NOT NULL,
+            movimientos INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL,
+            PRIMARY KEY (dia, id_producto, tipo)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_movimientos_diarios_producto
+        ON movimientos_diarios (id_producto, dia)
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_movimientos_diarios_insert
+        AFTER INSERT ON movimientos
+        BEGIN
+            {daily_movements_upsert_sql("+", "NEW")}
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_movimientos_diarios_update
+        AFTER UPDATE OF id_producto, tipo, cantidad, fecha ON movimientos
+        BEGIN
+            {daily_movements_upsert_sql("-", "OLD")}
+            {daily_movements_upsert_sql("+", "NEW")}
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_movimientos_diarios_delete
+        AFTER DELETE ON movimientos
+        BEGIN
+            {daily_movements_upsert_sql("-", "OLD")}
+        END
+    ''')
+
+    # Resumen de los movimientos registrados antes de la migración
+    cursor.execute("DELETE FROM movimientos_diarios")
+    cursor.execute('''
+        INSERT INTO movimientos_diarios (dia, id_producto, tipo, movimientos, cantidad)
+        SELECT date(fecha), id_producto, tipo, COUNT(*), SUM(cantidad)
+        FROM movimientos
+        GROUP BY date(fecha), id_producto, tipo
+    ''')
+
+
+def _migration_stock_history(cursor):
+    """Migración 8: instantáneas periódicas del stock para consultas históricas"""
+    # Stock de cada producto al cierre de dia; el stock en otra fecha se
+    # obtiene sumando movimientos_diarios desde la instantánea más cercana
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_historico (
+            id_producto INTEGER NOT NULL,
+            dia DATE NOT NULL,
+            stock INTEGER NOT NULL,
+            PRIMARY KEY (id_producto, dia)
+        ) WITHOUT ROWID
+    ''')
+
+
+# Migraciones del esquema en orden: (versión, descripción, función)
+# Cada función recibe un cursor y se ejecuta dentro de una transacción.
+MIGRATIONS = [
+    (1, "Esquema inicial", _migration_initial_schema),
+    (2, "Índices secundarios", _migration_secondary_indexes),
+    (3, "Tabla de configuración", _migration_settings_table),
+    (4, "Triggers de estado de stock", _migration_stock_status_triggers),
+    (5, "Índice de paginación de compras", _migration_pagination_indexes),
+    (6, "Búsqueda de texto completo de productos", _migration_products_fts),
+    (7, "Resumen diario de movimientos", _migration_daily_movements),
+    (8, "Historial de stock", _migration_stock_history),
+]
+
+
+def get_schema_version(conn):
+    """Retorna la versión de esquema aplicada (0 si la base está vacía)"""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return row[0] or 0
+    except sqlite3.OperationalError:
+        return 0
+
+
+def run_migrations(conn):
+    """Aplica las migraciones pendientes una sola vez por archivo de base de datos"""
+    latest = MIGRATIONS[-1][0]
+    if get_schema_version(conn) >= latest:
+        return
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            descripcion VARCHAR(100) NOT NULL,
+            fecha_aplicacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    for version, descripcion, migration in MIGRATIONS:
+        cursor = conn.cursor()
+        try:
+            # BEGIN IMMEDIATE evita que dos instancias apliquen la misma migración
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                "SELECT 1 FROM schema_version WHERE version = ?", (version,))
+            if cursor.fetchone():
+                conn.rollback()
+                continue
+
+            migration(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, descripcion) VALUES (?, ?)",
+                (version, descripcion))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
\ No newline at end of file
@@ -1,6 +1,7 @@
 from tkinter import ttk
 import tkinter as tk
 import smtplib
+import unicodedata
 from email.mime.text import MIMEText
 
 
@@ -70,4 +71,45 @@ def refresh_table_data(tree, data):
     """Actualiza los datos de una tabla"""
     tree.delete(*tree.get_children())
     for row in data:
-        tree.insert("", "end", values=row)
\ No newline at end of file
+        tree.insert("", "end", values=row)
+
+
+def normalizar_texto(texto):
+    """Minúsculas y sin acentos, para comparar texto como lo hace la búsqueda"""
+    descompuesto = unicodedata.normalize("NFKD", str(texto).casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+class Debouncer:
+    """Agrupa llamadas seguidas: solo ejecuta la última tras delay_ms de calma.
+
+    Se usa en los campos de búsqueda para consultar una vez cuando el
+    usuario deja de escribir y no una vez por tecla.
+    """
+
+    def __init__(self, widget, delay_ms, callback):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._job = None
+        self._args = ()
+
+    def __call__(self, *args):
+        self.cancel()
+        self._args = args
+        self._job = self.widget.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._job = None
+        self.callback(*self._args)
+
+    def flush(self):
+        """Ejecuta ya la llamada pendiente, si la hay"""
+        if self._job is not None:
+            self.cancel()
+            self._fire()
+
+    def cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from styles import setup_styles
+from background import BackgroundExecutor, run_in_background, thread_model
 from helpers import clear_frame
 from menu.dashboard import show_dashboard
 from menu.productos import show_inventory
@@ -8,6 +9,7 @@ from menu.pedidos import show_requests
 from menu.compras import show_purchases
 from menu.movimientos import show_movements
 from models.notificaciones import NotificationManager
+from models.stock_history_model import StockHistoryModel
 from menu.ajustes import show_settings
 
 # Importar la nueva estructura MVC del login
@@ -62,6 +64,8 @@ class ModernInventoryApp(tk.Tk):
         self.login_controller = LoginController(self)
         self.login_view = LoginView(self, self.login_controller)
         self.notification_manager = NotificationManager(self)
+        # Consultas de los listados fuera del hilo de Tk
+        self.executor = BackgroundExecutor(self)
 
     def toggle_window_state(self, event=None):
         """Centra la ventana cuando se restaura desde minimizado"""
@@ -98,9 +102,15 @@ class ModernInventoryApp(tk.Tk):
         self._clear_all_widgets()
         self._create_main_interface()
 
-        # Verificar notificaciones
-        self.notification_manager.check_low_stock()
-        self.after(300000, self.notification_manager.check_low_stock)
+        # Notificaciones: carga inicial y un único barrido de conciliación
+        self.notification_manager.start()
+
+        # Instantánea periódica del stock para el historial
+        run_in_background(
+            self, "instantanea_stock",
+            lambda: thread_model(StockHistoryModel).ensure_snapshot(),
+            lambda _: None,
+            lambda e: print(f"No se pudo guardar la instantánea de stock: {e}"))
 
         # Mostrar dashboard por defecto
         show_dashboard(self)
@@ -316,4 +326,6 @@ class ModernInventoryApp(tk.Tk):
     def logout(self):
         """Cierra la sesión del usuario usando el controlador"""
         self.login_controller.logout()
+        self.notification_manager.stop()
+        self.executor.shutdown()
         self.destroy()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import threading
+
+from database import create_connection
+
+# Tablas maestras que usan los formularios: tabla -> columna ID
+MASTER_TABLES = {
+    'marcas': 'id_marca',
+    'categorias': 'id_categoria',
+    'ubicaciones': 'id_ubicacion',
+    'departamentos': 'id_departamento',
+}
+
+
+class MasterDataCache:
+    """Copia en memoria de los registros activos de las tablas maestras.
+
+    Cada tabla se lee una sola vez (id, nombre ordenados por nombre) junto
+    con sus mapas nombre -> id e id -> nombre. Cualquier escritura sobre la
+    tabla debe llamar a invalidate(), que sube su versión y obliga a
+    releerla en el próximo uso.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {table: 0 for table in MASTER_TABLES}
+        self._entries = {}    # tabla -> (versión, filas, nombre->id, id->nombre)
+
+    def version(self, table):
+        """Versión actual de la tabla; cambia con cada invalidación"""
+        return self._versions[table]
+
+    def options(self, table):
+        """Lista de (id, nombre) activos ordenada por nombre"""
+        return list(self._entry(table)[1])
+
+    def id_by_name(self, table, name):
+        """ID del registro activo con ese nombre, o None"""
+        return self._entry(table)[2].get(name)
+
+    def name_by_id(self, table, item_id):
+        """Nombre del registro activo con ese ID, o None"""
+        return self._entry(table)[3].get(item_id)
+
+    def invalidate(self, table=None):
+        """Descarta una tabla cacheada (o todas si table es None)"""
+        tables = MASTER_TABLES if table is None else [table]
+        with self._lock:
+            for name in tables:
+                if name in MASTER_TABLES:
+                    self._versions[name] += 1
+                    self._entries.pop(name, None)
+
+    def _entry(self, table):
+        id_column = MASTER_TABLES[table]
+        with self._lock:
+            version = self._versions[table]
+            entry = self._entries.get(table)
+        if entry is not None and entry[0] == version:
+            return entry
+
+        conn = create_connection()
+        try:
+            rows = conn.execute(
+                f"SELECT {id_column}, nombre FROM {table} WHERE activo = 1 ORDER BY nombre"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        entry = (version, rows,
+                 {nombre: item_id for item_id, nombre in rows},
+                 {item_id: nombre for item_id, nombre in rows})
+        with self._lock:
+            # Si se invalidó mientras se leía, no se guarda la copia vieja
+            if self._versions[table] == version:
+                self._entries[table] = entry
+        return entry
+
+
+_master_data = MasterDataCache()
+
+
+def get_master_data():
+    """Retorna la caché de tablas maestras del proceso"""
+    return _master_data
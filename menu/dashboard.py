@@ -1,8 +1,8 @@
 from tkinter import ttk
 import tkinter as tk
 from helpers import clear_frame
-from database import create_connection
 from datetime import datetime
+from models.dashboard_model import get_dashboard_data
 from views.base_view import BaseView
 
 
@@ -10,9 +10,6 @@ class DashboardView(BaseView):
     def __init__(self, frame, app):
         super().__init__(frame, app)
         self.setup_styles()
-        # Crear conexión local para esta instancia
-        self.conn = create_connection()
-        self.cursor = self.conn.cursor()
 
     def show_dashboard(self):
         """Muestra el panel de control principal con datos actualizados"""
@@ -38,8 +35,8 @@ class DashboardView(BaseView):
         cards_frame = self.create_main_container(self.frame)
         cards_frame.pack(fill="x", pady=10)
 
-        # Obtener datos para las tarjetas
-        card_data = self.get_dashboard_card_data()
+        # Obtener datos para las tarjetas y los movimientos
+        card_data = self.get_dashboard_summary()
 
         cards = [
             ("Productos", card_data["total_productos"], self.primary_color),
@@ -54,7 +51,7 @@ class DashboardView(BaseView):
             cards_frame.grid_columnconfigure(i, weight=1)
 
         # Gráficos y contenido adicional con datos reales
-        self._create_dashboard_content()
+        self._create_dashboard_content(card_data["movimientos"])
 
     def _create_card(self, parent, title, value, color):
         """Crea una tarjeta de estadística"""
@@ -69,7 +66,7 @@ class DashboardView(BaseView):
         
         return card
 
-    def _create_dashboard_content(self):
+    def _create_dashboard_content(self, movimientos):
         """Crea el contenido adicional del dashboard con datos reales"""
         content_row = self.create_main_container(self.frame)
         content_row.pack(fill="both", expand=True, pady=10)
@@ -81,15 +78,11 @@ class DashboardView(BaseView):
         tk.Label(chart_frame, text="Movimientos Recientes",
                  font=self.app.subtitle_font, bg="white", fg=self.fg_color).pack(anchor="w", padx=20, pady=15)
 
-        # Obtener últimos movimientos
-        movimientos = self.get_recent_movements()
-
         # Crear un frame para mostrar los movimientos como lista
         movimientos_frame = tk.Frame(chart_frame, bg="white")
         movimientos_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        # Mostrar solo los 5 más recientes
-        for i, mov in enumerate(movimientos[:5]):
+        for mov in movimientos:
             tk.Label(movimientos_frame,
                      text=f"{mov['fecha']} - {mov['tipo']} - {mov['producto']} ({mov['cantidad']})",
                      bg="white", fg=self.fg_color, font=self.entry_font, anchor="w").pack(fill="x", pady=2)
@@ -124,136 +117,37 @@ class DashboardView(BaseView):
         return tk.Frame(parent, bg="white", bd=0, highlightthickness=0,
                        highlightbackground="#e5e7eb", relief="solid")
 
-    def get_dashboard_card_data(self):
-        """Obtiene los datos para las tarjetas del dashboard"""
-        data = {
-            "total_productos": 0,
-            "stock_bajo": 0,
-            "solicitudes_hoy": 0,
-            "compras_hoy": 0
-        }
-
-        today = datetime.now().strftime('%Y-%m-%d')  # Formato SQLite
-
+    def get_dashboard_summary(self):
+        """Obtiene tarjetas y movimientos recientes (una consulta, con caché)"""
         try:
-            # Total de productos activos en inventario
-            self.cursor.execute("""
-                SELECT COUNT(DISTINCT p.id_producto) 
-                FROM productos p
-                JOIN inventario i ON p.id_producto = i.id_producto
-                WHERE p.activo = 1
-            """)
-            result = self.cursor.fetchone()
-            data["total_productos"] = result[0] if result else 0
-
-            # Total de productos con stock bajo (sin repetir)
-            self.cursor.execute("""
-                SELECT COUNT(DISTINCT p.id_producto)
-                FROM productos p
-                JOIN inventario i ON p.id_producto = i.id_producto
-                WHERE p.activo = 1
-                AND i.stock <= COALESCE(p.stock_minimo, 0)
-                AND i.stock > 0
-            """)
-            result = self.cursor.fetchone()
-            data["stock_bajo"] = result[0] if result else 0
-
-            # Solicitudes realizadas hoy - CORREGIDO: DATE() -> date()
-            self.cursor.execute("""
-                SELECT COUNT(*) 
-                FROM solicitudes 
-                WHERE date(fecha_solicitud) = ?
-            """, (today,))
-            result = self.cursor.fetchone()
-            data["solicitudes_hoy"] = result[0] if result else 0
-
-            # Compras pendientes
-            self.cursor.execute("""
-                SELECT COUNT(*) 
-                FROM solicitudes_compra 
-                WHERE estado = 'Pendiente'
-            """)
-            result = self.cursor.fetchone()
-            data["compras_hoy"] = result[0] if result else 0
-
+            return get_dashboard_data().summary()
         except Exception as e:
             print(f"Error al obtener datos del dashboard: {e}")
-            self.conn.rollback()
-
-        return data
-
-    def get_recent_movements(self):
-        """Obtiene los últimos movimientos de inventario"""
-        try:
-            # CORREGIDO: TO_CHAR -> strftime para SQLite
-            self.cursor.execute("""
-                SELECT 
-                    m.tipo,
-                    p.nombre as producto,
-                    m.cantidad,
-                    strftime('%d/%m/%Y %H:%M', m.fecha) as fecha
-                FROM movimientos m
-                JOIN productos p ON m.id_producto = p.id_producto
-                ORDER BY m.fecha DESC
-                LIMIT 10
-            """)
-
-            movimientos = []
-            for row in self.cursor.fetchall():
-                movimientos.append({
-                    "tipo": row[0],
-                    "producto": row[1],
-                    "cantidad": row[2],
-                    "fecha": row[3]
-                })
-
-            return movimientos
-
-        except Exception as e:
-            print(f"Error al obtener movimientos recientes: {e}")
-            self.conn.rollback()
-            return []
+            return {
+                "total_productos": 0,
+                "stock_bajo": 0,
+                "solicitudes_hoy": 0,
+                "compras_hoy": 0,
+                "movimientos": []
+            }
 
     def get_low_stock_products(self):
         """Obtiene productos con stock bajo según el stock mínimo configurado por producto"""
-        try:
-            self.cursor.execute("""
-                SELECT 
-                    p.nombre,
-                    i.stock as stock_actual,
-                    COALESCE(p.stock_minimo, 0) as stock_minimo
-                FROM productos p
-                JOIN inventario i ON p.id_producto = i.id_producto
-                WHERE p.activo = 1  -- CORREGIDO: TRUE -> 1 para SQLite
-                  AND i.stock <= COALESCE(p.stock_minimo, 0)
-                ORDER BY i.stock ASC
-                LIMIT 10
-            """)
-
-            productos = []
-            for row in self.cursor.fetchall():
-                productos.append({
-                    "nombre": row[0],
-                    "stock_actual": row[1],
-                    "stock_minimo": row[2]
-                })
-
-            return productos
-
-        except Exception as e:
-            print(f"Error al obtener productos con stock bajo: {e}")
-            self.conn.rollback()
-            return []
-
-    def __del__(self):
-        """Cierra la conexión al destruir la instancia"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        # El gestor de notificaciones ya mantiene el conjunto actualizado
+        return [{
+            "nombre": item['product'],
+            "stock_actual": item['stock'],
+            "stock_minimo": item['stock_minimo']
+        } for item in self.app.notification_manager.low_stock.first(10)]
 
 
 # Función de compatibilidad para la app existente
 def show_dashboard(app):
     """Función de compatibilidad para mostrar el dashboard"""
-    dashboard_view = DashboardView(app.content_frame, app)
+    # Se reutiliza la vista mientras no cambie el área de contenido (nuevo login)
+    dashboard_view = getattr(app, 'dashboard_view', None)
+    if dashboard_view is None or dashboard_view.frame is not app.content_frame:
+        dashboard_view = DashboardView(app.content_frame, app)
+        app.dashboard_view = dashboard_view
     dashboard_view.show_dashboard()
     return dashboard_view
\ No newline at end of file
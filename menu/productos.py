@@ -5,3 +5,4 @@ def show_inventory(app):
     """Mostrar la gestión de inventario"""
     controller = ProductController(app)
     controller.show_inventory()
+    return controller
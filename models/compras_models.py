@@ -1,5 +1,9 @@
 from datetime import datetime
-from database import create_connection
+from database import PAGE_SIZE, PRIORITY_RANK_SQL, create_connection, keyset_page
+from models.dashboard_model import get_dashboard_data
+
+# Orden del listado: prioridad (Alta primero) y luego más recientes
+REQUESTS_ORDER = [(PRIORITY_RANK_SQL, "ASC"), ("fecha", "DESC"), ("id", "DESC")]
 
 
 class PurchaseModel:
@@ -9,13 +13,18 @@ class PurchaseModel:
 
     def get_all_requests(self, status_filter="Todos", priority_filter="Todos"):
         """Obtiene todas las solicitudes con filtros opcionales"""
-        query = """
+        return self.get_requests_page(status_filter, priority_filter, page_size=None)[0]
+
+    def get_requests_page(self, status_filter="Todos", priority_filter="Todos",
+                          after=None, page_size=PAGE_SIZE):
+        """Obtiene una página de solicitudes: (filas, siguiente_cursor, total)"""
+        query = f"""
             SELECT
-                ROW_NUMBER() OVER (ORDER BY fecha DESC) as nro,
                 producto, cantidad, motivo, prioridad,
                 COALESCE(proveedor, 'N/A'),
                 strftime('%d/%m/%Y %H:%M', fecha),  -- CORREGIDO: TO_CHAR -> strftime
-                estado
+                estado,
+                {PRIORITY_RANK_SQL}, fecha, id
             FROM solicitudes_compra
             WHERE 1=1
         """
@@ -30,20 +39,8 @@ class PurchaseModel:
             query += " AND prioridad = ?"
             params.append(priority_filter)
 
-        query += """
-            ORDER BY
-                CASE prioridad
-                    WHEN 'Alta' THEN 1
-                    WHEN 'Media' THEN 2
-                    WHEN 'Baja' THEN 3
-                END,
-                fecha DESC
-        """
-
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
-        # CONVERTIR objetos Row a tuplas
-        return [tuple(row) for row in rows]
+        return keyset_page(self.cursor, query, params, REQUESTS_ORDER,
+                           after, page_size, numbered=True)
 
     def create_request(self, data):
         """Crea una nueva solicitud de compra"""
@@ -53,6 +50,7 @@ class PurchaseModel:
             ) VALUES (?, ?, ?, ?, ?, ?, ?)
         """, data)
         self.conn.commit()
+        get_dashboard_data().invalidate()
 
     def update_request_status(self, request_id, new_status):
         """Actualiza el estado de una solicitud"""
@@ -62,12 +60,14 @@ class PurchaseModel:
             WHERE id = ?
         """, (new_status, request_id))
         self.conn.commit()
+        get_dashboard_data().invalidate()
 
     def delete_request(self, request_id):
         """Elimina una solicitud"""
         self.cursor.execute(
             "DELETE FROM solicitudes_compra WHERE id = ?", (request_id,))
         self.conn.commit()
+        get_dashboard_data().invalidate()
 
     def get_categories(self):
         """Obtiene todas las categorías"""
@@ -0,0 +1,119 @@
+import threading
+import time
+from datetime import datetime
+
+from database import create_connection
+from stock_events import get_stock_events
+
+# Segundos que se reutiliza un resumen si nada lo invalida antes
+DASHBOARD_TTL = 60
+
+# Movimientos recientes que muestra el panel
+RECENT_MOVEMENTS = 5
+
+# Tarjetas y movimientos recientes en una sola consulta: una fila por
+# movimiento con los totales repetidos (o una sola fila sin movimientos)
+DASHBOARD_SQL = f"""
+    WITH tarjetas AS (
+        SELECT
+            (SELECT COUNT(DISTINCT p.id_producto)
+             FROM productos p
+             JOIN inventario i ON p.id_producto = i.id_producto
+             WHERE p.activo = 1) AS total_productos,
+            -- Mismo criterio que las notificaciones: la suma del stock de
+            -- todas las ubicaciones (sin contar los agotados)
+            (SELECT COUNT(*) FROM (
+                SELECT 1
+                FROM productos p
+                JOIN inventario i ON p.id_producto = i.id_producto
+                WHERE p.activo = 1
+                GROUP BY p.id_producto
+                HAVING SUM(i.stock) <= COALESCE(p.stock_minimo, 0)
+                   AND SUM(i.stock) > 0)) AS stock_bajo,
+            (SELECT COUNT(*) FROM solicitudes
+             WHERE date(fecha_solicitud) = ?) AS solicitudes_hoy,
+            (SELECT COUNT(*) FROM solicitudes_compra
+             WHERE estado = 'Pendiente') AS compras_pendientes
+    ),
+    recientes AS (
+        SELECT m.tipo, p.nombre AS producto, m.cantidad,
+               strftime('%d/%m/%Y %H:%M', m.fecha) AS fecha, m.fecha AS orden
+        FROM movimientos m
+        JOIN productos p ON m.id_producto = p.id_producto
+        ORDER BY m.fecha DESC
+        LIMIT {RECENT_MOVEMENTS}
+    )
+    SELECT t.total_productos, t.stock_bajo, t.solicitudes_hoy, t.compras_pendientes,
+           r.tipo, r.producto, r.cantidad, r.fecha
+    FROM tarjetas t
+    LEFT JOIN recientes r ON 1 = 1
+    ORDER BY r.orden DESC
+"""
+
+
+class DashboardData:
+    """Resumen del panel de control con caché de corta duración.
+
+    summary() reutiliza el último resumen durante DASHBOARD_TTL segundos.
+    Los cambios de stock lo invalidan a través del bus de stock; las
+    escrituras que no pasan por él (compras, movimientos sueltos) deben
+    llamar a invalidate().
+    """
+
+    def __init__(self, ttl=DASHBOARD_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot = None    # (versión, instante, resumen)
+        get_stock_events().subscribe(lambda product_ids: self.invalidate())
+
+    def summary(self):
+        """Tarjetas y movimientos recientes del panel"""
+        with self._lock:
+            version, snapshot = self._version, self._snapshot
+        if (snapshot is not None and snapshot[0] == version
+                and time.monotonic() - snapshot[1] < self.ttl):
+            return snapshot[2]
+
+        summary = self._load()
+        with self._lock:
+            # Si se invalidó mientras se consultaba, no se guarda
+            if self._version == version:
+                self._snapshot = (version, time.monotonic(), summary)
+        return summary
+
+    def invalidate(self):
+        """Descarta el resumen guardado"""
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+    def _load(self):
+        today = datetime.now().strftime('%Y-%m-%d')  # Formato SQLite
+        conn = create_connection()
+        try:
+            rows = conn.execute(DASHBOARD_SQL, (today,)).fetchall()
+        finally:
+            conn.close()
+
+        first = rows[0]
+        return {
+            "total_productos": first[0] or 0,
+            "stock_bajo": first[1] or 0,
+            "solicitudes_hoy": first[2] or 0,
+            "compras_hoy": first[3] or 0,
+            "movimientos": [{
+                "tipo": row[4],
+                "producto": row[5],
+                "cantidad": row[6],
+                "fecha": row[7]
+            } for row in rows if row[4] is not None]
+        }
+
+
+_dashboard_data = DashboardData()
+
+
+def get_dashboard_data():
+    """Retorna el servicio de datos del panel de control del proceso"""
+    return _dashboard_data
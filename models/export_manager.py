@@ -1,18 +1,42 @@
-import pandas as pd
+import csv
 from datetime import datetime
+from itertools import chain, islice
 import os
 import tkinter as tk
 from tkinter import filedialog
 
+# Filas que se leen por vez de un cursor o listado paginado al exportar
+EXPORT_CHUNK = 1000
+
+# La hoja de solo escritura fija el ancho de las columnas antes de la primera
+# fila, así que se mide con las primeras filas y el resto se escribe directo
+WIDTH_SAMPLE_ROWS = 1000
+
+# Formatos del diálogo de guardado: (descripción, extensión). El primero es
+# el predeterminado; el formato se elige por la extensión del archivo.
+EXPORT_FORMATS = [
+    ("Archivos Excel", ".xlsx"),
+    ("Archivos CSV", ".csv"),
+    ("Archivos Parquet", ".parquet"),
+]
+
+# Separador de CSV: Excel en español usa punto y coma como separador de listas
+CSV_DELIMITER = ";"
+
+# Tipos de columna de Parquet de más angosto a más ancho (nombres de pyarrow);
+# una columna solo se ensancha hacia la derecha
+PARQUET_TYPES = ("int64", "float64", "string")
+
 
 class ExportManager:
     @staticmethod
-    def export_to_excel(data, headers, filename_prefix, sheet_name="Datos"):
+    def export_data(data, headers, filename_prefix, sheet_name="Datos"):
         """
-        Exporta datos a Excel con formato profesional
+        Exporta datos a Excel (con formato profesional), CSV o Parquet según
+        la extensión elegida en el diálogo de guardado
 
         Args:
-            data: Lista de tuplas con los datos
+            data: Filas: lista, generador, PagedRows o cursor ya ejecutado
             headers: Lista de nombres de columnas
             filename_prefix: Prefijo para el nombre del archivo
             sheet_name: Nombre de la hoja de Excel
@@ -20,9 +44,10 @@ class ExportManager:
         Returns:
             tuple: (nombre_archivo, error) - error es None si fue exitoso
         """
+        filename = None
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            default_filename = f"{filename_prefix}_{timestamp}.xlsx"
+            default_filename = f"{filename_prefix}_{timestamp}"
             
             # Mostrar diálogo para seleccionar ubicación
             filename = ExportManager._get_save_filename(default_filename)
@@ -30,18 +55,13 @@ class ExportManager:
             if not filename:  # Usuario canceló la operación
                 return None, "Exportación cancelada por el usuario"
 
-            # Crear DataFrame
-            df = pd.DataFrame(data, columns=headers)
-
-            # Crear writer de Excel
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                # Obtener la hoja de trabajo
-                worksheet = writer.sheets[sheet_name]
-
-                # Aplicar formato profesional
-                ExportManager._apply_excel_formatting(worksheet, df)
+            extension = os.path.splitext(filename)[1].lower()
+            if extension == ".csv":
+                ExportManager._write_csv(filename, data, headers)
+            elif extension == ".parquet":
+                ExportManager._write_parquet(filename, data, headers)
+            else:
+                ExportManager._write_excel(filename, data, headers, sheet_name)
 
             # Verificar que el archivo se creó correctamente
             if os.path.exists(filename):
@@ -50,6 +70,9 @@ class ExportManager:
                 return None, "No se pudo crear el archivo"
 
         except Exception as e:
+            # No dejar un archivo a medio escribir
+            if filename and os.path.exists(filename):
+                os.remove(filename)
             return None, str(e)
 
     @staticmethod
@@ -58,7 +81,7 @@ class ExportManager:
         Muestra diálogo para seleccionar ubicación y nombre del archivo
         
         Args:
-            default_filename: Nombre por defecto del archivo
+            default_filename: Nombre por defecto del archivo (sin extensión)
             
         Returns:
             str: Ruta completa del archivo seleccionada o None si se cancela
@@ -66,79 +89,244 @@ class ExportManager:
         # Crear ventana temporal (no visible)
         root = tk.Tk()
         root.withdraw()  # Ocultar ventana principal
+        selected_type = tk.StringVar(root)
         
         # Mostrar diálogo de guardado
         filename = filedialog.asksaveasfilename(
-            title="Guardar archivo Excel",
-            defaultextension=".xlsx",
-            filetypes=[
-                ("Archivos Excel", "*.xlsx"),
-                ("Todos los archivos", "*.*")
-            ],
+            title="Guardar exportación",
+            defaultextension="",
+            filetypes=[(label, f"*{extension}") for label, extension in EXPORT_FORMATS],
+            typevariable=selected_type,
             initialfile=default_filename
         )
+        selected_label = selected_type.get()
         
         # Cerrar ventana temporal
         root.destroy()
-        
-        return filename if filename else None
+
+        if not filename:
+            return None
+
+        # Si el nombre no trae una extensión conocida se usa la del tipo elegido
+        known = {extension for _, extension in EXPORT_FORMATS}
+        if os.path.splitext(filename)[1].lower() not in known:
+            filename += dict(EXPORT_FORMATS).get(selected_label, EXPORT_FORMATS[0][1])
+        return filename
 
     @staticmethod
-    def _apply_excel_formatting(worksheet, df):
+    def _write_excel(filename, rows, headers, sheet_name="Datos"):
         """
-        Aplica formato profesional a la hoja de Excel
+        Escribe las filas en un libro de solo escritura con formato profesional
+
+        Cada fila se formatea y se escribe al leerla, sin DataFrame ni hoja
+        en memoria: el tiempo crece linealmente y la memoria se mantiene
+        constante. El ancho de columnas se calcula con las primeras
+        WIDTH_SAMPLE_ROWS filas.
+
+        Returns:
+            int: Cantidad de filas de datos escritas
         """
-        from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
         from openpyxl.utils import get_column_letter
 
-        # Definir estilos
-        header_font = Font(bold=True, color="FFFFFF", size=12)
-        header_fill = PatternFill(
-            start_color="366092", end_color="366092", fill_type="solid")
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+
+        # Definir estilos (registrados una vez en el libro)
         border_style = Side(border_style="thin", color="000000")
         border = Border(left=border_style, right=border_style,
                         top=border_style, bottom=border_style)
-        center_align = Alignment(horizontal="center", vertical="center")
-        left_align = Alignment(horizontal="left", vertical="center")
-
-        # Aplicar formato a los encabezados
-        for col_num, header in enumerate(df.columns, 1):
-            cell = worksheet.cell(row=1, column=col_num)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = border
-            cell.alignment = center_align
-
-        # Aplicar formato a los datos
-        # +2 porque row1 es encabezado y Excel base 1
-        for row_num in range(2, len(df) + 2):
-            for col_num in range(1, len(df.columns) + 1):
-                cell = worksheet.cell(row=row_num, column=col_num)
-                cell.border = border
-                cell.alignment = left_align
-
-        # Ajustar ancho de columnas automáticamente
-        for col_num, column_title in enumerate(df.columns, 1):
-            max_length = 0
-            column_letter = get_column_letter(col_num)
-
-            # Longitud del encabezado
-            max_length = max(max_length, len(str(column_title)))
-
-            # Longitud de los datos en la columna
-            for row_num in range(2, len(df) + 2):
-                cell_value = worksheet.cell(row=row_num, column=col_num).value
-                if cell_value:
-                    max_length = max(max_length, len(str(cell_value)))
-
-            # Ajustar ancho con un poco de margen
-            worksheet.column_dimensions[column_letter].width = max_length + 4
+        header_style = NamedStyle(
+            name="Encabezado", border=border,
+            font=Font(bold=True, color="FFFFFF", size=12),
+            fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center"))
+        data_style = NamedStyle(
+            name="Datos", border=border,
+            alignment=Alignment(horizontal="left", vertical="center"))
+        workbook.add_named_style(header_style)
+        workbook.add_named_style(data_style)
+
+        # Ajustar ancho de columnas según el encabezado y la muestra de filas
+        rows = ExportManager._checked_rows(rows, headers)
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        widths = [len(str(header)) for header in headers]
+        for row in sample:
+            for col_num, value in enumerate(row):
+                if value:
+                    widths[col_num] = max(widths[col_num], len(str(value)))
+        for col_num, width in enumerate(widths, 1):
+            worksheet.column_dimensions[get_column_letter(col_num)].width = width + 4
 
         # Congelar paneles (fijar encabezados)
         worksheet.freeze_panes = "A2"
 
+        def styled(value, style):
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.style = style
+            return cell
+
+        worksheet.append([styled(header, "Encabezado") for header in headers])
+        count = 0
+        for row in chain(sample, rows):
+            worksheet.append([styled(value, "Datos") for value in row])
+            count += 1
+
         # Agregar filtros automáticos
-        worksheet.auto_filter.ref = worksheet.dimensions
+        worksheet.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{count + 1}"
+        workbook.save(filename)
+        return count
+
+    @staticmethod
+    def _write_csv(filename, rows, headers):
+        """
+        Escribe las filas en CSV (UTF-8 con BOM para que Excel respete los acentos)
+
+        Returns:
+            int: Cantidad de filas de datos escritas
+        """
+        count = 0
+        with open(filename, "w", newline="", encoding="utf-8-sig") as file:
+            writer = csv.writer(file, delimiter=CSV_DELIMITER)
+            writer.writerow(headers)
+            for row in ExportManager._checked_rows(rows, headers):
+                writer.writerow(row)
+                count += 1
+        return count
+
+    @staticmethod
+    def _write_parquet(filename, rows, headers):
+        """
+        Escribe las filas en Parquet, un grupo de filas por cada EXPORT_CHUNK
+
+        Los tipos de columna (entero, decimal o texto) se deducen del primer
+        bloque. Si un bloque posterior trae un valor que no calza, la columna
+        se ensancha (entero -> decimal -> texto) y lo ya escrito se reescribe
+        con el nuevo esquema: ningún valor se trunca ni queda nulo.
+
+        Returns:
+            int: Cantidad de filas de datos escritas
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "La exportación a Parquet requiere el paquete pyarrow (motor Parquet de pandas)")
+
+        def schema_for(kinds):
+            return pa.schema([(str(header), getattr(pa, PARQUET_TYPES[kind])())
+                              for header, kind in zip(headers, kinds)])
+
+        rows = ExportManager._checked_rows(rows, headers)
+        chunk = list(islice(rows, EXPORT_CHUNK))
+        # Una columna sin valores en el primer bloque queda como texto
+        kinds = [ExportManager._parquet_kind([row[i] for row in chunk], len(PARQUET_TYPES) - 1)
+                 for i in range(len(headers))]
+        schema = schema_for(kinds)
+
+        count = 0
+        writer = pq.ParquetWriter(filename, schema)
+        try:
+            while True:
+                chunk_kinds = [max(kind, ExportManager._parquet_kind([row[i] for row in chunk]))
+                               for i, kind in enumerate(kinds)]
+                if chunk_kinds != kinds:
+                    writer.close()
+                    kinds, schema = chunk_kinds, schema_for(chunk_kinds)
+                    writer = ExportManager._widen_parquet(pq, filename, schema)
+
+                columns = [
+                    pa.array([ExportManager._parquet_value(kind, row[i]) for row in chunk],
+                             type=schema.field(i).type)
+                    for i, kind in enumerate(kinds)
+                ]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                count += len(chunk)
+                chunk = list(islice(rows, EXPORT_CHUNK))
+                if not chunk:
+                    break
+        finally:
+            writer.close()
+        return count
+
+    @staticmethod
+    def _widen_parquet(pq, filename, schema):
+        """Reescribe lo ya exportado con el esquema ensanchado; retorna el writer abierto"""
+        previous = f"{filename}.tmp"
+        os.replace(filename, previous)
+        try:
+            source = pq.ParquetFile(previous)
+            writer = pq.ParquetWriter(filename, schema)
+            for index in range(source.num_row_groups):
+                writer.write_table(source.read_row_group(index).cast(schema))
+            source.close()
+        finally:
+            os.remove(previous)
+        return writer
+
+    @staticmethod
+    def _parquet_kind(values, empty=0):
+        """Índice en PARQUET_TYPES del tipo más angosto que admite todos los valores"""
+        kind = None
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, int) and not isinstance(value, bool):
+                value_kind = 0
+            elif isinstance(value, float):
+                value_kind = 1
+            else:
+                return len(PARQUET_TYPES) - 1
+            kind = value_kind if kind is None else max(kind, value_kind)
+        return empty if kind is None else kind
+
+    @staticmethod
+    def _parquet_value(kind, value):
+        """Convierte un valor al tipo de su columna (que siempre lo admite)"""
+        if value is None:
+            return None
+        if PARQUET_TYPES[kind] == "string":
+            return str(value)
+        if PARQUET_TYPES[kind] == "float64":
+            return float(value)
+        return value
+
+    @staticmethod
+    def _iter_rows(source, chunk_size=EXPORT_CHUNK):
+        """
+        Recorre la fuente de a bloques de chunk_size filas, sin copiarla
+
+        Un cursor se lee con fetchmany(), un PagedRows consulta las páginas
+        que falten y cualquier otro iterable se recorre tal cual.
+        """
+        if hasattr(source, "fetchmany"):
+            while True:
+                chunk = source.fetchmany(chunk_size)
+                if not chunk:
+                    return
+                yield from chunk
+        elif hasattr(source, "stream"):
+            yield from source.stream(chunk_size)
+        else:
+            yield from source
+
+    @staticmethod
+    def _checked_rows(source, headers):
+        """
+        Filas de _iter_rows() verificando que tengan una columna por encabezado
+
+        Una fila más corta o más larga correría las columnas (o haría
+        fallar Parquet), así que se detiene la exportación con ValueError.
+        """
+        for number, row in enumerate(ExportManager._iter_rows(source), start=1):
+            if len(row) != len(headers):
+                raise ValueError(
+                    f"La fila {number} tiene {len(row)} columnas y el encabezado "
+                    f"{len(headers)}: {', '.join(map(str, headers))}")
+            yield row
 
     @staticmethod
     def export_inventory(data):
@@ -147,7 +335,7 @@ class ExportManager:
         """
         headers = ["Nro", "Producto", "Marca", "Categoría",
                 "Código", "Stock", "Stock mínimo", "Ubicación", "Estado"]
-        return ExportManager.export_to_excel(data, headers, "inventario", "Inventario")
+        return ExportManager.export_data(data, headers, "inventario", "Inventario")
     
     @staticmethod
     def export_movements(data):
@@ -155,8 +343,8 @@ class ExportManager:
         Exportación específica para movimientos
         """
         headers = ["Nro", "Fecha", "Tipo", "Producto",
-                   "Cantidad", "Ubicación", "Responsable", "Referencia"]
-        return ExportManager.export_to_excel(data, headers, "movimientos", "Movimientos")
+                   "Cantidad", "Responsable", "Referencia"]
+        return ExportManager.export_data(data, headers, "movimientos", "Movimientos")
 
     @staticmethod
     def export_purchases(data):
@@ -165,7 +353,7 @@ class ExportManager:
         """
         headers = ["Nro", "Producto", "Cantidad", "Motivo",
                    "Prioridad", "Proveedor", "Fecha", "Estado"]
-        return ExportManager.export_to_excel(data, headers, "solicitudes_compras", "Solicitudes_Compra")
+        return ExportManager.export_data(data, headers, "solicitudes_compras", "Solicitudes_Compra")
 
     @staticmethod
     def export_suppliers(data):
@@ -174,7 +362,7 @@ class ExportManager:
         """
         headers = ["Nro", "Nombre", "Contacto", "Teléfono", "Email",
                    "Valoración", "Manejo de Precios", "Categorías"]
-        return ExportManager.export_to_excel(data, headers, "proveedores", "Proveedores")
+        return ExportManager.export_data(data, headers, "proveedores", "Proveedores")
 
     @staticmethod
     def export_requests(data):
@@ -183,11 +371,11 @@ class ExportManager:
         """
         headers = ["Nro", "Fecha", "Departamento",
                    "Solicitante", "Referencia", "Responsable Entrega"]
-        return ExportManager.export_to_excel(data, headers, "solicitudes", "Solicitudes")
+        return ExportManager.export_data(data, headers, "solicitudes", "Solicitudes")
 
     @staticmethod
     def export_with_custom_format(data, headers, filename_prefix, sheet_name="Datos"):
         """
         Método para exportación personalizada con formato específico
         """
-        return ExportManager.export_to_excel(data, headers, filename_prefix, sheet_name)
\ No newline at end of file
+        return ExportManager.export_data(data, headers, filename_prefix, sheet_name)
\ No newline at end of file
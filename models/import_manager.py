@@ -0,0 +1,221 @@
+import csv
+import os
+from tkinter import filedialog
+
+from helpers import normalizar_texto
+from master_data import get_master_data
+from models.product_model import product_data_error
+
+# Productos por transacción al importar
+IMPORT_CHUNK = 500
+
+# Encabezado (normalizado) -> campo; acepta el formato de la exportación de inventario
+PRODUCT_COLUMNS = {
+    "codigo": "codigo",
+    "producto": "nombre",
+    "nombre": "nombre",
+    "marca": "marca",
+    "categoria": "categoria",
+    "ubicacion": "ubicacion",
+    "stock": "stock",
+    "stock inicial": "stock",
+    "stock minimo": "stock_minimo",
+}
+REQUIRED_COLUMNS = ["codigo", "nombre", "marca", "categoria", "stock"]
+
+
+class ImportManager:
+    @staticmethod
+    def import_products(filename, model, id_responsable=None, chunk_size=IMPORT_CHUNK):
+        """
+        Importa productos nuevos desde un archivo CSV o Excel
+
+        Las filas se leen y validan de a una (mismas reglas que el formulario
+        de producto) y se guardan en transacciones de chunk_size productos.
+        Una fila inválida no detiene la importación: se reporta y se sigue.
+
+        Args:
+            filename: Ruta del archivo .csv o .xlsx
+            model: ProductModel con el que se insertan los productos
+            id_responsable: Usuario que figura en los movimientos "Producto nuevo"
+            chunk_size: Productos por transacción
+
+        Returns:
+            tuple: (importados, errores) - errores es una lista de (fila, mensaje)
+        """
+        rows = ImportManager.read_rows(filename)
+        first = next(rows, None)
+        if first is None:
+            raise ValueError("El archivo está vacío")
+        columns = ImportManager._map_columns(first[1])
+
+        master = get_master_data()
+        lookups = {
+            table: {normalizar_texto(nombre): item_id for item_id, nombre in master.options(table)}
+            for table in ("marcas", "categorias", "ubicaciones")
+        }
+        codes = model.existing_codes()
+
+        importados = 0
+        errores = []
+        pending = []
+        for number, values in rows:
+            fields = {field: ImportManager._cell_text(values[index]) if index < len(values) else ""
+                      for field, index in columns.items()}
+            if not any(fields.values()):
+                continue    # Fila vacía
+
+            product, error = ImportManager._validate_product(fields, lookups, codes)
+            if error:
+                errores.append((number, error))
+                continue
+            codes.add(product['codigo'])
+            pending.append((number, product))
+
+            if len(pending) >= chunk_size:
+                importados += ImportManager._save_chunk(model, pending, id_responsable, errores)
+                pending = []
+
+        if pending:
+            importados += ImportManager._save_chunk(model, pending, id_responsable, errores)
+        return importados, errores
+
+    @staticmethod
+    def read_rows(filename):
+        """
+        Genera (número de fila, valores) sin cargar el archivo completo en memoria
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in (".xlsx", ".xlsm"):
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(filename, read_only=True, data_only=True)
+            try:
+                for number, values in enumerate(
+                        workbook.active.iter_rows(values_only=True), start=1):
+                    yield number, list(values)
+            finally:
+                workbook.close()
+        elif extension in (".csv", ".txt"):
+            with open(filename, newline="", encoding="utf-8-sig") as file:
+                # Excel en español suele separar con punto y coma
+                try:
+                    dialect = csv.Sniffer().sniff(file.read(4096), delimiters=",;\t")
+                except csv.Error:
+                    dialect = csv.excel
+                file.seek(0)
+                for number, values in enumerate(csv.reader(file, dialect), start=1):
+                    yield number, values
+        else:
+            raise ValueError(f"Formato no soportado: {extension or 'sin extensión'}")
+
+    @staticmethod
+    def write_error_report(filename, errores):
+        """
+        Guarda los errores junto al archivo importado
+
+        Returns:
+            str: Ruta del reporte (<archivo>_errores.csv)
+        """
+        report = f"{os.path.splitext(filename)[0]}_errores.csv"
+        with open(report, "w", newline="", encoding="utf-8-sig") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Fila", "Error"])
+            writer.writerows(errores)
+        return report
+
+    @staticmethod
+    def ask_open_filename():
+        """
+        Muestra diálogo para elegir el archivo a importar
+
+        Returns:
+            str: Ruta seleccionada o None si se cancela
+        """
+        filename = filedialog.askopenfilename(
+            title="Importar productos",
+            filetypes=[
+                ("Archivos Excel o CSV", "*.xlsx *.csv"),
+                ("Archivos Excel", "*.xlsx"),
+                ("Archivos CSV", "*.csv"),
+                ("Todos los archivos", "*.*")
+            ]
+        )
+        return filename if filename else None
+
+    @staticmethod
+    def _map_columns(header):
+        """Campo -> índice de columna a partir de la fila de encabezados"""
+        columns = {}
+        for index, title in enumerate(header):
+            field = PRODUCT_COLUMNS.get(normalizar_texto(ImportManager._cell_text(title)))
+            if field and field not in columns:
+                columns[field] = index
+
+        missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+        if missing:
+            raise ValueError(
+                "Faltan columnas obligatorias: " + ", ".join(missing) +
+                ". Se esperan: Código, Producto, Marca, Categoría, Stock "
+                "(opcionales: Ubicación, Stock mínimo)")
+        return columns
+
+    @staticmethod
+    def _cell_text(value):
+        """Texto de una celda; los enteros de Excel llegan como 10.0"""
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value).strip()
+
+    @staticmethod
+    def _validate_product(fields, lookups, codes):
+        """Retorna (producto, None) si la fila es válida o (None, mensaje)"""
+        codigo = fields["codigo"]
+        nombre = fields["nombre"]
+        stock_txt = fields["stock"]
+
+        error = product_data_error(codigo, nombre, stock_txt)
+        if error:
+            return None, error[1]
+        if codigo in codes:
+            return None, f"El código {codigo} ya existe"
+
+        stock_minimo_txt = fields.get("stock_minimo", "")
+        if stock_minimo_txt and not stock_minimo_txt.isdigit():
+            return None, "El stock mínimo debe ser un número entero positivo o cero."
+
+        ids = {}
+        for field, table, label in (("marca", "marcas", "Marca"),
+                                    ("categoria", "categorias", "Categoría"),
+                                    ("ubicacion", "ubicaciones", "Ubicación")):
+            nombre_relacion = fields.get(field, "")
+            if not nombre_relacion:
+                if field != "ubicacion":
+                    return None, f"{label} es obligatoria"
+                ids[field] = None
+                continue
+            ids[field] = lookups[table].get(normalizar_texto(nombre_relacion))
+            if ids[field] is None:
+                return None, f"{label} '{nombre_relacion}' no existe o está inactiva"
+
+        return {
+            'codigo': codigo,
+            'nombre': nombre,
+            'marca_id': ids["marca"],
+            'categoria_id': ids["categoria"],
+            'ubicacion_id': ids["ubicacion"],
+            'stock': int(stock_txt),
+            'stock_minimo': int(stock_minimo_txt) if stock_minimo_txt else 0,
+        }, None
+
+    @staticmethod
+    def _save_chunk(model, pending, id_responsable, errores):
+        """Guarda un lote; si falla, todas sus filas se reportan con el error"""
+        try:
+            return model.insert_products_batch(
+                [product for _, product in pending], id_responsable)
+        except Exception as e:
+            errores.extend((number, f"No se pudo guardar: {e}") for number, _ in pending)
+            return 0
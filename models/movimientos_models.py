@@ -1,5 +1,9 @@
 from datetime import datetime
-from database import create_connection
+from database import PAGE_SIZE, create_connection, keyset_page
+from models.dashboard_model import get_dashboard_data
+
+# Orden del listado: más recientes primero, id_movimiento desempata la fecha
+MOVEMENTS_ORDER = [("m.fecha", "DESC"), ("m.id_movimiento", "DESC")]
 
 
 class MovementModel:
@@ -9,15 +13,21 @@ class MovementModel:
 
     def get_all_movements(self, movement_type="Todos", date_from=None, date_to=None):
         """Obtiene todos los movimientos con filtros opcionales"""
+        return self.get_movements_page(movement_type, date_from, date_to,
+                                       page_size=None)[0]
+
+    def get_movements_page(self, movement_type="Todos", date_from=None, date_to=None,
+                           after=None, page_size=PAGE_SIZE):
+        """Obtiene una página de movimientos: (filas, siguiente_cursor, total)"""
         query = """
             SELECT 
-                ROW_NUMBER() OVER (ORDER BY m.fecha DESC) as nro,
                 strftime('%d/%m/%Y %H:%M', m.fecha) as fecha,  
                 m.tipo,
                 p.nombre as producto,
                 m.cantidad,
                 COALESCE(usr.nombre_completo, 'N/A') as responsable,
-                COALESCE(m.referencia, 'N/A') as referencia
+                COALESCE(m.referencia, 'N/A') as referencia,
+                m.fecha, m.id_movimiento
             FROM movimientos m
             JOIN productos p ON m.id_producto = p.id_producto
             LEFT JOIN usuarios usr ON m.id_responsable = usr.id
@@ -39,13 +49,9 @@ class MovementModel:
             query += " AND m.fecha <= ?"
             params.append(date_to)
 
-        query += " ORDER BY m.fecha DESC"
-
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
-        
-        # CONVERTIR objetos Row a tuplas para que se muestren en la tabla
-        return [tuple(row) for row in rows]
+        # El número de fila (nro) se antepone al paginar
+        return keyset_page(self.cursor, query, params, MOVEMENTS_ORDER,
+                           after, page_size, numbered=True)
 
     def register_movement(self, id_producto, tipo, cantidad, id_responsable=None, referencia=None):
         """Registra un movimiento en la base de datos (sin ubicación)"""
@@ -85,6 +91,7 @@ class MovementModel:
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Formato SQLite
             ))
             self.conn.commit()
+            get_dashboard_data().invalidate()
             return True
         except Exception as e:
             self.conn.rollback()
@@ -95,4 +102,63 @@ class MovementModel:
         self.cursor.execute(
             "SELECT nombre FROM productos WHERE id_producto = ?", (product_id,))
         result = self.cursor.fetchone()
-        return result[0] if result else None
\ No newline at end of file
+        return result[0] if result else None
+
+    def get_movement_statistics(self, movement_type="Todos", date_from=None, date_to=None,
+                                id_producto=None):
+        """Totales de movimientos del rango, leídos del resumen diario.
+
+        El resumen es por día: date_from y date_to se toman como fechas y
+        date_to incluye el día completo.
+        """
+        where, params = self._daily_filter(movement_type, date_from, date_to, id_producto)
+        self.cursor.execute(f"""
+            SELECT
+                COALESCE(SUM(movimientos), 0),
+                COALESCE(SUM(CASE WHEN tipo = 'Entrada' THEN cantidad END), 0),
+                COALESCE(SUM(CASE WHEN tipo = 'Salida' THEN cantidad END), 0)
+            FROM movimientos_diarios
+            WHERE 1=1{where}
+        """, params)
+        total, entradas, salidas = self.cursor.fetchone()
+        return {
+            'total_movimientos': total,
+            'total_entradas': entradas,
+            'total_salidas': salidas,
+            'balance': entradas - salidas
+        }
+
+    def get_daily_totals(self, movement_type="Todos", date_from=None, date_to=None,
+                         id_producto=None):
+        """Totales por día del rango: [(dia, movimientos, entradas, salidas)]"""
+        where, params = self._daily_filter(movement_type, date_from, date_to, id_producto)
+        self.cursor.execute(f"""
+            SELECT
+                dia,
+                SUM(movimientos),
+                SUM(CASE WHEN tipo = 'Entrada' THEN cantidad ELSE 0 END),
+                SUM(CASE WHEN tipo = 'Salida' THEN cantidad ELSE 0 END)
+            FROM movimientos_diarios
+            WHERE 1=1{where}
+            GROUP BY dia
+            ORDER BY dia
+        """, params)
+        return self.cursor.fetchall()
+
+    def _daily_filter(self, movement_type, date_from, date_to, id_producto):
+        """Condiciones y parámetros sobre movimientos_diarios"""
+        where = ""
+        params = []
+        if movement_type != "Todos":
+            where += " AND tipo = ?"
+            params.append(movement_type)
+        if date_from:
+            where += " AND dia >= date(?)"
+            params.append(date_from)
+        if date_to:
+            where += " AND dia <= date(?)"
+            params.append(date_to)
+        if id_producto is not None:
+            where += " AND id_producto = ?"
+            params.append(id_producto)
+        return where, params
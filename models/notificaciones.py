@@ -1,13 +1,100 @@
-from tkinter import ttk, messagebox
+from bisect import bisect_left, insort
+from tkinter import messagebox
+import threading
 import tkinter as tk
+from background import call_in_tk
 from database import create_connection
 from helpers import clear_frame
+from stock_events import get_stock_events
 from views.base_view import BaseView
 
 # Conexión a PostgreSQL
 conn = create_connection()
 cursor = conn.cursor()
 
+# Los cambios llegan por el bus de stock; el barrido completo solo concilia
+# escrituras que no pasan por los modelos (30 minutos)
+LOW_STOCK_SWEEP_MS = 30 * 60 * 1000
+
+# Productos por consulta al revisar cambios (límite de parámetros de SQLite)
+LOW_STOCK_CHUNK = 500
+
+
+def low_stock_sql(extra_where=""):
+    """Productos con stock bajo; el stock es la suma de todas sus ubicaciones"""
+    return f"""
+    SELECT p.id_producto, p.nombre, SUM(i.stock) AS stock, c.nombre as categoria, p.stock_minimo
+    FROM productos p
+    JOIN inventario i ON p.id_producto = i.id_producto
+    LEFT JOIN categorias c ON p.id_categoria = c.id_categoria
+    WHERE p.activo = TRUE{extra_where}
+    GROUP BY p.id_producto
+    HAVING SUM(i.stock) <= COALESCE(p.stock_minimo, 0)
+    """
+
+
+class LowStockIndex:
+    """Productos con stock bajo indexados por id_producto y ordenados por stock.
+
+    Las entradas son los diccionarios de notificación (id, product, stock,
+    category, stock_minimo). update() recibe los productos releídos tras un
+    cambio y solo reubica esos, sin reconstruir ni reordenar el resto.
+    """
+
+    def __init__(self):
+        self._items = {}     # id_producto -> notificación
+        self._order = []     # (stock, id_producto) ordenado
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, product_id):
+        return product_id in self._items
+
+    def __iter__(self):
+        """Notificaciones de menor a mayor stock"""
+        for _, product_id in self._order:
+            yield self._items[product_id]
+
+    def get(self, product_id):
+        return self._items.get(product_id)
+
+    def first(self, limit):
+        """Las limit notificaciones con menos stock"""
+        return [self._items[product_id] for _, product_id in self._order[:limit]]
+
+    def count_below(self, stock):
+        """Cantidad de productos con stock menor que stock"""
+        return bisect_left(self._order, (stock,))
+
+    def reset(self, items):
+        """Reemplaza el contenido por items (resultado de un barrido completo)"""
+        self._items = {item['id']: item for item in items}
+        self._order = sorted((item['stock'], item['id']) for item in self._items.values())
+
+    def update(self, product_ids, items):
+        """Aplica la relectura de product_ids; items son los que siguen con stock bajo"""
+        for product_id in product_ids:
+            self._discard(self._check_id(product_id))
+        for item in items:
+            product_id = self._check_id(item['id'])
+            # Nunca dos posiciones para el mismo producto
+            self._discard(product_id)
+            self._items[product_id] = item
+            insort(self._order, (item['stock'], product_id))
+
+    def _discard(self, product_id):
+        old = self._items.pop(product_id, None)
+        if old is not None:
+            del self._order[bisect_left(self._order, (old['stock'], product_id))]
+
+    @staticmethod
+    def _check_id(product_id):
+        """Las claves son id_producto enteros; "1" no encontraría la entrada de 1"""
+        if not isinstance(product_id, int) or isinstance(product_id, bool):
+            raise TypeError(f"ID de producto no entero: {product_id!r}")
+        return product_id
+
 
 class NotificationManager(BaseView):
     def __init__(self, app):
@@ -15,41 +102,108 @@ class NotificationManager(BaseView):
         super().__init__(None, app)
         self.app = app
         self.notification_count = 0
-        self.notifications = []
+        self.low_stock = LowStockIndex()
+
+        # Cambios recibidos del bus que aún no se aplicaron
+        self._pending_lock = threading.Lock()
+        self._pending_ids = set()
+        self._pending_all = False
+        self._apply_scheduled = False
+        self._sweep_job = None
+        get_stock_events().subscribe(self._on_stock_changed)
+
+    def start(self):
+        """Carga las notificaciones y deja programado un único barrido"""
+        self.stop()
+        self._sweep()
+
+    def stop(self):
+        """Cancela el barrido programado, si lo hay"""
+        if self._sweep_job is not None:
+            try:
+                self.app.after_cancel(self._sweep_job)
+            except tk.TclError:
+                pass
+            self._sweep_job = None
+
+    def _sweep(self):
+        self.check_low_stock()
+        self._sweep_job = self.app.after(LOW_STOCK_SWEEP_MS, self._sweep)
 
     def check_low_stock(self):
-        """Verifica productos con stock bajo y actualiza las notificaciones"""
+        """Verifica todos los productos con stock bajo y actualiza las notificaciones"""
         try:
-            cursor.execute("""
-                SELECT p.id_producto, p.nombre, i.stock, c.nombre as categoria, p.stock_minimo
-                FROM productos p
-                JOIN inventario i ON p.id_producto = i.id_producto
-                LEFT JOIN categorias c ON p.id_categoria = c.id_categoria
-                WHERE p.activo = TRUE
-                  AND i.stock <= COALESCE(p.stock_minimo, 0)
-                ORDER BY i.stock ASC
-            """)
-            low_stock_items = cursor.fetchall()
-
-            self.notifications = []
-            for item in low_stock_items:
-                self.notifications.append({
-                    'id': item[0],
-                    'product': item[1],
-                    'stock': item[2],
-                    'category': item[3] or 'Sin categoría',
-                    'stock_minimo': item[4] if item[4] is not None else 0
-                })
-
-            self.notification_count = len(self.notifications)
+            cursor.execute(low_stock_sql())
+            self.low_stock.reset(self._notification(item) for item in cursor.fetchall())
+            self.notification_count = len(self.low_stock)
             self.update_bell_icon()
 
         except Exception as e:
             print(f"Error al verificar stock bajo: {e}")
             conn.rollback()
-        finally:
-            # Programar la próxima verificación en 5 minutos (300000 ms)
-            self.app.after(300000, self.check_low_stock)
+
+    def _notification(self, item):
+        return {
+            'id': item[0],
+            'product': item[1],
+            'stock': item[2],
+            'category': item[3] or 'Sin categoría',
+            'stock_minimo': item[4] if item[4] is not None else 0
+        }
+
+    def _on_stock_changed(self, product_ids):
+        """Suscriptor del bus de stock; puede llamarse desde cualquier hilo.
+
+        Solo anota los IDs bajo el lock; la relectura corre en el hilo de
+        Tk cuando este recupera el control (la escritura ya terminó).
+        """
+        with self._pending_lock:
+            if product_ids is None:
+                self._pending_all = True
+            else:
+                self._pending_ids |= product_ids
+            if self._apply_scheduled:
+                return
+            self._apply_scheduled = True
+        try:
+            scheduled = call_in_tk(self.app, self._apply_pending)
+        except (RuntimeError, tk.TclError):
+            scheduled = False    # Ventana cerrada
+        if not scheduled:
+            # Queda pendiente para el próximo aviso o el barrido
+            with self._pending_lock:
+                self._apply_scheduled = False
+
+    def _apply_pending(self):
+        """Relee solo los productos que cambiaron y actualiza la lista"""
+        with self._pending_lock:
+            product_ids, self._pending_ids = self._pending_ids, set()
+            refresh_all, self._pending_all = self._pending_all, False
+            self._apply_scheduled = False
+
+        if refresh_all:
+            self.check_low_stock()
+            return
+        if not product_ids:
+            return
+
+        try:
+            ids = list(product_ids)
+            changed = []
+            for start in range(0, len(ids), LOW_STOCK_CHUNK):
+                chunk = ids[start:start + LOW_STOCK_CHUNK]
+                cursor.execute(
+                    low_stock_sql(f" AND p.id_producto IN ({', '.join('?' * len(chunk))})"),
+                    chunk)
+                changed.extend(self._notification(item) for item in cursor.fetchall())
+        except Exception as e:
+            print(f"Error al verificar stock bajo: {e}")
+            conn.rollback()
+            return
+
+        self.low_stock.update(product_ids, changed)
+        self.notification_count = len(self.low_stock)
+        self.update_bell_icon()
 
     def update_bell_icon(self):
         """Actualiza el ícono de la campana con el contador de notificaciones"""
@@ -103,7 +257,7 @@ class NotificationManager(BaseView):
             )
             self.app.notification_menu.add_separator()
 
-            for notification in self.notifications:
+            for notification in self.low_stock:
                 text = f"{notification['product']} - Stock: {notification['stock']} ({notification['category']})"
                 self.app.notification_menu.add_command(
                     label=text,
@@ -137,27 +291,12 @@ class NotificationManager(BaseView):
 
     def show_product_detail(self, product_id):
         """Muestra los detalles del producto con stock bajo"""
-        from menu.productos import show_inventory, edit_selected_product
-        show_inventory(self.app)
-
-        # Buscar el producto en el treeview y seleccionarlo
-        tree = None
-        for widget in self.app.content_frame.winfo_children():
-            if isinstance(widget, ttk.Treeview):
-                tree = widget
-                break
-
-        if tree:
-            for child in tree.get_children():
-                if tree.item(child, 'tags')[0] == str(product_id):
-                    tree.selection_set(child)
-                    tree.focus(child)
-                    tree.see(child)
-                    
-                    # Resaltar la fila seleccionada
-                    tree.tag_configure('selected', background=self.primary_color)
-                    tree.item(child, tags=('selected',))
-                    break
+        from menu.productos import show_inventory
+        controller = show_inventory(self.app)
+
+        # Seleccionar el producto en cuanto la tabla termine de cargarse
+        if controller:
+            controller.select_product(product_id)
 
     def mark_all_as_read(self):
         """Marca todas las notificaciones como leídas (no las elimina, solo actualiza el contador)"""
@@ -223,7 +362,7 @@ class NotificationManager(BaseView):
         """Obtiene estadísticas de notificaciones"""
         return {
             'total': self.notification_count,
-            'low_stock': len([n for n in self.notifications if n['stock'] < 5]),
-            'out_of_stock': len([n for n in self.notifications if n['stock'] == 0]),
-            'notifications': self.notifications
+            'low_stock': self.low_stock.count_below(5),
+            'out_of_stock': self.low_stock.count_below(1),
+            'notifications': list(self.low_stock)
         }
\ No newline at end of file
@@ -1,32 +1,101 @@
-from database import create_connection
+import re
+from datetime import datetime
+
+from database import PAGE_SIZE, create_connection, keyset_page, stock_status_sql
+from helpers import normalizar_texto
+from master_data import get_master_data
+from stock_events import get_stock_events
+
+# Estado de stock calculado a partir del stock y el stock mínimo del producto
+STOCK_STATUS_SQL = stock_status_sql("inventario.stock", "inventario.id_producto")
+
+# Cada fila de inventario (ubicación) de un producto es una fila del listado:
+# la última clave del keyset debe ser única, así que desempata id_inventario
+# (0 para productos sin fila de inventario)
+INVENTORY_KEY = ("COALESCE(i.id_inventario, 0)", "ASC")
+
+# Orden del listado de productos; id_producto desempata nombres repetidos
+PRODUCTS_ORDER = [("p.nombre", "ASC"), ("p.id_producto", "ASC"), INVENTORY_KEY]
+
+# Relevancia de la búsqueda (menor es mejor): pesa más el nombre y el código
+# que la marca y la categoría
+SEARCH_RANK_SQL = "bm25(productos_fts, 10.0, 8.0, 2.0, 2.0)"
+SEARCH_ORDER = [(SEARCH_RANK_SQL, "ASC"), ("p.id_producto", "ASC"), INVENTORY_KEY]
+
+# Condición de búsqueda sin FTS5 (no puede usar índices)
+LIKE_SEARCH_SQL = " AND (LOWER(p.nombre) LIKE LOWER(?) OR LOWER(p.codigo) LIKE LOWER(?))"
+
+# Códigos por consulta al leer los IDs de un lote (límite de parámetros de SQLite)
+CODES_CHUNK = 500
+
+
+def fts_query(term):
+    """Convierte el texto buscado en una consulta FTS5 por prefijos.
+
+    "tóner hp" -> '"tóner"* "hp"*': todas las palabras deben aparecer, en
+    cualquier columna. Solo se conservan letras y dígitos, así que el texto
+    del usuario nunca se interpreta como sintaxis de FTS5.
+    """
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", term))
+
+
+def search_tokens(text):
+    """Palabras en minúsculas y sin acentos, como las indexa productos_fts"""
+    return re.findall(r"\w+", normalizar_texto(text))
+
+
+def matches_search(term, fields):
+    """Evalúa en memoria la misma coincidencia que fts_query sobre unos campos"""
+    words = [word for field in fields if field for word in search_tokens(field)]
+    return all(any(word.startswith(token) for word in words)
+               for token in search_tokens(term))
+
+
+def product_data_error(codigo, producto, stock_txt):
+    """Valida código, nombre y stock de un producto.
+
+    Retorna (título, mensaje) del primer error encontrado o None si los
+    datos son válidos. Con stock_txt == "0" no se valida el stock (edición).
+    """
+    if not codigo or not producto:
+        return "Campos requeridos", "Código y Producto son campos obligatorios."
+
+    if stock_txt != "0":
+        if not stock_txt.isdigit() or int(stock_txt) < 0:
+            return "Stock inválido", "El stock debe ser un número entero positivo."
+
+    if not codigo.replace("-", "").isalnum():
+        return "Código inválido", "El código solo debe contener letras, números y guiones."
+
+    if not all(c.isalnum() or c.isspace() for c in producto):
+        return "Nombre inválido", "El nombre del producto solo debe contener letras, números y espacios."
+
+    return None
 
 
 class ProductModel:
     def __init__(self):
         self.conn = create_connection()
         self.cursor = self.conn.cursor()
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'productos_fts'")
+        self.fts_enabled = self.cursor.fetchone() is not None
 
     def get_id_by_name(self, table, name):
         """Obtener ID por nombre de una tabla relacionada SOLO SI ESTÁ ACTIVO"""
-        id_column = {
-            'marcas': 'id_marca',
-            'categorias': 'id_categoria',
-            'ubicaciones': 'id_ubicacion'
-        }[table]
-
         try:
-            self.cursor.execute(
-                f"SELECT {id_column} FROM {table} WHERE nombre = ? AND activo = 1", (name,))
-            result = self.cursor.fetchone()
-            return result[0] if result else None
+            return get_master_data().id_by_name(table, name)
         except Exception as e:
             print(f"Error getting ID by name: {e}")
             return None
 
     def get_products(self, extra_where="", params=()):
         """Obtener todos los productos con filtros opcionales"""
-        # CAMBIO: Reemplazar ILIKE por LIKE para SQLite
-        query = """
+        return self.get_products_page(extra_where, params, page_size=None)[0]
+
+    def _products_query(self, from_clause, order_by, extra_where):
+        """SELECT del listado de productos con las claves de order_by al final"""
+        return f"""
         SELECT 
             p.id_producto, p.codigo, p.nombre, 
             m.nombre as marca, 
@@ -34,90 +103,94 @@ class ProductModel:
             i.stock, 
             u.nombre as ubicacion, 
             i.estado_stock,
-            p.stock_minimo
-        FROM productos p
+            p.stock_minimo,
+            {", ".join(expr for expr, _ in order_by)}
+        {from_clause}
         LEFT JOIN marcas m ON p.id_marca = m.id_marca
         LEFT JOIN categorias c ON p.id_categoria = c.id_categoria
         LEFT JOIN inventario i ON p.id_producto = i.id_producto
         LEFT JOIN ubicaciones u ON i.id_ubicacion = u.id_ubicacion
         WHERE p.activo = 1
-        """ + extra_where + " ORDER BY p.nombre ASC"
+        """ + extra_where
 
+    def get_products_page(self, extra_where="", params=(), after=None, page_size=PAGE_SIZE):
+        """Obtener una página de productos: (filas, siguiente_cursor, total)"""
+        query = self._products_query("FROM productos p", PRODUCTS_ORDER, extra_where)
         try:
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
+            return keyset_page(self.cursor, query, params, PRODUCTS_ORDER,
+                               after, page_size)
         except Exception as e:
             print(f"Error getting products: {e}")
-            return []
+            return [], None, 0
+
+    def search_products_page(self, term, extra_where="", params=(), after=None,
+                             page_size=PAGE_SIZE):
+        """Buscar productos por nombre, código, marca o categoría.
+
+        Con FTS5 coincide por prefijo de palabra sin distinguir acentos ni
+        mayúsculas y ordena por relevancia; sin FTS5 usa LIKE ordenado por
+        nombre. Retorna lo mismo que get_products_page.
+        """
+        match = fts_query(term)
+        if not match:
+            return self.get_products_page(extra_where, params, after, page_size)
+
+        if not self.fts_enabled:
+            like_params = (f"%{term}%", f"%{term}%") + tuple(params)
+            return self.get_products_page(LIKE_SEARCH_SQL + extra_where, like_params,
+                                          after, page_size)
+
+        query = self._products_query(
+            "FROM productos_fts CROSS JOIN productos p ON p.id_producto = productos_fts.rowid",
+            SEARCH_ORDER, " AND productos_fts MATCH ?" + extra_where)
+        try:
+            return keyset_page(self.cursor, query, (match,) + tuple(params),
+                               SEARCH_ORDER, after, page_size)
+        except Exception as e:
+            print(f"Error searching products: {e}")
+            return [], None, 0
 
     def get_combobox_data(self, table):
         """Obtener datos para comboboxes - SOLO ACTIVOS"""
         try:
-            id_column = {
-                'ubicaciones': 'id_ubicacion',
-                'categorias': 'id_categoria',
-                'marcas': 'id_marca'
-            }[table]
+            # Se leen de la caché de tablas maestras, no de la base
+            return get_master_data().options(table)
+        except Exception as e:
+            print(f"Error al cargar datos: {e}")
+            return []
 
-            # Verificar si la tabla tiene columna 'activo' usando PRAGMA
-            self.cursor.execute(f"PRAGMA table_info({table})")
-            columns = self.cursor.fetchall()
-            has_activo_column = any('activo' in col[1].lower() for col in columns)
+    def recompute_stock_status(self):
+        """Recalcula estado_stock en bloque y retorna los IDs de producto que cambiaron.
 
-            if has_activo_column:
-                query = f"SELECT {id_column}, nombre FROM {table} WHERE activo = 1 ORDER BY nombre"
-            else:
-                query = f"SELECT {id_column}, nombre FROM {table} ORDER BY nombre"
+        Los triggers de inventario mantienen el estado al día; este método
+        solo sirve para reconciliar datos modificados fuera de la aplicación.
+        """
+        changed_filter = f"""
+            WHERE inventario.id_producto IN (SELECT id_producto FROM productos WHERE activo = 1)
+              AND inventario.estado_stock IS NOT {STOCK_STATUS_SQL}
+        """
 
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
+        try:
+            self.cursor.execute(
+                "SELECT DISTINCT inventario.id_producto FROM inventario" + changed_filter)
+            changed_ids = [row[0] for row in self.cursor.fetchall()]
+
+            if changed_ids:
+                # Una sola sentencia para todas las filas desactualizadas
+                self.cursor.execute(
+                    f"UPDATE inventario SET estado_stock = {STOCK_STATUS_SQL}" + changed_filter)
+                self.conn.commit()
+
+            return changed_ids
         except Exception as e:
-            print(f"Error al cargar datos: {e}")
+            print(f"Error updating stock status: {e}")
             self.conn.rollback()
             return []
 
     def update_product_stock_status(self):
         """Actualizar estado de stock de productos considerando stock mínimo"""
-        stock_updates = []
-        inventario_data = self.get_products()
-
-        for item in inventario_data:
-            stock = item[5] if item[5] else 0
-            estado = item[7] if item[7] else "disponible"
-            
-            # Obtener stock mínimo del producto
-            self.cursor.execute("SELECT stock_minimo FROM productos WHERE id_producto = ?", (item[0],))
-            stock_minimo_result = self.cursor.fetchone()
-            stock_minimo = stock_minimo_result[0] if stock_minimo_result else 0
-
-            # Actualizar estado basado en stock y stock mínimo
-            if stock == 0:
-                nuevo_estado = "agotado"
-            elif stock <= stock_minimo:
-                nuevo_estado = "stock bajo"
-            else:
-                nuevo_estado = "disponible"
-
-            if estado != nuevo_estado:
-                stock_updates.append((nuevo_estado, item[0]))
-
-        if stock_updates:
-            for estado, id_producto in stock_updates:
-                try:
-                    self.cursor.execute(
-                        "UPDATE inventario SET estado_stock = ? WHERE id_producto = ?",
-                        (estado, id_producto))
-                except Exception as e:
-                    print(f"Error updating stock status: {e}")
-                    continue
-
-            try:
-                self.conn.commit()
-            except Exception as e:
-                print(f"Error committing stock updates: {e}")
-                self.conn.rollback()
-
-        return inventario_data
+        self.recompute_stock_status()
+        return self.get_products()
 
     def get_product_data(self, product_id):
         """Obtener datos de un producto específico"""
@@ -206,6 +279,7 @@ class ProductModel:
                     ))
 
                 self.conn.commit()
+                get_stock_events().publish({int(product_id)})
                 return product_id
 
             else:
@@ -238,6 +312,7 @@ class ProductModel:
                 ))
 
                 self.conn.commit()
+                get_stock_events().publish({new_product_id})
                 return new_product_id
 
         except Exception as e:
@@ -251,11 +326,64 @@ class ProductModel:
                 "UPDATE productos SET activo = 0 WHERE id_producto = ?",
                 (product_id,))
             self.conn.commit()
+            get_stock_events().publish({int(product_id)})
             return True
         except Exception as e:
             self.conn.rollback()
             raise e
 
+    def existing_codes(self):
+        """Conjunto de códigos de producto ya registrados"""
+        self.cursor.execute("SELECT codigo FROM productos")
+        return {row[0] for row in self.cursor.fetchall()}
+
+    def insert_products_batch(self, products, id_responsable=None):
+        """Insertar varios productos nuevos en una sola transacción.
+
+        products es una lista de diccionarios con las claves de save_product.
+        Por cada uno se crea su fila de inventario y el movimiento de entrada
+        "Producto nuevo". Ante cualquier error se revierte el lote completo.
+        """
+        try:
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN")
+            self.cursor.executemany("""
+                INSERT INTO productos
+                (codigo, nombre, id_marca, id_categoria, stock_minimo)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(p['codigo'], p['nombre'], p['marca_id'], p['categoria_id'],
+                   p['stock_minimo']) for p in products])
+            # Los IDs nuevos se obtienen por código (índice único)
+            codigos = [p['codigo'] for p in products]
+            new_ids = set()
+            for inicio in range(0, len(codigos), CODES_CHUNK):
+                bloque = codigos[inicio:inicio + CODES_CHUNK]
+                self.cursor.execute(f"""
+                    SELECT id_producto FROM productos
+                    WHERE codigo IN ({", ".join("?" * len(bloque))})
+                """, bloque)
+                new_ids.update(row[0] for row in self.cursor.fetchall())
+
+            self.cursor.executemany("""
+                INSERT INTO inventario (id_producto, id_ubicacion, stock, estado_stock)
+                SELECT id_producto, ?, ?, 'disponible' FROM productos WHERE codigo = ?
+            """, [(p['ubicacion_id'], p['stock'], p['codigo']) for p in products])
+
+            fecha = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.cursor.executemany("""
+                INSERT INTO movimientos
+                (id_producto, tipo, cantidad, id_responsable, referencia, fecha)
+                SELECT id_producto, 'Entrada', ?, ?, 'Producto nuevo', ?
+                FROM productos WHERE codigo = ?
+            """, [(p['stock'], id_responsable, fecha, p['codigo']) for p in products])
+
+            self.conn.commit()
+            get_stock_events().publish(new_ids)
+            return len(products)
+        except Exception:
+            self.conn.rollback()
+            raise
+
     def add_stock(self, product_id, quantity):
         """Agregar stock a un producto"""
         try:
@@ -263,6 +391,7 @@ class ProductModel:
                 "UPDATE inventario SET stock = stock + ? WHERE id_producto = ?",
                 (int(quantity), product_id))
             self.conn.commit()
+            get_stock_events().publish({int(product_id)})
             return True
         except Exception as e:
             self.conn.rollback()
@@ -290,6 +419,7 @@ class ProductModel:
             result = self.cursor.fetchone()
             
             self.conn.commit()
+            get_master_data().invalidate(table)
             return result  # Retorna el nuevo valor (id, nombre)
         except Exception as e:
             self.conn.rollback()
@@ -1,4 +1,7 @@
-from database import create_connection
+from database import PAGE_SIZE, create_connection, keyset_page
+
+# Orden del listado; el nombre es único pero id_proveedor fija el desempate
+SUPPLIERS_ORDER = [("p.nombre", "ASC"), ("p.id_proveedor", "ASC")]
 
 
 class SupplierModel:
@@ -8,9 +11,14 @@ class SupplierModel:
 
     def get_all_suppliers(self, category_filter="Todas", rating_filter="Todas", price_filter="Todos"):
         """Obtiene todos los proveedores con filtros opcionales"""
+        return self.get_suppliers_page(category_filter, rating_filter, price_filter,
+                                       page_size=None)[0]
+
+    def get_suppliers_page(self, category_filter="Todas", rating_filter="Todas",
+                           price_filter="Todos", after=None, page_size=PAGE_SIZE):
+        """Obtiene una página de proveedores: (filas, siguiente_cursor, total)"""
         query = """
             SELECT
-                ROW_NUMBER() OVER (ORDER BY p.nombre) as nro,
                 p.nombre,
                 COALESCE(p.contacto, 'N/A'),
                 COALESCE(p.telefono, 'N/A'),
@@ -36,7 +44,8 @@ class SupplierModel:
                          WHERE pp.id_proveedor = p.id_proveedor
                      ) c
                     ), 'N/A'
-                ) as categorias
+                ) as categorias,
+                p.nombre, p.id_proveedor
             FROM proveedores p
             WHERE 1=1
         """
@@ -70,12 +79,8 @@ class SupplierModel:
             query += " AND p.manejo_precios = ?"
             params.append(price_filter)
 
-        query += " ORDER BY p.nombre"
-        
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
-        # CONVERTIR objetos Row a tuplas
-        return [tuple(row) for row in rows]
+        return keyset_page(self.cursor, query, params, SUPPLIERS_ORDER,
+                           after, page_size, numbered=True)
 
     def get_supplier_by_name(self, supplier_name):
         """Obtiene un proveedor por nombre"""
@@ -1,6 +1,8 @@
 # models/settings_models.py
 import sqlite3
-from database import create_connection
+from database import create_connection, get_pool
+from master_data import MASTER_TABLES, get_master_data
+from stock_events import get_stock_events
 
 
 class SettingsModel:
@@ -33,16 +35,9 @@ class SettingsModel:
                 query = "SELECT id_proveedor, nombre, contacto, telefono, email, direccion, activo FROM proveedores"
             else:
                 # Para tablas maestras simples
-                try:
-                    self.cursor.execute(f"PRAGMA table_info({table_name})")
-                    columns = self.cursor.fetchall()
-                    has_activo = any('activo' in col[1].lower() for col in columns)
-                    
-                    if has_activo:
-                        query = f"SELECT *, activo FROM {table_name}"
-                    else:
-                        query = f"SELECT * FROM {table_name}"
-                except:
+                if get_pool().has_column(table_name, 'activo'):
+                    query = f"SELECT *, activo FROM {table_name}"
+                else:
                     query = f"SELECT * FROM {table_name}"
 
             self.cursor.execute(query)
@@ -74,16 +69,9 @@ class SettingsModel:
                 query = "SELECT id, nombre_completo, email, usuario, rol FROM usuarios WHERE activo = 1"
             else:
                 # Verificar si la tabla tiene columna activo
-                try:
-                    self.cursor.execute(f"PRAGMA table_info({table_name})")
-                    columns = self.cursor.fetchall()
-                    has_activo = any('activo' in col[1].lower() for col in columns)
-                    
-                    if has_activo:
-                        query = f"SELECT * FROM {table_name} WHERE activo = 1"
-                    else:
-                        query = f"SELECT * FROM {table_name}"
-                except:
+                if get_pool().has_column(table_name, 'activo'):
+                    query = f"SELECT * FROM {table_name} WHERE activo = 1"
+                else:
                     query = f"SELECT * FROM {table_name}"
 
             self.cursor.execute(query)
@@ -118,6 +106,8 @@ class SettingsModel:
                 config = table_config[table_name]
                 actual_table = config['table']
                 id_column = config['id_column']
+                if actual_table in MASTER_TABLES:
+                    return get_master_data().options(actual_table)
             elif table_name.endswith('s'):
                 actual_table = table_name
                 id_column = f"id_{table_name[:-1]}"
@@ -125,13 +115,8 @@ class SettingsModel:
                 actual_table = table_name
                 id_column = "id"
 
-            # VERIFICACIÓN MÁS ROBUSTA DE LA COLUMNA ACTIVO
-            self.cursor.execute(f"PRAGMA table_info({actual_table})")
-            columns = self.cursor.fetchall()
-            has_activo = any(col[1].lower() == 'activo' for col in columns)
-            
             # SIEMPRE filtrar por activo = 1 para combobox
-            if has_activo:
+            if get_pool().has_column(actual_table, 'activo'):
                 query = f"SELECT {id_column}, nombre FROM {actual_table} WHERE activo = 1 ORDER BY nombre"
             else:
                 query = f"SELECT {id_column}, nombre FROM {actual_table} ORDER BY nombre"
@@ -162,6 +147,7 @@ class SettingsModel:
             
             self.cursor.execute(query, processed_values)
             self.conn.commit()
+            self._after_write(table_name)
             return True
         except sqlite3.Error as e:
             self.conn.rollback()
@@ -187,23 +173,32 @@ class SettingsModel:
             
             self.cursor.execute(query, processed_values + [item_id])
             self.conn.commit()
+            self._after_write(table_name)
             return True
         except sqlite3.Error as e:
             self.conn.rollback()
             raise Exception(f"No se pudo actualizar el ítem: {str(e)}")
 
+    def _after_write(self, table_name):
+        """Acciones posteriores a modificar una tabla desde Ajustes"""
+        if table_name == "configuracion":
+            # El perfil de PRAGMA se relee para las conexiones nuevas
+            get_pool().reload_pragmas()
+        elif table_name in MASTER_TABLES:
+            get_master_data().invalidate(table_name)
+        elif table_name in ("productos", "inventario"):
+            # Puede cambiar stock mínimo, stock o estado activo de cualquier producto
+            get_stock_events().publish(None)
+
     def soft_delete_item(self, table_name, id_column, item_id):
         """Marca un item como inactivo (eliminación lógica)"""
         try:
-            # Verificar si la tabla tiene columna activo usando PRAGMA
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = self.cursor.fetchall()
-            has_activo = any('activo' in col[1].lower() for col in columns)
-            
-            if has_activo:
+            # Verificar si la tabla tiene columna activo (metadatos en caché)
+            if get_pool().has_column(table_name, 'activo'):
                 query = f"UPDATE {table_name} SET activo = 0 WHERE {id_column} = ?"
                 self.cursor.execute(query, (item_id,))
                 self.conn.commit()
+                self._after_write(table_name)
                 return True
             else:
                 # Si no tiene columna activo, no podemos hacer soft delete
@@ -216,15 +211,12 @@ class SettingsModel:
     def activate_item(self, table_name, id_column, item_id):
         """Reactiva un item previamente desactivado"""
         try:
-            # Verificar si la tabla tiene columna activo usando PRAGMA
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = self.cursor.fetchall()
-            has_activo = any('activo' in col[1].lower() for col in columns)
-            
-            if has_activo:
+            # Verificar si la tabla tiene columna activo (metadatos en caché)
+            if get_pool().has_column(table_name, 'activo'):
                 query = f"UPDATE {table_name} SET activo = 1 WHERE {id_column} = ?"
                 self.cursor.execute(query, (item_id,))
                 self.conn.commit()
+                self._after_write(table_name)
                 
                 # Verificar que realmente se actualizó
                 self.cursor.execute(f"SELECT activo FROM {table_name} WHERE {id_column} = ?", (item_id,))
@@ -246,6 +238,7 @@ class SettingsModel:
             query = f"DELETE FROM {table_name} WHERE {id_column} = ?"
             self.cursor.execute(query, (item_id,))
             self.conn.commit()
+            self._after_write(table_name)
             return True
         except sqlite3.IntegrityError as e:
             self.conn.rollback()
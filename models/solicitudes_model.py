@@ -1,4 +1,27 @@
-from database import create_connection
+from datetime import datetime
+
+from database import PAGE_SIZE, create_connection, keyset_page
+from master_data import get_master_data
+from stock_events import get_stock_events
+
+# Orden del listado: más recientes primero, id_solicitud desempata la fecha
+SOLICITUDES_ORDER = [("s.fecha_solicitud", "DESC"), ("s.id_solicitud", "DESC")]
+
+# Productos por consulta al leer el stock de una entrega (límite de parámetros de SQLite)
+INVENTARIO_CHUNK = 500
+
+
+class StockInsuficienteError(Exception):
+    """Una entrega pide más de lo que hay en inventario.
+
+    faltantes es una lista de (id_producto, solicitado, disponible) con los
+    productos que no alcanzan; el stock no se modificó.
+    """
+
+    def __init__(self, faltantes):
+        self.faltantes = faltantes
+        super().__init__(
+            f"Stock insuficiente para {len(faltantes)} producto(s)")
 
 
 class SolicitudesModel:
@@ -9,9 +32,7 @@ class SolicitudesModel:
     def obtener_departamentos(self):
         """Obtener todos los departamentos"""
         try:
-            self.cursor.execute(
-                "SELECT id_departamento, nombre FROM departamentos WHERE activo = 1 ORDER BY nombre")
-            return self.cursor.fetchall()
+            return get_master_data().options("departamentos")
         except Exception as e:
             print(f"Error al obtener departamentos: {e}")
             return []
@@ -29,8 +50,7 @@ class SolicitudesModel:
     def obtener_categorias(self):
         """Obtener todas las categorías"""
         try:
-            self.cursor.execute("SELECT id_categoria, nombre FROM categorias WHERE activo = 1")
-            return self.cursor.fetchall()
+            return get_master_data().options("categorias")
         except Exception as e:
             print(f"Error al obtener categorías: {e}")
             return []
@@ -130,51 +150,83 @@ class SolicitudesModel:
             return None
 
     def obtener_solicitudes(self, filtros=None):
-        """Obtener solicitudes con filtros opcionales"""
+        """Obtener todas las solicitudes con filtros opcionales"""
+        return self.obtener_pagina_solicitudes(filtros, page_size=None)[0]
+
+    def obtener_pagina_solicitudes(self, filtros=None, after=None, page_size=PAGE_SIZE):
+        """Obtener una página de solicitudes: (filas, siguiente_cursor, total)"""
         try:
-            query = """
-            SELECT 
-                s.id_solicitud as nro,
-                strftime('%d/%m/%Y %H:%M', s.fecha_solicitud) as fecha,
-                d.nombre AS departamento,
-                sol.nombre AS solicitante,
-                s.comentario AS referencia,
-                u.nombre_completo AS responsable_entrega,
-                s.id_solicitud
-            FROM solicitudes s
-            JOIN departamentos d ON s.id_departamento = d.id_departamento
-            JOIN solicitantes sol ON s.id_solicitante = sol.id_solicitante
-            JOIN usuarios u ON s.id_responsable_entrega = u.id
-            WHERE s.activo = 1
-            """
-            
-            params = []
-
-            if filtros:
-                if filtros.get('search_text'):
-                    # CAMBIO: Reemplazar ILIKE por LIKE con LOWER para SQLite
-                    query += " AND LOWER(s.comentario) LIKE LOWER(?)"
-                    params.append(f"%{filtros['search_text']}%")
-
-                if filtros.get('dept_filter') and filtros['dept_filter'] != "Todos":
-                    query += " AND d.nombre = ?"
-                    params.append(filtros['dept_filter'])
-
-                if filtros.get('date_from'):
-                    query += " AND DATE(s.fecha_solicitud) >= ?"
-                    params.append(filtros['date_from'])
-
-                if filtros.get('date_to'):
-                    query += " AND DATE(s.fecha_solicitud) <= ?"
-                    params.append(filtros['date_to'])
-
-            query += " ORDER BY s.fecha_solicitud DESC LIMIT 100"
-
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
+            query, params = self._consulta_solicitudes(filtros)
+            return keyset_page(self.cursor, query, params, SOLICITUDES_ORDER,
+                               after, page_size)
         except Exception as e:
             print(f"Error al obtener solicitudes: {e}")
-            return []
+            return [], None, 0
+
+    def cursor_exportacion(self, filtros=None):
+        """Cursor ya ejecutado con una fila por producto de cada solicitud.
+
+        Columnas: nro, fecha, departamento, solicitante, referencia, producto,
+        cantidad, responsable. Una solicitud sin productos activos aparece
+        una vez con producto y cantidad vacíos.
+        """
+        query, params = self._consulta_solicitudes(filtros)
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT sq.nro, sq.fecha, sq.departamento, sq.solicitante, sq.referencia,
+                   COALESCE(lp.nombre, ''), COALESCE(lp.cantidad, ''),
+                   sq.responsable_entrega
+            FROM ({query}) sq
+            LEFT JOIN (
+                SELECT ds.id_solicitud, ds.id_detalle_solicitud, p.nombre, ds.cantidad
+                FROM detalle_solicitud ds
+                JOIN productos p ON ds.id_producto = p.id_producto
+                WHERE p.activo = 1
+            ) lp ON lp.id_solicitud = sq.id_solicitud
+            ORDER BY sq.fecha_solicitud DESC, sq.id_solicitud DESC, lp.id_detalle_solicitud
+        """, params)
+        return cursor
+
+    def _consulta_solicitudes(self, filtros=None):
+        """SELECT del listado de solicitudes y sus parámetros según los filtros"""
+        query = """
+        SELECT 
+            s.id_solicitud as nro,
+            strftime('%d/%m/%Y %H:%M', s.fecha_solicitud) as fecha,
+            d.nombre AS departamento,
+            sol.nombre AS solicitante,
+            s.comentario AS referencia,
+            u.nombre_completo AS responsable_entrega,
+            s.id_solicitud,
+            s.fecha_solicitud, s.id_solicitud
+        FROM solicitudes s
+        JOIN departamentos d ON s.id_departamento = d.id_departamento
+        JOIN solicitantes sol ON s.id_solicitante = sol.id_solicitante
+        JOIN usuarios u ON s.id_responsable_entrega = u.id
+        WHERE s.activo = 1
+        """
+        
+        params = []
+
+        if filtros:
+            if filtros.get('search_text'):
+                # CAMBIO: Reemplazar ILIKE por LIKE con LOWER para SQLite
+                query += " AND LOWER(s.comentario) LIKE LOWER(?)"
+                params.append(f"%{filtros['search_text']}%")
+
+            if filtros.get('dept_filter') and filtros['dept_filter'] != "Todos":
+                query += " AND d.nombre = ?"
+                params.append(filtros['dept_filter'])
+
+            if filtros.get('date_from'):
+                query += " AND DATE(s.fecha_solicitud) >= ?"
+                params.append(filtros['date_from'])
+
+            if filtros.get('date_to'):
+                query += " AND DATE(s.fecha_solicitud) <= ?"
+                params.append(filtros['date_to'])
+
+        return query, params
 
     def registrar_solicitud(self, datos_solicitud):
         """Registrar una nueva solicitud"""
@@ -204,17 +256,107 @@ class SolicitudesModel:
             print(f"Error al registrar detalle de solicitud: {e}")
             self.conn.rollback()
 
-    def actualizar_inventario(self, producto_id, cantidad):
-        """Actualizar inventario después de una salida"""
+    def reservar_stock(self, lineas):
+        """Descontar el stock de lineas [(id_producto, cantidad)] sin sobrevender.
+
+        Si no hay una transacción abierta se inicia con BEGIN IMMEDIATE, de
+        modo que ninguna otra entrega escriba entre la verificación y el
+        descuento. Un producto puede tener una fila de inventario por
+        ubicación: se verifica contra la suma de su stock y se descuenta de
+        sus filas en orden de id_inventario, sin dejar ninguna negativa. Si
+        algún producto no alcanza se lanza StockInsuficienteError sin
+        modificar nada.
+
+        No confirma ni publica el cambio: quien llama hace commit (o
+        rollback) y luego publica los IDs retornados en get_stock_events().
+        """
+        pedido = {}
+        for producto_id, cantidad in lineas:
+            producto_id = int(producto_id)
+            pedido[producto_id] = pedido.get(producto_id, 0) + int(cantidad)
+
+        if not self.conn.in_transaction:
+            self.cursor.execute("BEGIN IMMEDIATE")
+        filas = self._filas_stock(pedido)
+
+        faltantes = []
+        for producto_id, cantidad in pedido.items():
+            disponible = sum(stock for _, stock in filas.get(producto_id, []))
+            if cantidad > disponible:
+                faltantes.append((producto_id, cantidad, disponible))
+        if faltantes:
+            raise StockInsuficienteError(faltantes)
+
+        descuentos = []
+        for producto_id, cantidad in pedido.items():
+            for id_inventario, stock in filas.get(producto_id, []):
+                if cantidad <= 0:
+                    break
+                tomado = min(stock, cantidad)
+                descuentos.append((tomado, id_inventario))
+                cantidad -= tomado
+        self.cursor.executemany(
+            "UPDATE inventario SET stock = stock - ? WHERE id_inventario = ?", descuentos)
+        return list(pedido)
+
+    def _filas_stock(self, ids):
+        """{id_producto: [(id_inventario, stock), ...]} de las filas con stock positivo"""
+        ids = list(ids)
+        filas = {}
+        for inicio in range(0, len(ids), INVENTARIO_CHUNK):
+            bloque = ids[inicio:inicio + INVENTARIO_CHUNK]
+            self.cursor.execute(f"""
+                SELECT id_producto, id_inventario, stock FROM inventario
+                WHERE id_producto IN ({", ".join("?" * len(bloque))}) AND stock > 0
+                ORDER BY id_producto, id_inventario
+            """, bloque)
+            for producto_id, id_inventario, stock in self.cursor.fetchall():
+                filas.setdefault(producto_id, []).append((id_inventario, stock))
+        return filas
+
+    def registrar_entrega(self, datos_solicitud, lineas, memo):
+        """Registrar una entrega completa en una sola transacción.
+
+        lineas es una lista de (id_producto, cantidad). Los detalles y los
+        movimientos se insertan con executemany y el stock se reserva con
+        reservar_stock(). Tras el commit publica los productos afectados.
+        Retorna el ID de la solicitud; ante cualquier error (incluido
+        StockInsuficienteError) revierte todo y lo propaga.
+        """
         try:
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN IMMEDIATE")
             self.cursor.execute("""
-                UPDATE inventario 
-                SET stock = stock - ?
-                WHERE id_producto = ?
-            """, (cantidad, producto_id))
-        except Exception as e:
-            print(f"Error al actualizar inventario: {e}")
+                INSERT INTO solicitudes 
+                (id_departamento, id_solicitante, id_responsable_entrega, comentario)
+                VALUES (?, ?, ?, ?)
+            """, datos_solicitud)
+            solicitud_id = self.cursor.lastrowid
+
+            self.cursor.executemany("""
+                INSERT INTO detalle_solicitud (id_solicitud, id_producto, cantidad)
+                VALUES (?, ?, ?)
+            """, [(solicitud_id, producto_id, cantidad) for producto_id, cantidad in lineas])
+
+            productos = self.reservar_stock(lineas)
+
+            referencia = f"Solicitud #{solicitud_id} - {memo}"
+            fecha = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            id_responsable = datos_solicitud[2]
+            self.cursor.executemany("""
+                INSERT INTO movimientos 
+                (id_producto, tipo, cantidad, id_responsable, referencia, fecha)
+                VALUES (?, 'Salida', ?, ?, ?, ?)
+            """, [(producto_id, cantidad, id_responsable, referencia, fecha)
+                  for producto_id, cantidad in lineas])
+
+            self.conn.commit()
+        except Exception:
             self.conn.rollback()
+            raise
+        # Solo después del commit: los suscriptores releen el stock confirmado
+        get_stock_events().publish(productos)
+        return solicitud_id
 
     def obtener_detalles_solicitud(self, solicitud_id):
         """Obtener detalles completos de una solicitud"""
@@ -266,6 +408,7 @@ class SolicitudesModel:
             )
             new_id = self.cursor.lastrowid
             self.conn.commit()
+            get_master_data().invalidate("departamentos")
             # Obtener el registro completo recién insertado
             self.cursor.execute("SELECT id_departamento, nombre FROM departamentos WHERE id_departamento = ?", (new_id,))
             return self.cursor.fetchone()
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from database import create_connection
+
+# Días entre instantáneas: una consulta histórica suma a lo sumo estos días
+# del resumen diario (más los que la app estuvo cerrada)
+SNAPSHOT_INTERVAL_DAYS = 7
+
+# Variación de stock de una fila de movimientos_diarios
+NET_SQL = "CASE WHEN tipo = 'Entrada' THEN cantidad ELSE -cantidad END"
+
+
+class StockHistoryModel:
+    """Stock de los productos en fechas pasadas.
+
+    stock_historico guarda el stock de cada producto al cierre de un día.
+    El stock en otra fecha parte de la instantánea anterior más cercana y
+    suma las entradas y salidas de movimientos_diarios desde entonces; si
+    no hay instantánea anterior, descuenta al stock actual lo movido
+    después de la fecha. Las fechas son 'YYYY-MM-DD' o date.
+    """
+
+    def __init__(self):
+        self.conn = create_connection()
+        self.cursor = self.conn.cursor()
+
+    def take_snapshot(self, dia=None):
+        """Guarda el stock de todos los productos al cierre de dia (por defecto, ayer).
+
+        Se calcula como el stock actual (sumando todas las ubicaciones del
+        producto) menos lo movido después de dia, así
+        la instantánea coincide con los días del resumen aunque se tome
+        con movimientos del día en curso.
+        """
+        dia = str(dia or date.today() - timedelta(days=1))
+        self.cursor.execute(f"""
+            INSERT OR REPLACE INTO stock_historico (id_producto, dia, stock)
+            SELECT i.id_producto, ?, SUM(COALESCE(i.stock, 0)) - COALESCE((
+                SELECT SUM({NET_SQL}) FROM movimientos_diarios d
+                WHERE d.id_producto = i.id_producto AND d.dia > ?), 0)
+            FROM inventario i
+            GROUP BY i.id_producto
+        """, (dia, dia))
+        self.conn.commit()
+
+    def ensure_snapshot(self, interval_days=SNAPSHOT_INTERVAL_DAYS):
+        """Toma la instantánea de ayer si la última tiene interval_days días o más
+
+        Returns:
+            bool: True si se guardó una instantánea nueva
+        """
+        ayer = date.today() - timedelta(days=1)
+        self.cursor.execute("SELECT MAX(dia) FROM stock_historico")
+        ultima = self.cursor.fetchone()[0]
+        if ultima is not None and (ayer - date.fromisoformat(ultima)).days < interval_days:
+            return False
+        self.take_snapshot(ayer)
+        return True
+
+    def stock_at(self, id_producto, dia):
+        """Stock del producto al cierre de dia"""
+        dia = str(dia)
+        self.cursor.execute("""
+            SELECT dia, stock FROM stock_historico
+            WHERE id_producto = ? AND dia <= ?
+            ORDER BY dia DESC
+            LIMIT 1
+        """, (id_producto, dia))
+        snapshot = self.cursor.fetchone()
+        if snapshot:
+            return snapshot[1] + self._net(id_producto, snapshot[0], dia)
+
+        # Sin instantánea previa: se retrocede desde el stock actual
+        self.cursor.execute(
+            "SELECT COALESCE(SUM(stock), 0) FROM inventario WHERE id_producto = ?",
+            (id_producto,))
+        return self.cursor.fetchone()[0] - self._net(id_producto, dia)
+
+    def daily_series(self, id_producto, date_from, date_to):
+        """Stock del producto al cierre de cada día del rango: [(dia, stock)]"""
+        inicio = date.fromisoformat(str(date_from))
+        fin = date.fromisoformat(str(date_to))
+        if fin < inicio:
+            return []
+
+        stock = self.stock_at(id_producto, inicio)
+        self.cursor.execute(f"""
+            SELECT dia, SUM({NET_SQL}) FROM movimientos_diarios
+            WHERE id_producto = ? AND dia > ? AND dia <= ?
+            GROUP BY dia
+        """, (id_producto, str(inicio), str(fin)))
+        cambios = dict(self.cursor.fetchall())
+
+        serie = [(str(inicio), stock)]
+        for offset in range(1, (fin - inicio).days + 1):
+            dia = str(inicio + timedelta(days=offset))
+            stock += cambios.get(dia, 0)
+            serie.append((dia, stock))
+        return serie
+
+    def _net(self, id_producto, after, until=None):
+        """Entradas menos salidas del producto en los días (after, until]"""
+        query = f"""
+            SELECT COALESCE(SUM({NET_SQL}), 0) FROM movimientos_diarios
+            WHERE id_producto = ? AND dia > ?
+        """
+        params = [id_producto, str(after)]
+        if until is not None:
+            query += " AND dia <= ?"
+            params.append(str(until))
+        self.cursor.execute(query, params)
+        return self.cursor.fetchone()[0]
+
+    def close(self):
+        """Cerrar conexión"""
+        self.cursor.close()
+        self.conn.close()
@@ -0,0 +1,56 @@
+import threading
+
+
+class StockEvents:
+    """Avisos de cambios de stock entre los modelos y las vistas.
+
+    Los modelos llaman a publish() con los IDs de producto (int) cuyo
+    stock, stock mínimo o estado activo cambiaron; publish(None) indica
+    que pudo cambiar cualquiera (por ejemplo, una edición desde Ajustes).
+    Los suscriptores se llaman en el hilo que publica, así que los que
+    tocan widgets deben pasar el trabajo al hilo de Tk.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Registra callback(product_ids); product_ids es un set o None"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, product_ids=None):
+        """Notifica el cambio de product_ids (None = todos los productos)"""
+        if product_ids is not None:
+            product_ids = set(product_ids)
+            if not product_ids:
+                return
+            # Los suscriptores indexan por id_producto entero; un "1" tomado
+            # de un Treeview no coincidiría con ninguna entrada
+            invalid = [product_id for product_id in product_ids
+                       if not isinstance(product_id, int) or isinstance(product_id, bool)]
+            if invalid:
+                raise TypeError(f"IDs de producto no enteros: {invalid!r}")
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(product_ids)
+            except Exception as e:
+                # Un suscriptor con error no debe afectar la escritura ya hecha
+                print(f"Error al notificar cambio de stock: {e}")
+
+
+_stock_events = StockEvents()
+
+
+def get_stock_events():
+    """Retorna el bus de cambios de stock del proceso"""
+    return _stock_events
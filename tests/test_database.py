@@ -0,0 +1,43 @@
+"""Listados paginados por keyset (database.keyset_page y PagedRows)"""
+import sqlite3
+import unittest
+
+from database import COUNT_LIMIT, PagedRows, keyset_page
+
+ORDER = [("id", "ASC")]
+
+
+class PagedRowsTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.total = COUNT_LIMIT * 2 + 500
+        self.conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+        self.conn.executemany("INSERT INTO t (id) VALUES (?)",
+                              ((n,) for n in range(1, self.total + 1)))
+        cursor = self.conn.cursor()
+        self.rows = PagedRows(lambda after, size: keyset_page(
+            cursor, "SELECT id, id FROM t WHERE 1 = 1", (), ORDER, after, size))
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_scrolling_to_the_end_pages_past_count_limit(self):
+        # Como VirtualTreeview: la ventana siempre termina en len(rows)
+        for _ in range(self.total):
+            if self.rows.complete:
+                break
+            end = len(self.rows)
+            self.rows[max(0, end - 30):end]
+        self.assertTrue(self.rows.complete)
+        self.assertEqual(len(self.rows), self.total)
+        self.assertEqual(self.rows[self.total - 1], (self.total,))
+
+    def test_length_announces_more_rows_while_pages_remain(self):
+        self.assertEqual(len(self.rows), COUNT_LIMIT)
+        self.rows[:COUNT_LIMIT]
+        self.assertFalse(self.rows.complete)
+        self.assertGreater(len(self.rows), COUNT_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
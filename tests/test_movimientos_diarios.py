@@ -0,0 +1,75 @@
+"""Resumen diario de movimientos mantenido por triggers (movimientos_diarios)"""
+import os
+import tempfile
+import unittest
+
+import database
+
+
+class DailyMovementsTest(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        database.DB_PATH = os.path.join(self.carpeta.name, "test.db")
+        database._pool = None
+        self.conn = database.create_connection()
+        self.conn.executemany("INSERT INTO productos (codigo, nombre) VALUES (?, ?)",
+                              [("P-1", "Papel"), ("P-2", "Tóner")])
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        database.get_pool().close_all()
+        database._pool = None
+        self.carpeta.cleanup()
+
+    def insert(self, producto, tipo, cantidad, fecha):
+        cursor = self.conn.execute(
+            "INSERT INTO movimientos (id_producto, tipo, cantidad, fecha) VALUES (?, ?, ?, ?)",
+            (producto, tipo, cantidad, fecha))
+        return cursor.lastrowid
+
+    def resumen(self):
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT dia, id_producto, tipo, movimientos, cantidad FROM movimientos_diarios "
+            "ORDER BY dia, id_producto, tipo")]
+
+    def recalculado(self):
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT date(fecha), id_producto, tipo, COUNT(*), SUM(cantidad) FROM movimientos "
+            "GROUP BY date(fecha), id_producto, tipo ORDER BY 1, 2, 3")]
+
+    def test_insert_adds_to_its_day(self):
+        self.insert(1, "Entrada", 10, "2025-03-01 09:00:00")
+        self.insert(1, "Entrada", 5, "2025-03-01 17:30:00")
+        self.insert(1, "Salida", 3, "2025-03-01 12:00:00")
+        self.insert(2, "Entrada", 7, "2025-03-02 08:00:00")
+        self.assertEqual(self.resumen(), [
+            ("2025-03-01", 1, "Entrada", 2, 15),
+            ("2025-03-01", 1, "Salida", 1, 3),
+            ("2025-03-02", 2, "Entrada", 1, 7),
+        ])
+
+    def test_update_moves_the_movement_between_days(self):
+        self.insert(1, "Entrada", 10, "2025-03-01 09:00:00")
+        movimiento = self.insert(1, "Entrada", 5, "2025-03-01 10:00:00")
+        self.conn.execute(
+            "UPDATE movimientos SET id_producto = 2, cantidad = 6, fecha = ? "
+            "WHERE id_movimiento = ?", ("2025-03-04 10:00:00", movimiento))
+        self.assertEqual(self.resumen(), [
+            ("2025-03-01", 1, "Entrada", 1, 10),
+            ("2025-03-04", 2, "Entrada", 1, 6),
+        ])
+        self.assertEqual(self.resumen(), self.recalculado())
+
+    def test_delete_removes_days_left_without_movements(self):
+        primero = self.insert(1, "Salida", 4, "2025-03-01 09:00:00")
+        self.insert(1, "Salida", 2, "2025-03-01 11:00:00")
+        ultimo = self.insert(2, "Salida", 1, "2025-03-02 09:00:00")
+        self.conn.execute("DELETE FROM movimientos WHERE id_movimiento IN (?, ?)",
+                          (primero, ultimo))
+        self.assertEqual(self.resumen(), [("2025-03-01", 1, "Salida", 1, 2)])
+        self.assertEqual(self.resumen(), self.recalculado())
+
+
+if __name__ == "__main__":
+    unittest.main()
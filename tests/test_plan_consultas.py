@@ -0,0 +1,31 @@
+"""Planes de consulta de los listados (ver benchmarks/plan_consultas.py)"""
+import os
+import tempfile
+import unittest
+
+import database
+from benchmarks.plan_consultas import revisar_planes
+
+
+class QueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        database.DB_PATH = os.path.join(self.carpeta.name, "planes.db")
+        database._pool = None
+
+    def tearDown(self):
+        database.get_pool().close_all()
+        database._pool = None
+        self.carpeta.cleanup()
+
+    def test_list_queries_use_indexes(self):
+        resultados, errores = revisar_planes()
+        self.assertEqual(errores, [])
+        self.assertTrue(resultados)
+        fallas = {" ".join(consulta.split()): recorridos
+                  for consulta, recorridos in resultados if recorridos}
+        self.assertEqual(fallas, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Paginación por keyset del listado de productos.
+
+Uso (desde la raíz del proyecto):
+    python -m pytest tests
+"""
+import os
+import tempfile
+import unittest
+
+import database
+
+
+class ProductPagingTest(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        database.DB_PATH = os.path.join(self.carpeta.name, "test.db")
+        database._pool = None
+        from models.product_model import ProductModel
+
+        self.model = ProductModel()
+        conn = self.model.conn
+        conn.executemany("INSERT INTO ubicaciones (nombre) VALUES (?)",
+                         [("Bodega",), ("Oficina",)])
+        conn.executemany("INSERT INTO productos (codigo, nombre) VALUES (?, ?)",
+                         [("P-1", "Archivador"), ("P-2", "Bolígrafo"), ("P-3", "Cuaderno")])
+        # Bolígrafo en dos ubicaciones y Cuaderno sin fila de inventario
+        conn.executemany(
+            "INSERT INTO inventario (id_producto, id_ubicacion, stock, estado_stock) "
+            "VALUES (?, ?, ?, 'disponible')",
+            [(1, 1, 10), (2, 1, 4), (2, 2, 6)])
+        conn.commit()
+
+    def tearDown(self):
+        database.get_pool().close_all()
+        database._pool = None
+        self.carpeta.cleanup()
+
+    def fetch_pages(self, fetch_page, page_size):
+        rows, after = [], None
+        while True:
+            page, after, _ = fetch_page(after=after, page_size=page_size)
+            rows.extend(page)
+            if after is None:
+                return rows
+
+    def test_pages_cross_product_with_two_locations(self):
+        todas = self.model.get_products()
+        self.assertEqual(len(todas), 4)
+        for page_size in (1, 2, 3):
+            self.assertEqual(
+                self.fetch_pages(self.model.get_products_page, page_size), todas)
+
+    def test_search_pages_cross_product_with_two_locations(self):
+        todas = self.model.search_products_page("bolígrafo", page_size=None)[0]
+        self.assertEqual(len(todas), 2)
+        paginas = self.fetch_pages(
+            lambda **kw: self.model.search_products_page("bolígrafo", **kw), 1)
+        self.assertEqual(paginas, todas)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Reserva de stock de las entregas (SolicitudesModel.reservar_stock)"""
+import os
+import tempfile
+import threading
+import unittest
+
+import database
+
+DATOS = (1, 1, 1, "Memo")
+
+
+class ReservarStockTest(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        database.DB_PATH = os.path.join(self.carpeta.name, "test.db")
+        database._pool = None
+        from models.solicitudes_model import SolicitudesModel
+
+        self.model = SolicitudesModel()
+        conn = self.model.conn
+        conn.execute("INSERT INTO departamentos (nombre) VALUES ('Bodega')")
+        conn.execute("INSERT INTO solicitantes (cedula, nombre, id_departamento) "
+                     "VALUES ('1', 'Solicitante', 1)")
+        conn.executemany("INSERT INTO ubicaciones (nombre) VALUES (?)",
+                         [("Bodega",), ("Oficina",)])
+        conn.executemany("INSERT INTO productos (codigo, nombre) VALUES (?, ?)",
+                         [("P-1", "Papel"), ("P-2", "Tóner")])
+        # Papel en dos ubicaciones (2 + 3) y Tóner en una (4)
+        conn.executemany(
+            "INSERT INTO inventario (id_producto, id_ubicacion, stock, estado_stock) "
+            "VALUES (?, ?, ?, 'disponible')",
+            [(1, 1, 2), (1, 2, 3), (2, 1, 4)])
+        conn.commit()
+
+    def tearDown(self):
+        self.model.close()
+        database.get_pool().close_all()
+        database._pool = None
+        self.carpeta.cleanup()
+
+    def stock(self):
+        """{id_inventario: stock}"""
+        return dict(self.model.conn.execute(
+            "SELECT id_inventario, stock FROM inventario").fetchall())
+
+    def count(self, table):
+        return self.model.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_shortfall_leaves_stock_unchanged(self):
+        from models.solicitudes_model import StockInsuficienteError
+
+        antes = self.stock()
+        with self.assertRaises(StockInsuficienteError) as error:
+            self.model.registrar_entrega(DATOS, [(2, 1), (1, 6)], "Memo")
+        self.assertEqual(error.exception.faltantes, [(1, 6, 5)])
+        self.assertEqual(self.stock(), antes)
+        self.assertEqual(self.count("solicitudes"), 0)
+        self.assertEqual(self.count("movimientos"), 0)
+
+    def test_split_across_locations_never_goes_negative(self):
+        self.model.registrar_entrega(DATOS, [(1, 4)], "Memo")
+        self.assertEqual(self.stock(), {1: 0, 2: 1, 3: 4})
+
+        self.model.registrar_entrega(DATOS, [(1, 1), (2, 4)], "Memo")
+        self.assertEqual(self.stock(), {1: 0, 2: 0, 3: 0})
+
+    def test_concurrent_deliveries_stop_at_zero(self):
+        from models.solicitudes_model import SolicitudesModel, StockInsuficienteError
+
+        entregadas, rechazadas, errores = [], [], []
+        inicio = threading.Barrier(8)
+
+        def entregar():
+            # Cada hilo toma su propia conexión del pool (máximo
+            # POOL_MAX_SIZE a la vez; el resto espera a que se liberen)
+            inicio.wait()
+            model = SolicitudesModel()
+            try:
+                model.registrar_entrega(DATOS, [(1, 1)], "Memo")
+                entregadas.append(1)
+            except StockInsuficienteError:
+                rechazadas.append(1)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                model.close()
+
+        hilos = [threading.Thread(target=entregar) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertEqual((len(entregadas), len(rechazadas)), (5, 3))
+        stock = self.stock()
+        self.assertEqual((stock[1], stock[2]), (0, 0))
+        self.assertEqual(self.count("movimientos"), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
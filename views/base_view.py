@@ -1,10 +1,67 @@
 # views/base_view.py
+import re
 import tkinter as tk
+from bisect import bisect_left
 from tkinter import ttk
 from helpers import center_window, get_selected_table_item, refresh_table_data
+from helpers import Debouncer, normalizar_texto
 from styles import apply_common_styles, create_main_container, create_section_frame, create_form_frame
 from styles import create_filter_frame, create_action_buttons, create_form_buttons, create_table
-from styles import create_modal_window
+from styles import create_modal_window, setup_treeview_columns
+
+
+# Espera tras la última tecla antes de filtrar los combobox con autocompletado
+FILTER_DEBOUNCE_MS = 120
+# Máximo de coincidencias que se muestran en la lista desplegable
+MAX_COMPLETIONS = 200
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class CompletionIndex:
+    """Índice ordenado para autocompletar listas grandes.
+
+    Se construye una vez con el texto normalizado (sin acentos ni
+    mayúsculas) de cada valor. Con word_starts=True se indexa el texto
+    desde el inicio de cada palabra, de modo que "perez" o la cédula
+    encuentran "Juan Pérez - 12345"; con False solo se compara el inicio.
+    Cada consulta es una búsqueda binaria más las k coincidencias leídas.
+    """
+
+    def __init__(self, values, word_starts=True):
+        self.values = list(values)
+        entries = []
+        for position, value in enumerate(self.values):
+            text = normalizar_texto(value)
+            starts = {0}
+            if word_starts:
+                starts.update(match.start() for match in _WORD_RE.finditer(text))
+            entries.extend((text[start:], position) for start in starts)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._positions = [position for _, position in entries]
+
+    def __len__(self):
+        return len(self.values)
+
+    def search(self, text, limit=MAX_COMPLETIONS):
+        """Valores que coinciden con text, en el orden de la lista (máx. limit)"""
+        query = normalizar_texto(text).strip()
+        if not query:
+            return self.values[:limit]
+
+        found = []
+        seen = set()
+        index = bisect_left(self._keys, query)
+        while index < len(self._keys) and self._keys[index].startswith(query):
+            position = self._positions[index]
+            if position not in seen:
+                seen.add(position)
+                found.append(position)
+                if len(found) >= limit:
+                    break
+            index += 1
+        return [self.values[position] for position in sorted(found)]
 
 
 class AutocompleteCombobox(ttk.Combobox):
@@ -14,8 +71,10 @@ class AutocompleteCombobox(ttk.Combobox):
             kwargs['state'] = 'normal'
         super().__init__(parent, **kwargs)
         self._completion_list = []
+        self._index = CompletionIndex([])
         self._hits = []
         self.position = 0
+        self._filter_debouncer = Debouncer(self, FILTER_DEBOUNCE_MS, self._apply_filter)
         self.bind('<KeyRelease>', self._on_keyrelease)
         self.bind('<FocusIn>', self._on_focusin)
         self.bind('<FocusOut>', self._on_focusout)
@@ -23,6 +82,8 @@ class AutocompleteCombobox(ttk.Combobox):
 
     def set_completion_list(self, completion_list):
         self._completion_list = sorted(completion_list, key=str.lower)
+        # Coincide desde cualquier palabra: nombre, apellido o cédula
+        self._index = CompletionIndex(self._completion_list)
         self._hits = []
         self.position = 0
         self['values'] = self._completion_list
@@ -33,13 +94,15 @@ class AutocompleteCombobox(ttk.Combobox):
         if event.keysym in ('Up', 'Down', 'Left', 'Right', 'Return', 'Tab',
                             'Control_L', 'Control_R', 'Shift_L', 'Shift_R'):
             return
+        # Filtrar una vez cuando el usuario deja de escribir
+        self._filter_debouncer()
 
-        value = self.get().strip().lower()
+    def _apply_filter(self):
+        """Filtrar la lista con el texto actual (sin acentos ni mayúsculas)"""
+        value = self.get().strip()
 
         if value:
-            # Filtrar valores que CONTENGAN el texto (nombre o cédula)
-            self._hits = [item for item in self._completion_list
-                          if value in item.lower()]
+            self._hits = self._index.search(value)
             if not self._hits:
                 self['values'] = ["Sin resultado"]
             else:
@@ -50,6 +113,7 @@ class AutocompleteCombobox(ttk.Combobox):
 
     def _on_return(self, event):
         """Despliega la lista de coincidencias al presionar Enter"""
+        self._filter_debouncer.flush()
         self.event_generate('<Down>')
 
     def _on_focusin(self, event):
@@ -59,6 +123,7 @@ class AutocompleteCombobox(ttk.Combobox):
 
     def _on_focusout(self, event):
         """Al perder foco, asegurarse de que el valor sea válido"""
+        self._filter_debouncer.cancel()
         current_value = self.get()
         if current_value == "Sin resultado":
             self.set('')
@@ -77,6 +142,8 @@ class AutocompleteComboboxWithScrollbar(ttk.Combobox):
         self.position = 0
         self.listbox = None
         self.scrollbar = None
+        self._index = CompletionIndex([], word_starts=False)
+        self._filter_debouncer = Debouncer(self, FILTER_DEBOUNCE_MS, self._apply_filter)
         self.bind('<KeyRelease>', self._on_keyrelease)
         self.bind('<FocusIn>', self._on_focusin)
         self.bind('<FocusOut>', self._on_focusout)
@@ -84,6 +151,7 @@ class AutocompleteComboboxWithScrollbar(ttk.Combobox):
 
     def set_completion_list(self, completion_list):
         self._completion_list = sorted(completion_list, key=str.lower)
+        self._index = CompletionIndex(self._completion_list, word_starts=False)
         self._hits = []
         self.position = 0
         self['values'] = self._completion_list
@@ -92,10 +160,12 @@ class AutocompleteComboboxWithScrollbar(ttk.Combobox):
         if event.keysym in ('Up', 'Down', 'Left', 'Right', 'Return', 'Tab',
                             'Control_L', 'Control_R', 'Shift_L', 'Shift_R'):
             return
-        value = self.get().strip().lower()
+        self._filter_debouncer()
+
+    def _apply_filter(self):
+        value = self.get().strip()
         if value:
-            self._hits = [
-                item for item in self._completion_list if item.lower().startswith(value)]
+            self._hits = self._index.search(value)
             if not self._hits:
                 self['values'] = ["Sin resultado"]
                 self._show_listbox(["Sin resultado"])
@@ -141,6 +211,7 @@ class AutocompleteComboboxWithScrollbar(ttk.Combobox):
             self.icursor(tk.END)
 
     def _on_return(self, event):
+        self._filter_debouncer.flush()
         self.event_generate('<Down>')
 
     def _on_focusin(self, event):
@@ -148,6 +219,7 @@ class AutocompleteComboboxWithScrollbar(ttk.Combobox):
         self._hits = []
 
     def _on_focusout(self, event):
+        self._filter_debouncer.cancel()
         self._hide_listbox()
         current_value = self.get()
         if current_value == "Sin resultado":
@@ -156,6 +228,230 @@ class AutocompleteComboboxWithScrollbar(ttk.Combobox):
             self.set('')
 
 
+class VirtualTreeview(ttk.Treeview):
+    """Treeview virtualizado para listados grandes.
+
+    Solo materializa la ventana visible de filas más un margen (overscan)
+    por encima y por debajo. Al desplazarse reutiliza los mismos items
+    cambiando sus valores, así que refrescar o hacer scroll no depende del
+    total de filas. Las filas se leen de cualquier secuencia con len() y
+    slicing: una lista o un origen que pagine desde el modelo. Si el origen
+    admite load_with() (PagedRows) y app tiene executor, las páginas
+    siguientes se consultan en segundo plano y sus filas se muestran en
+    blanco hasta que llegan.
+    """
+
+    OVERSCAN = 10
+
+    def __init__(self, parent, row_key=None, overscan=OVERSCAN, app=None, **kwargs):
+        kwargs.setdefault("selectmode", "browse")
+        super().__init__(parent, **kwargs)
+        self._app = app
+        self._rows = []
+        self._items = []          # items reutilizados de la ventana
+        self._start = 0           # índice absoluto del primer item
+        self._lead = 0            # items materializados sobre la vista
+        self._visible = int(kwargs.get("height", 15))
+        self._overscan = overscan
+        self._row_key = row_key   # fila -> tag identificador (opcional)
+        self._selected = None     # índice absoluto de la fila seleccionada
+        self._pending_key = None  # row_key a seleccionar cuando se cargue
+        self._focused = None
+        self._scrollbar = None
+        # El Treeview solo informa del scroll interno de la ventana; lo
+        # traducimos a posiciones sobre el total antes de tocar el scrollbar
+        super().configure(yscrollcommand=self._on_view_changed)
+        self.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    def attach_scrollbar(self, scrollbar):
+        """Conecta un scrollbar vertical que refleja el total de filas"""
+        self._scrollbar = scrollbar
+        scrollbar.configure(command=self.yview)
+        self._update_scrollbar()
+
+    def set_rows(self, rows):
+        """Reemplaza las filas de la tabla y vuelve al inicio"""
+        executor = getattr(self._app, "executor", None)
+        if executor is not None:
+            key = ("filas", str(self))
+            executor.cancel(key)
+            if hasattr(rows, "load_with"):
+                rows.load_with(
+                    lambda work, on_done, on_error: executor.submit(key, work, on_done, on_error),
+                    lambda: self._on_rows_loaded(rows),
+                    lambda e: print(f"No se pudieron cargar más filas: {e}"))
+        self._rows = rows
+        self._pending_key = None
+        self._selected = None
+        self._focused = None
+        self.selection_set(())
+        self._render(0, capture=False)
+
+    @property
+    def rows(self):
+        """Filas completas de la tabla (no solo las materializadas)"""
+        return self._rows
+
+    def selected_values(self):
+        """Valores de la fila seleccionada, aunque esté fuera de la vista"""
+        if self._selected is None or self._selected >= len(self._rows):
+            return None
+        try:
+            return tuple(self._rows[self._selected])
+        except IndexError:
+            return None    # Fila en blanco que aún se está cargando
+
+    def selected_item(self):
+        """Equivalente a Treeview.item() para la fila seleccionada"""
+        values = self.selected_values()
+        if values is None:
+            return None
+        tags = [self._row_key(values)] if self._row_key else []
+        return {"values": values, "tags": tags}
+
+    def select_key(self, key):
+        """Selecciona y muestra la fila cuyo row_key coincide con key.
+
+        Solo revisa las filas ya cargadas, sin consultar en el hilo de Tk. Si
+        no está entre ellas y el origen tiene más páginas, pide la siguiente
+        y vuelve a buscar cuando llega. Retorna True si la fila se seleccionó
+        o quedó pendiente de cargar.
+        """
+        self._pending_key = None
+        if not self._row_key:
+            return False
+        searched = 0
+        while True:
+            loaded = self._loaded_rows()
+            for index in range(searched, len(loaded)):
+                if self._row_key(loaded[index]) == key:
+                    self._selected = self._focused = index
+                    self._render(index - self._visible // 2, capture=False)
+                    return True
+            searched = len(loaded)
+            if getattr(self._rows, "complete", True):
+                return False
+            self._pending_key = key
+            # Con load_with() la página llega después (ver _on_rows_loaded);
+            # sin él se carga aquí mismo y se sigue buscando
+            self._rows[searched:searched + 1]
+            if len(self._loaded_rows()) == searched:
+                return True
+
+    def _loaded_rows(self):
+        """Filas del origen que ya están en memoria"""
+        return getattr(self._rows, "loaded", self._rows)
+
+    def yview(self, *args):
+        """Desplaza la vista sobre el total de filas (lo usa el scrollbar)"""
+        total = len(self._rows)
+        top = self._start + self._lead
+        if not args:
+            if not total:
+                return (0.0, 1.0)
+            return (top / total, min(1.0, (top + self._visible) / total))
+        if args[0] == "moveto":
+            top = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible
+            top += step
+        else:
+            return super().yview(*args)
+        self._render(top)
+
+    def _capture(self):
+        """Traduce selección y foco de los items a índices absolutos"""
+        slots = {iid: self._start + pos for pos, iid in enumerate(self._items)}
+        selection = self.selection()
+        if selection and selection[0] in slots:
+            self._selected = slots[selection[0]]
+        focus = self.focus()
+        if focus in slots:
+            self._focused = slots[focus]
+
+    def _render(self, top, capture=True):
+        """Materializa la ventana que empieza en la fila absoluta top"""
+        if capture:
+            self._capture()
+
+        total = len(self._rows)
+        top = max(0, min(top, total - self._visible))
+        start = max(0, top - self._overscan)
+        end = min(total, top + self._visible + self._overscan)
+        window = list(self._rows[start:end])
+        # Las filas que aún no llegan se muestran en blanco
+        window += [None] * (end - start - len(window))
+
+        while len(self._items) < len(window):
+            self._items.append(self.insert("", "end"))
+        if len(self._items) > len(window):
+            self.delete(*self._items[len(window):])
+            del self._items[len(window):]
+
+        for iid, row in zip(self._items, window):
+            if row is None:
+                self.item(iid, values=(), tags=())
+                continue
+            tags = (self._row_key(row),) if self._row_key else ()
+            self.item(iid, values=tuple(row), tags=tags)
+
+        self._start = start
+        self._lead = top - start
+
+        if self._selected is not None and start <= self._selected < end:
+            self.selection_set(self._items[self._selected - start])
+        else:
+            self.selection_set(())
+        if self._focused is not None and start <= self._focused < end:
+            self.focus(self._items[self._focused - start])
+
+        if self._items:
+            super().yview("moveto", self._lead / len(self._items))
+        self._update_scrollbar()
+
+    def _on_view_changed(self, first, last):
+        """Rebasa la ventana cuando el Treeview se desplaza internamente"""
+        count = len(self._items)
+        if not count:
+            self._update_scrollbar()
+            return
+
+        first_row = round(float(first) * count)
+        shown = round((float(last) - float(first)) * count)
+        end = self._start + count
+
+        if float(last) >= 1.0 and end < len(self._rows):
+            # El widget es más alto que la ventana: materializar más filas
+            self._visible = shown + self._overscan
+            self._render(self._start + first_row)
+        elif first_row != self._lead:
+            if shown:
+                self._visible = shown
+            self._render(self._start + first_row)
+        else:
+            if shown:
+                self._visible = shown
+            self._update_scrollbar()
+
+    def _on_rows_loaded(self, rows):
+        """Llegaron más filas del origen: repinta la ventana actual"""
+        if rows is not self._rows:
+            return
+        if self._pending_key is not None:
+            self.select_key(self._pending_key)
+        else:
+            self._render(self._start + self._lead)
+
+    def _on_select(self, event):
+        self._capture()
+
+    def _update_scrollbar(self):
+        if self._scrollbar:
+            self._scrollbar.set(*self.yview())
+
+
 class BaseView:
     def __init__(self, frame, app):
         self.app = app
@@ -211,6 +507,28 @@ class BaseView:
     def create_modal_window(self, parent, title, size=None):
         return create_modal_window(parent, self.app, title, size)
 
+    def create_virtual_table(self, parent, columns, column_widths=None, height=15, row_key=None):
+        """Crea una tabla como create_table pero con VirtualTreeview"""
+        table_frame = tk.Frame(parent, bg=self.bg_color)
+
+        tree = VirtualTreeview(
+            table_frame,
+            row_key=row_key,
+            app=self.app,
+            columns=columns,
+            show="headings",
+            height=height
+        )
+        setup_treeview_columns(tree, columns, column_widths)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical")
+        tree.attach_scrollbar(scrollbar)
+
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        return table_frame, tree
+
     # ===== MÉTODOS DELEGADOS A HELPERS.PY =====
 
     def center_window(self, window):
@@ -327,4 +645,8 @@ class BaseView:
             return current_user.get('name', 'N/A')
         else:
             return getattr(current_user, 'nombre_completo',
-                           getattr(current_user, 'name', 'N/A'))
\ No newline at end of file
+                           getattr(current_user, 'name', 'N/A'))
+
+    def get_table_data(self):
+        """Filas de la tabla virtual (self.tree) para exportar; se cargan a pedido"""
+        return self.tree.rows
\ No newline at end of file
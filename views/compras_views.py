@@ -73,7 +73,7 @@ class PurchaseView(BaseView):
         columns = ("Nro", "Producto", "Cantidad", "Motivo", "Prioridad", "Proveedor", "Fecha", "Estado")
         column_widths = [80, 150, 80, 150, 100, 150, 100, 120]
         
-        table_frame, self.tree = self.create_table(
+        table_frame, self.tree = self.create_virtual_table(
             main_frame, 
             columns, 
             column_widths, 
@@ -89,11 +89,11 @@ class PurchaseView(BaseView):
 
     def get_selected_request(self):
         """Obtiene la solicitud seleccionada en la tabla"""
-        return self.get_selected_table_item(self.tree)
+        return self.tree.selected_values()
 
     def refresh_table(self, data):
         """Actualiza la tabla con nuevos datos"""
-        self.refresh_table_data(self.tree, data)
+        self.tree.set_rows(data)
 
     def show_purchase_form(self, categories, products, suppliers, on_save_callback):
         """Muestra el formulario para nueva solicitud de compra"""
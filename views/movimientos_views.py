@@ -60,7 +60,7 @@ class MovementView(BaseView):
                    "Cantidad", "Responsable", "Referencia")
         column_widths = [50, 120, 80, 150, 80, 120, 150]
 
-        table_frame, self.tree = self.create_table(
+        table_frame, self.tree = self.create_virtual_table(
             self.frame,
             columns,
             column_widths=column_widths,
@@ -89,15 +89,7 @@ class MovementView(BaseView):
 
     def refresh_table(self, data):
         """Actualiza la tabla con nuevos datos"""
-        self.refresh_table_data(self.tree, data)
-
-    def get_table_data(self):
-        """Obtiene todos los datos actuales de la tabla"""
-        data = []
-        for item in self.tree.get_children():
-            row_data = self.tree.item(item)['values']
-            data.append(row_data)
-        return data
+        self.tree.set_rows(data)
 
     def show_error(self, message):
         """Muestra un mensaje de error"""
@@ -1,8 +1,12 @@
 # views/product_view.py
 import tkinter as tk
 from tkinter import ttk
+from helpers import Debouncer
 from views.base_view import BaseView, AutocompleteCombobox
 
+# Espera tras la última tecla antes de buscar
+SEARCH_DEBOUNCE_MS = 250
+
 
 class ProductView(BaseView):
     def __init__(self, frame, app):
@@ -29,11 +33,14 @@ class ProductView(BaseView):
             ("✏️ Editar", self.controller.edit_selected_product),
             ("🗑️ Eliminar", self.controller.delete_selected_product),
             ("📥 Agregar Stock", self.controller.show_add_stock_form),
+            ("📄 Importar", self.controller.import_products),
             ("📤 Exportar", self.controller.export_inventory)
         ]
         button_frame, action_buttons = self.create_action_buttons(
             top_frame, actions)
         button_frame.pack(side="left", pady=(0, 5))
+        # El controlador lo deshabilita mientras corre una importación
+        self.import_button = action_buttons[4]
 
         # --- FRAME DE FILTROS ---
         filtros_frame = tk.LabelFrame(
@@ -48,8 +55,10 @@ class ProductView(BaseView):
         self.search_entry = ttk.Entry(
             buscador_frame, width=30, font=self.entry_font)
         self.search_entry.pack(side="left", padx=5)
-        self.search_entry.bind(
-            "<KeyRelease>", lambda e: self.controller.search_products())
+        # Una sola búsqueda cuando el usuario deja de escribir
+        self._search_debouncer = Debouncer(
+            self.search_entry, SEARCH_DEBOUNCE_MS, self.controller.search_products)
+        self.search_entry.bind("<KeyRelease>", lambda e: self._search_debouncer())
 
         # --- FILA 2: COMBOBOX Y BOTÓN ---
         filtros_inner_frame = tk.Frame(filtros_frame, bg=self.bg_color)
@@ -98,8 +107,9 @@ class ProductView(BaseView):
                    "Código", "Stock", "Stock (m)", "Ubicación", "Estado")
         col_widths = [50, 150, 100, 100, 80, 60, 70, 80, 80]  # Ajusta el ancho si es necesario
 
-        table_frame, self.tree = self.create_table(
-            main_container, columns, col_widths, height=15)
+        table_frame, self.tree = self.create_virtual_table(
+            main_container, columns, col_widths, height=15,
+            row_key=lambda row: str(row[0]))
         table_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         return self
@@ -134,17 +144,11 @@ class ProductView(BaseView):
 
     def refresh_table(self, data):
         """Refrescar tabla con nuevos datos"""
-        self.tree.delete(*self.tree.get_children())
-        for i, item in enumerate(data, start=1):
-            fila = (i,) + item[1:] if len(item) == 8 else item  # Asegúrate de tener 9 columnas
-            self.tree.insert("", "end", values=fila)
+        self.tree.set_rows(data)
 
     def get_selected_product(self):
         """Obtener producto seleccionado"""
-        selected_item = self.tree.selection()
-        if not selected_item:
-            return None
-        return self.tree.item(selected_item[0])
+        return self.tree.selected_item()
 
     def update_categories_combo(self, categories):
         """Actualizar combobox de categorías SOLO CON ACTIVAS"""
@@ -79,7 +79,7 @@ class SupplierView(BaseView):
                    "Email", "Valoración", "Precios", "Categorías")
         column_widths = [50, 120, 120, 100, 150, 80, 80, 120]
 
-        table_frame, self.tree = self.create_table(
+        table_frame, self.tree = self.create_virtual_table(
             main_container,
             columns,
             column_widths,
@@ -100,11 +100,11 @@ class SupplierView(BaseView):
 
     def get_selected_supplier(self):
         """Obtiene el proveedor seleccionado en la tabla"""
-        return self.get_selected_table_item(self.tree)
+        return self.tree.selected_values()
 
     def refresh_table(self, data):
         """Actualiza la tabla con nuevos datos"""
-        self.refresh_table_data(self.tree, data)
+        self.tree.set_rows(data)
 
     def show_supplier_form(self, app, supplier_id=None):
         """Formulario para nuevo proveedor o edición"""
@@ -144,7 +144,7 @@ class SolicitudesView(BaseView):
                    "Solicitante", "Referencia", "Responsable")
         col_widths = [50, 120, 150, 150, 200, 150]
 
-        table_frame, self.tree = self.create_table(
+        table_frame, self.tree = self.create_virtual_table(
             main_container, columns, col_widths, height=15)
         table_frame.pack(fill="both", expand=True, pady=10)
 
@@ -157,22 +157,21 @@ class SolicitudesView(BaseView):
         self.dept_combo.set_completion_list(departamentos_list)
 
     def actualizar_tabla_solicitudes(self, solicitudes):
-        """Actualizar la tabla con las solicitudes"""
-        self.tree.delete(*self.tree.get_children())
-        
-        print(f"DEBUG: Cargando {len(solicitudes)} solicitudes")  # Debug
-        
-        for solicitud in solicitudes:
-            print(f"DEBUG: Solicitud: {solicitud}")  # Debug
-            self.tree.insert("", "end", values=(
-                solicitud[0],  # Número (id_solicitud)
-                solicitud[1],  # fecha
-                solicitud[2],  # departamento
-                solicitud[3],  # solicitante
-                solicitud[4] if solicitud[4] else 'N/A',  # referencia/memo
-                solicitud[5],  # responsable
-                solicitud[6]   # ID real (oculto)
-            ))
+        """Actualizar la tabla con las solicitudes ya formateadas"""
+        self.tree.set_rows(solicitudes)
+
+    @staticmethod
+    def formatear_solicitudes(solicitudes):
+        """Formatear filas de solicitudes para la tabla"""
+        return [(
+            solicitud[0],  # Número (id_solicitud)
+            solicitud[1],  # fecha
+            solicitud[2],  # departamento
+            solicitud[3],  # solicitante
+            solicitud[4] if solicitud[4] else 'N/A',  # referencia/memo
+            solicitud[5],  # responsable
+            solicitud[6]   # ID real (oculto)
+        ) for solicitud in solicitudes]
 
     def obtener_filtros(self):
         """Obtener los valores actuales de los filtros"""
@@ -193,7 +192,7 @@ class SolicitudesView(BaseView):
 
     def obtener_solicitud_seleccionada(self):
         """Obtener la solicitud seleccionada en la tabla"""
-        return self.get_selected_table_item(self.tree)
+        return self.tree.selected_values()
     
 
     def mostrar_formulario_nueva_entrega(self, departamentos, solicitantes, current_user):